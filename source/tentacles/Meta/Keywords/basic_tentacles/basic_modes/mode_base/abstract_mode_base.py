@@ -17,6 +17,7 @@ import octobot_tentacles_manager.api as tentacles_manager_api
 import octobot_trading.modes.script_keywords.basic_keywords as basic_keywords
 import octobot_trading.modes.scripted_trading_mode.abstract_scripted_trading_mode as abstract_scripted_trading_mode
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums as matrix_enums
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.trailing_stop_loss.trail_stop_losses as trail_stop_losses
 import tentacles.Meta.Keywords.basic_tentacles.basic_modes.mode_base.abstract_producer_base as abstract_producer_base
 
 
@@ -34,7 +35,11 @@ class AbstractBaseMode(abstract_scripted_trading_mode.AbstractScriptedTradingMod
     enable_ping_pong: bool = None
     enable_real_time_strategy: bool = None
     real_time_strategy_data = None
-    
+
+    # increased on each config or script reload,
+    # producers rebuild their cached settings when it changed
+    settings_version: int = 0
+
     any_neural_net_active: bool = False
     should_stop_training: bool = False
     training_thread = None
@@ -109,6 +114,7 @@ class AbstractBaseMode(abstract_scripted_trading_mode.AbstractScriptedTradingMod
                     )
 
     async def reload_scripts(self):
+        self.settings_version += 1
         for is_live in (False, True):
             if (is_live and self.__class__.TRADING_SCRIPT_MODULE) or (
                 not is_live and self.__class__.BACKTESTING_SCRIPT_MODULE
@@ -239,6 +245,18 @@ class AbstractBaseMode(abstract_scripted_trading_mode.AbstractScriptedTradingMod
         #             symbol=self.symbol,
         #         )
         #     )
+        if not self.exchange_manager.is_backtesting:
+            # trails the stop losses between candles
+            consumers.append(
+                await exchanges_channel.get_chan(
+                    trading_constants.MARK_PRICE_CHANNEL, self.exchange_manager.id
+                ).new_consumer(
+                    self._mark_price_callback,
+                    symbol=self.symbol
+                    if self.symbol
+                    else channel_constants.CHANNEL_WILDCARD,
+                )
+            )
         return consumers
 
     async def _create_user_input_consumer(self):
@@ -271,13 +289,17 @@ class AbstractBaseMode(abstract_scripted_trading_mode.AbstractScriptedTradingMod
         symbol: str,
         mark_price,
     ):
-        await self.real_time_strategy_data.run_real_time_strategies(
-            trading_mode=self,
-            exchange=exchange,
-            exchange_id=exchange_id,
-            symbol=symbol,
-            mark_price=mark_price,
+        await trail_stop_losses.trail_stop_losses_on_mark_price(
+            self.exchange_manager, symbol, mark_price
         )
+        if self.real_time_strategy_data is not None:
+            await self.real_time_strategy_data.run_real_time_strategies(
+                trading_mode=self,
+                exchange=exchange,
+                exchange_id=exchange_id,
+                symbol=symbol,
+                mark_price=mark_price,
+            )
 
     # async def _order_callback(
     #     self,
@@ -11,6 +11,7 @@ import octobot_trading.modes.script_keywords.basic_keywords.user_inputs as user_
 import octobot_trading.modes.script_keywords.context_management as context_management
 import octobot_trading.modes.scripted_trading_mode.abstract_scripted_trading_mode as abstract_scripted_trading_mode
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums as matrix_enums
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.data.ohlcv_memory_map as ohlcv_memory_map
 
 
 class AbstractBaseModeProducer(
@@ -250,6 +251,11 @@ class AbstractBaseModeProducer(
                 commons_enums.InitializationEventExchangeTopics.CONTRACTS.value,
             )
 
+    async def stop(self):
+        if self.exchange_manager is not None and self.exchange_manager.is_backtesting:
+            ohlcv_memory_map.release_mapped_histories(self.exchange_manager)
+        await super().stop()
+
     async def start(self):
         await super().start()
         # try:
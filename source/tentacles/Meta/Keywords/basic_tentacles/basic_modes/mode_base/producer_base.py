@@ -52,6 +52,8 @@ class MatrixProducerBase:
         self.candles_manager: dict = {}
         self.ctx: context_management.Context = None
         self.candles: dict = {}
+        # derived_sources.DerivedSources by symbol and time frame
+        self.derived_sources: dict = {}
 
     async def handle_trigger_time_frame(self):
         self.trigger_time_frames = await select_time_frame.set_trigger_time_frames(
@@ -18,11 +18,24 @@
 # or you want your own custom solution,
 # please contact me at max@a42.ch
 
+import typing
+import weakref
+import numpy
+import numpy.typing as npt
+
 import octobot_backtesting.api as backtesting_api
+import octobot_commons.constants as commons_constants
+import octobot_commons.enums as commons_enums
 from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.close_all_trades import (
     close_all_positions,
 )
 
+# whitelists registered through merge_backtesting_timestamp_whitelist
+# by backtesting, to only register the new timestamps
+_REGISTERED_WHITELISTS_BY_BACKTESTINGS: weakref.WeakKeyDictionary = (
+    weakref.WeakKeyDictionary()
+)
+
 
 async def skip_backtesting_runs_if_condition(ctx, skip_runs_balance):
     if skip_runs_balance:
@@ -39,6 +52,72 @@ async def skip_backtesting_runs_if_condition(ctx, skip_runs_balance):
 
 
 def register_backtesting_timestamp_whitelist(ctx, timestamps, append_to_whitelist=True):
+    if backtesting_api.get_backtesting_timestamp_whitelist(
+        ctx.exchange_manager.exchange.backtesting
+    ) != sorted(set(timestamps)):
+        if not append_to_whitelist:
+            _REGISTERED_WHITELISTS_BY_BACKTESTINGS.pop(
+                ctx.exchange_manager.exchange.backtesting, None
+            )
+        backtesting_api.register_backtesting_timestamp_whitelist(
+            ctx.exchange_manager.exchange.backtesting,
+            timestamps,
+            _get_open_order_and_position_check(ctx),
+            append_to_whitelist=append_to_whitelist,
+        )
+
+
+def get_signal_timestamps_whitelist(
+    candle_times: npt.NDArray[numpy.float64],
+    signals_mask: npt.NDArray[numpy.bool_],
+    time_frame: str,
+) -> npt.NDArray[numpy.int64]:
+    # sorted and unique close and open times of all the signal candles
+    signal_times: npt.NDArray[numpy.int64] = numpy.asarray(candle_times)[
+        signals_mask
+    ].astype(numpy.int64)
+    time_frame_seconds: int = (
+        commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame)]
+        * commons_constants.MINUTE_TO_SECONDS
+    )
+    return numpy.union1d(signal_times, signal_times - time_frame_seconds)
+
+
+def merge_backtesting_timestamp_whitelist(
+    ctx, timestamps: typing.Union[npt.NDArray[numpy.int64], typing.List[int]]
+) -> int:
+    # appends only the timestamps which aren't whitelisted yet,
+    # returns how many were added
+    backtesting = ctx.exchange_manager.exchange.backtesting
+    current_whitelist: list = (
+        backtesting_api.get_backtesting_timestamp_whitelist(backtesting) or []
+    )
+    registered_whitelist: typing.Optional[
+        npt.NDArray[numpy.int64]
+    ] = _REGISTERED_WHITELISTS_BY_BACKTESTINGS.get(backtesting)
+    if registered_whitelist is None or len(registered_whitelist) != len(
+        current_whitelist
+    ):
+        # registered from somewhere else
+        registered_whitelist = numpy.unique(
+            numpy.asarray(current_whitelist, dtype=numpy.int64)
+        )
+    new_timestamps: npt.NDArray[numpy.int64] = numpy.setdiff1d(
+        numpy.asarray(timestamps, dtype=numpy.int64), registered_whitelist
+    )
+    if len(new_timestamps):
+        backtesting_api.register_backtesting_timestamp_whitelist(
+            backtesting,
+            new_timestamps.tolist(),
+            _get_open_order_and_position_check(ctx),
+            append_to_whitelist=True,
+        )
+        registered_whitelist = numpy.union1d(registered_whitelist, new_timestamps)
+    _REGISTERED_WHITELISTS_BY_BACKTESTINGS[backtesting] = registered_whitelist
+    return len(new_timestamps)
+
+
+def _get_open_order_and_position_check(ctx) -> typing.Callable[[], bool]:
     def _open_order_and_position_check():
         # by default, avoid skipping timestamps when there are open orders or active positions
         if ctx.exchange_manager.exchange_personal_data.orders_manager.get_open_orders():
@@ -52,12 +131,4 @@ def register_backtesting_timestamp_whitelist(ctx, timestamps, append_to_whitelis
                 return True
         return False
 
-    if backtesting_api.get_backtesting_timestamp_whitelist(
-        ctx.exchange_manager.exchange.backtesting
-    ) != sorted(set(timestamps)):
-        backtesting_api.register_backtesting_timestamp_whitelist(
-            ctx.exchange_manager.exchange.backtesting,
-            timestamps,
-            _open_order_and_position_check,
-            append_to_whitelist=append_to_whitelist,
-        )
+    return _open_order_and_position_check
@@ -1,3 +1,5 @@
 from .public_exchange_data import *
+from .ohlcv_memory_map import *
+from .derived_sources import *
 from .exchange_private_data import *
 from .write_evaluator_cache import *
@@ -0,0 +1,239 @@
+import typing
+import numpy
+import numpy.typing as npt
+
+from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums import (
+    PriceDataSources,
+)
+
+HEIKIN_ASHI_SOURCE_NAMES: typing.Tuple[str, ...] = (
+    PriceDataSources.HEIKIN_ASHI_OPEN.value,
+    PriceDataSources.HEIKIN_ASHI_HIGH.value,
+    PriceDataSources.HEIKIN_ASHI_LOW.value,
+    PriceDataSources.HEIKIN_ASHI_CLOSE.value,
+)
+_OHLC_SOURCE_NAMES: typing.Tuple[str, ...] = (
+    PriceDataSources.OPEN.value,
+    PriceDataSources.HIGH.value,
+    PriceDataSources.LOW.value,
+    PriceDataSources.CLOSE.value,
+)
+# OHLCV columns required to compute a derived candle source
+DERIVED_SOURCE_COLUMN_NAMES: typing.Dict[str, typing.Tuple[str, ...]] = {
+    PriceDataSources.HL2.value: (
+        PriceDataSources.HIGH.value,
+        PriceDataSources.LOW.value,
+    ),
+    PriceDataSources.HLC3.value: (
+        PriceDataSources.HIGH.value,
+        PriceDataSources.LOW.value,
+        PriceDataSources.CLOSE.value,
+    ),
+    PriceDataSources.OHLC4.value: _OHLC_SOURCE_NAMES,
+    **{
+        heikin_ashi_source_name: _OHLC_SOURCE_NAMES
+        for heikin_ashi_source_name in HEIKIN_ASHI_SOURCE_NAMES
+    },
+}
+
+# a heikin ashi open halves the weight of older heikin ashi closes on each bar,
+# after 64 bars they are below the float64 precision
+HEIKIN_ASHI_OPEN_LOOK_BACK: int = 64
+_HEIKIN_ASHI_OPEN_WEIGHTS: npt.NDArray[numpy.float64] = 0.5 ** numpy.arange(
+    1, HEIKIN_ASHI_OPEN_LOOK_BACK + 1
+)
+
+
+def get_heikin_ashi(
+    opens: npt.NDArray[numpy.float64],
+    highs: npt.NDArray[numpy.float64],
+    lows: npt.NDArray[numpy.float64],
+    closes: npt.NDArray[numpy.float64],
+    previous_ha_open: typing.Optional[float] = None,
+    previous_ha_close: typing.Optional[float] = None,
+) -> typing.Tuple[
+    npt.NDArray[numpy.float64],
+    npt.NDArray[numpy.float64],
+    npt.NDArray[numpy.float64],
+    npt.NDArray[numpy.float64],
+]:
+    # same order as CandlesUtil.HeikinAshi: open, high, low, close
+    # pass the previous heikin ashi candle to continue an existing series
+    ha_closes: npt.NDArray[numpy.float64] = (opens + highs + lows + closes) / 4
+    candles_count: int = len(ha_closes)
+    if not candles_count:
+        return ha_closes, ha_closes, ha_closes, ha_closes
+    first_ha_open: float = (
+        (opens[0] + closes[0]) / 2
+        if previous_ha_open is None
+        else (previous_ha_open + previous_ha_close) / 2
+    )
+    # ha_open[i] = (ha_open[i - 1] + ha_close[i - 1]) / 2
+    #   = ha_open[0] / 2^i + sum(ha_close[i - k] / 2^k for k in 1 ... i)
+    ha_opens: npt.NDArray[numpy.float64] = numpy.empty(candles_count)
+    ha_opens[0] = 0
+    ha_opens[1:] = numpy.convolve(ha_closes, _HEIKIN_ASHI_OPEN_WEIGHTS)[
+        : candles_count - 1
+    ]
+    seeded_count: int = min(candles_count, HEIKIN_ASHI_OPEN_LOOK_BACK)
+    ha_opens[:seeded_count] += first_ha_open * 0.5 ** numpy.arange(seeded_count)
+    return (
+        ha_opens,
+        numpy.maximum(numpy.maximum(highs, ha_opens), ha_closes),
+        numpy.minimum(numpy.minimum(lows, ha_opens), ha_closes),
+        ha_closes,
+    )
+
+
+def get_derived_candles(
+    source_name: str,
+    candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]],
+    previous_candles_by_names: typing.Optional[
+        typing.Dict[str, npt.NDArray[numpy.float64]]
+    ] = None,
+) -> typing.Dict[str, npt.NDArray[numpy.float64]]:
+    # returns all the heikin ashi sources at once as they are computed together
+    if source_name == PriceDataSources.HL2.value:
+        return {
+            source_name: (
+                candles_by_names[PriceDataSources.HIGH.value]
+                + candles_by_names[PriceDataSources.LOW.value]
+            )
+            / 2
+        }
+    if source_name == PriceDataSources.HLC3.value:
+        return {
+            source_name: (
+                candles_by_names[PriceDataSources.HIGH.value]
+                + candles_by_names[PriceDataSources.LOW.value]
+                + candles_by_names[PriceDataSources.CLOSE.value]
+            )
+            / 3
+        }
+    if source_name == PriceDataSources.OHLC4.value:
+        return {
+            source_name: (
+                candles_by_names[PriceDataSources.OPEN.value]
+                + candles_by_names[PriceDataSources.HIGH.value]
+                + candles_by_names[PriceDataSources.LOW.value]
+                + candles_by_names[PriceDataSources.CLOSE.value]
+            )
+            / 4
+        }
+    if source_name in HEIKIN_ASHI_SOURCE_NAMES:
+        previous_ha_open: typing.Optional[float] = None
+        previous_ha_close: typing.Optional[float] = None
+        if previous_candles_by_names and len(
+            previous_candles_by_names.get(PriceDataSources.HEIKIN_ASHI_OPEN.value, ())
+        ):
+            previous_ha_open = previous_candles_by_names[
+                PriceDataSources.HEIKIN_ASHI_OPEN.value
+            ][-1]
+            previous_ha_close = previous_candles_by_names[
+                PriceDataSources.HEIKIN_ASHI_CLOSE.value
+            ][-1]
+        return dict(
+            zip(
+                HEIKIN_ASHI_SOURCE_NAMES,
+                get_heikin_ashi(
+                    *(
+                        candles_by_names[column_name]
+                        for column_name in _OHLC_SOURCE_NAMES
+                    ),
+                    previous_ha_open=previous_ha_open,
+                    previous_ha_close=previous_ha_close,
+                ),
+            )
+        )
+    raise ValueError(f"{source_name} is not a derived candle source")
+
+
+class DerivedSources:
+    # memoized derived sources of a symbol and time frame,
+    # when candles are added only the new candles are computed
+    def __init__(self):
+        self.last_candle_time: typing.Optional[float] = None
+        self.candles_count: int = 0
+        self.candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]] = {}
+
+    def get_candles(
+        self,
+        source_name: str,
+        candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]],
+    ) -> npt.NDArray[numpy.float64]:
+        # candles_by_names requires the time and the source columns
+        candle_times: npt.NDArray[numpy.float64] = candles_by_names[
+            PriceDataSources.TIME.value
+        ]
+        kept_candles_count: typing.Optional[int] = self._get_kept_candles_count(
+            candle_times
+        )
+        if kept_candles_count is None:
+            self.candles_by_names = {}
+        elif kept_candles_count < len(candle_times) or (
+            kept_candles_count < self.candles_count
+        ):
+            self._add_new_candles(candles_by_names, kept_candles_count)
+        self.last_candle_time = float(candle_times[-1]) if len(candle_times) else None
+        self.candles_count = len(candle_times)
+        if source_name not in self.candles_by_names:
+            self.candles_by_names.update(
+                get_derived_candles(source_name, candles_by_names)
+            )
+        return self.candles_by_names[source_name]
+
+    def _get_kept_candles_count(
+        self, candle_times: npt.NDArray[numpy.float64]
+    ) -> typing.Optional[int]:
+        # how many memoized candles are still at the start of candle_times
+        if self.last_candle_time is None:
+            return None
+        last_candle_index: int = int(
+            numpy.searchsorted(candle_times, self.last_candle_time)
+        )
+        if (
+            last_candle_index == len(candle_times)
+            or candle_times[last_candle_index] != self.last_candle_time
+            or last_candle_index + 1 > self.candles_count
+        ):
+            return None
+        return last_candle_index + 1
+
+    def _add_new_candles(
+        self,
+        candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]],
+        kept_candles_count: int,
+    ) -> None:
+        new_candles_count: int = (
+            len(candles_by_names[PriceDataSources.TIME.value]) - kept_candles_count
+        )
+        previous_candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]] = {
+            source_name: candles[-kept_candles_count:]
+            for source_name, candles in self.candles_by_names.items()
+        }
+        self.candles_by_names = dict(previous_candles_by_names)
+        if not new_candles_count:
+            return
+        new_candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]] = {
+            column_name: numpy.asarray(candles)[-new_candles_count:]
+            for column_name, candles in candles_by_names.items()
+        }
+        for source_name in previous_candles_by_names:
+            if source_name in self.candles_by_names and len(
+                self.candles_by_names[source_name]
+            ) > len(previous_candles_by_names[source_name]):
+                # already extended with the other heikin ashi sources
+                continue
+            if not all(
+                column_name in new_candles_by_names
+                for column_name in DERIVED_SOURCE_COLUMN_NAMES[source_name]
+            ):
+                # can't be extended from the given columns
+                self.candles_by_names.pop(source_name, None)
+                continue
+            for derived_source_name, new_candles in get_derived_candles(
+                source_name, new_candles_by_names, previous_candles_by_names
+            ).items():
+                self.candles_by_names[derived_source_name] = numpy.concatenate(
+                    (previous_candles_by_names[derived_source_name], new_candles)
+                )
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import time
+import typing
+import weakref
+import numpy
+import numpy.typing as npt
+
+import octobot_backtesting.api as backtesting_api
+import octobot_commons.constants as commons_constants
+import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.tools.utilities as utilities
+from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums import (
+    PriceDataSources,
+)
+
+# Backtesting candle histories are materialized once per
+# (exchange, symbol, time frame, backtesting window, data files) into a
+# columnar .npy file and mapped read-only by every consumer,
+# so all series share the same os page cache instead of owning a copy each
+# and repeated runs skip loading the history
+
+MEMORY_MAPS_FOLDER: str = os.path.join(
+    commons_constants.USER_FOLDER, "cache", "ohlcv_memory_maps"
+)
+# row order in the columnar file
+OHLCV_SOURCE_NAMES: typing.Tuple[str, ...] = (
+    PriceDataSources.TIME.value,
+    PriceDataSources.OPEN.value,
+    PriceDataSources.HIGH.value,
+    PriceDataSources.LOW.value,
+    PriceDataSources.CLOSE.value,
+    PriceDataSources.VOLUME.value,
+)
+CANDLE_GETTERS_BY_SOURCE_NAMES: typing.Dict[str, typing.Callable] = {
+    PriceDataSources.TIME.value: exchange_public_data.Time,
+    PriceDataSources.OPEN.value: exchange_public_data.Open,
+    PriceDataSources.HIGH.value: exchange_public_data.High,
+    PriceDataSources.LOW.value: exchange_public_data.Low,
+    PriceDataSources.CLOSE.value: exchange_public_data.Close,
+    PriceDataSources.VOLUME.value: exchange_public_data.Volume,
+}
+# map files which haven't been used for this long are deleted
+# when writing a new one
+MEMORY_MAPS_MAX_UNUSED_SECONDS: int = 7 * 24 * 60 * 60
+# mappings by (symbol, time frame) of each backtesting exchange manager,
+# released when the backtesting stops
+_MAPPED_HISTORIES_BY_EXCHANGE_MANAGERS: weakref.WeakKeyDictionary = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_memory_map_path(exchange_manager, symbol: str, time_frame: str) -> str:
+    return os.path.join(
+        MEMORY_MAPS_FOLDER,
+        f"{_get_history_name(exchange_manager, symbol, time_frame)}"
+        f"_{_get_data_files_key(exchange_manager)}.npy",
+    )
+
+
+def _get_history_name(exchange_manager, symbol: str, time_frame: str) -> str:
+    start_time: float = backtesting_api.get_backtesting_starting_time(
+        exchange_manager.exchange.backtesting
+    )
+    end_time: float = backtesting_api.get_backtesting_ending_time(
+        exchange_manager.exchange.backtesting
+    )
+    return (
+        f"{exchange_manager.exchange_name}_{symbol}_{time_frame}"
+        f"_{int(start_time)}_{int(end_time)}"
+    ).replace("/", "-").replace(":", "-")
+
+
+def _get_data_files_key(exchange_manager) -> str:
+    # the same window can be read from different or updated data files
+    data_files: typing.List[typing.Tuple[str, int, int]] = []
+    for importer in exchange_manager.exchange.exchange_importers:
+        file_stat: os.stat_result = os.stat(importer.file_path)
+        data_files.append(
+            (
+                os.path.basename(importer.file_path),
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+            )
+        )
+    return hashlib.sha1(json.dumps(sorted(data_files)).encode()).hexdigest()[:16]
+
+
+async def get_mapped_ohlcv(
+    ctx, symbol: typing.Optional[str] = None, time_frame: typing.Optional[str] = None
+) -> numpy.memmap:
+    # read-only (len(OHLCV_SOURCE_NAMES), candles) array, one row per source
+    symbol = symbol or ctx.symbol
+    time_frame = time_frame or ctx.time_frame
+    mapped_histories: typing.Dict[
+        typing.Tuple[str, str], numpy.memmap
+    ] = _MAPPED_HISTORIES_BY_EXCHANGE_MANAGERS.setdefault(ctx.exchange_manager, {})
+    if (symbol, time_frame) in mapped_histories:
+        return mapped_histories[(symbol, time_frame)]
+    file_path: str = get_memory_map_path(ctx.exchange_manager, symbol, time_frame)
+    mapped_ohlcv: typing.Optional[numpy.memmap] = _open_memory_map(file_path)
+    if mapped_ohlcv is None:
+        sm_time = utilities.start_measure_time()
+        await _write_memory_map(ctx, file_path, symbol, time_frame)
+        mapped_ohlcv = _open_memory_map(file_path)
+        _prune_memory_maps(
+            file_path, _get_history_name(ctx.exchange_manager, symbol, time_frame)
+        )
+        utilities.end_measure_time(
+            sm_time,
+            f" memory mapped candles - materialized {symbol}, {time_frame}",
+            min_duration=1,
+        )
+    mapped_histories[(symbol, time_frame)] = mapped_ohlcv
+    return mapped_ohlcv
+
+
+async def get_mapped_candles(
+    ctx,
+    source_name: str,
+    symbol: typing.Optional[str] = None,
+    time_frame: typing.Optional[str] = None,
+) -> numpy.memmap:
+    # a row is a contiguous read-only view, no data is copied
+    return (await get_mapped_ohlcv(ctx, symbol=symbol, time_frame=time_frame))[
+        OHLCV_SOURCE_NAMES.index(source_name)
+    ]
+
+
+def release_mapped_histories(exchange_manager) -> None:
+    # drops the backtesting mappings, arrays still referenced stay valid
+    _MAPPED_HISTORIES_BY_EXCHANGE_MANAGERS.pop(exchange_manager, None)
+
+
+def _open_memory_map(file_path: str) -> typing.Optional[numpy.memmap]:
+    try:
+        mapped_ohlcv: numpy.memmap = numpy.load(file_path, mmap_mode="r")
+        # last use of the file, see _prune_memory_maps
+        os.utime(file_path)
+    except (OSError, ValueError):
+        return None
+    if mapped_ohlcv.ndim != 2 or mapped_ohlcv.shape[0] != len(OHLCV_SOURCE_NAMES):
+        return None
+    return mapped_ohlcv
+
+
+def _prune_memory_maps(file_path: str, history_name: str) -> None:
+    # deletes the maps of outdated data files of this history and the unused maps
+    min_last_use_time: float = time.time() - MEMORY_MAPS_MAX_UNUSED_SECONDS
+    for map_file in os.scandir(MEMORY_MAPS_FOLDER):
+        if map_file.path == file_path:
+            continue
+        try:
+            is_unused: bool = map_file.stat().st_mtime < min_last_use_time
+            if is_unused or (
+                map_file.name.startswith(f"{history_name}_")
+                # being written by a parallel backtest
+                and not map_file.name.endswith(".tmp")
+            ):
+                os.remove(map_file.path)
+        except OSError:
+            # mapped by another backtest on windows or already deleted
+            pass
+
+
+async def _write_memory_map(ctx, file_path: str, symbol: str, time_frame: str):
+    # written column by column so only one full history series is in memory,
+    # then renamed as parallel backtests might map the same file
+    os.makedirs(MEMORY_MAPS_FOLDER, exist_ok=True)
+    temp_file_path: str = f"{file_path}.{os.getpid()}.tmp"
+    ohlcv_file: typing.Optional[numpy.memmap] = None
+    for row_index, source_name in enumerate(OHLCV_SOURCE_NAMES):
+        candles: npt.NDArray[numpy.float64] = await CANDLE_GETTERS_BY_SOURCE_NAMES[
+            source_name
+        ](ctx, symbol=symbol, time_frame=time_frame, limit=-1, max_history=True)
+        if ohlcv_file is None:
+            ohlcv_file = numpy.lib.format.open_memmap(
+                temp_file_path,
+                mode="w+",
+                dtype=numpy.float64,
+                shape=(len(OHLCV_SOURCE_NAMES), len(candles)),
+            )
+        ohlcv_file[row_index] = candles
+        del candles
+    ohlcv_file.flush()
+    del ohlcv_file
+    os.replace(temp_file_path, file_path)
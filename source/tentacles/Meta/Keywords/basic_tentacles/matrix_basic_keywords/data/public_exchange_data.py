@@ -1,11 +1,15 @@
+import asyncio
 import typing
 import numpy
+import numpy.typing as npt
 from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums import (
     PriceDataSources,
 )
 
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.user_inputs2 as user_inputs2
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.tools.utilities as utilities
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.data.ohlcv_memory_map as ohlcv_memory_map
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.data.derived_sources as derived_sources
 import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
 
 
@@ -72,13 +76,24 @@ async def get_candles_(
         maker.candles[symbol] = {}
     if time_frame not in maker.candles[symbol]:
         maker.candles[symbol][time_frame] = {}
-    maker.candles[symbol][time_frame][source_name] = await get_candles_from_name(
-        maker,
-        source_name=source_name,
-        time_frame=time_frame,
-        symbol=symbol,
-        max_history=True,
-    )
+    if (
+        maker.ctx.exchange_manager.is_backtesting
+        and source_name in ohlcv_memory_map.OHLCV_SOURCE_NAMES
+    ):
+        # read-only view on the shared history file instead of a copy
+        maker.candles[symbol][time_frame][
+            source_name
+        ] = await ohlcv_memory_map.get_mapped_candles(
+            maker.ctx, source_name, symbol=symbol, time_frame=time_frame
+        )
+    else:
+        maker.candles[symbol][time_frame][source_name] = await get_candles_from_name(
+            maker,
+            source_name=source_name,
+            time_frame=time_frame,
+            symbol=symbol,
+            max_history=True,
+        )
     utilities.end_measure_time(
         sm_time,
         f" strategy maker - loading candle: {source_name}, {symbol}, {time_frame}",
@@ -87,6 +102,65 @@ async def get_candles_(
     return maker.candles[symbol][time_frame][source_name]
 
 
+async def get_candles_by_names(
+    ctx,
+    source_names: typing.Iterable[str],
+    symbol: typing.Optional[str] = None,
+    time_frame: typing.Optional[str] = None,
+    max_history: bool = False,
+    limit: int = -1,
+) -> typing.Dict[str, npt.NDArray[numpy.float64]]:
+    # fetches each required OHLCV column once for all the requested sources,
+    # concurrently or from the backtesting memory map
+    # limit: amount of most recent candles, -1 for all
+    symbol = symbol or ctx.symbol
+    time_frame = time_frame or ctx.time_frame
+    source_names = tuple(dict.fromkeys(source_names))
+    column_names: typing.Tuple[str, ...] = tuple(
+        dict.fromkeys(
+            column_name
+            for source_name in source_names
+            for column_name in derived_sources.DERIVED_SOURCE_COLUMN_NAMES.get(
+                source_name, (source_name,)
+            )
+        )
+    )
+    if max_history and ctx.exchange_manager.is_backtesting:
+        mapped_ohlcv = await ohlcv_memory_map.get_mapped_ohlcv(
+            ctx, symbol=symbol, time_frame=time_frame
+        )
+        candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]] = {
+            column_name: mapped_ohlcv[
+                ohlcv_memory_map.OHLCV_SOURCE_NAMES.index(column_name)
+            ][-limit if limit > 0 else 0 :]
+            for column_name in column_names
+        }
+    else:
+        candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]] = dict(
+            zip(
+                column_names,
+                await asyncio.gather(
+                    *(
+                        ohlcv_memory_map.CANDLE_GETTERS_BY_SOURCE_NAMES[column_name](
+                            ctx,
+                            symbol=symbol,
+                            time_frame=time_frame,
+                            limit=limit,
+                            max_history=max_history,
+                        )
+                        for column_name in column_names
+                    )
+                ),
+            )
+        )
+    for source_name in source_names:
+        if source_name not in candles_by_names:
+            candles_by_names.update(
+                derived_sources.get_derived_candles(source_name, candles_by_names)
+            )
+    return {source_name: candles_by_names[source_name] for source_name in source_names}
+
+
 async def get_candle_from_time(
     maker,
     timestamp: typing.Union[int, float],
@@ -191,142 +265,27 @@ async def get_candles_from_name(
             limit=-1,
             max_history=max_history,
         )
-    if source_name == PriceDataSources.HL2.value:
-        try:
-            from tentacles.Evaluator.Util.candles_util import CandlesUtil
-
-            return CandlesUtil.HL2(
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.HIGH.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.LOW.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-            )
-        except ImportError as error:
-            raise RuntimeError("CandlesUtil tentacle is required to use HL2") from error
-    if source_name == PriceDataSources.HLC3.value:
-        try:
-            from tentacles.Evaluator.Util.candles_util import CandlesUtil
-
-            return CandlesUtil.HLC3(
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.HIGH.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.LOW.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.CLOSE.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-            )
-        except ImportError as error:
-            raise RuntimeError(
-                "CandlesUtil tentacle is required to use HLC3"
-            ) from error
-    if source_name == PriceDataSources.OHLC4.value:
-        try:
-            from tentacles.Evaluator.Util.candles_util import CandlesUtil
-
-            return CandlesUtil.OHLC4(
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.OPEN.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.HIGH.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.LOW.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.CLOSE.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
+    if source_name in derived_sources.DERIVED_SOURCE_COLUMN_NAMES:
+        # memoized next to the base candles, new candles are computed incrementally
+        candles_by_names: typing.Dict[str, npt.NDArray[numpy.float64]] = {
+            column_name: await get_candles_(
+                maker,
+                source_name=column_name,
+                time_frame=time_frame,
+                symbol=symbol,
             )
-        except ImportError as error:
-            raise RuntimeError(
-                "CandlesUtil tentacle is required to use OHLC4"
-            ) from error
-    if "Heikin Ashi" in source_name:
-        try:
-            from tentacles.Evaluator.Util.candles_util import CandlesUtil
-
-            haOpen, haHigh, haLow, haClose = CandlesUtil.HeikinAshi(
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.OPEN.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.HIGH.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.LOW.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
-                await get_candles_(
-                    maker,
-                    source_name=PriceDataSources.CLOSE.value,
-                    time_frame=time_frame,
-                    symbol=symbol,
-                ),
+            for column_name in (
+                PriceDataSources.TIME.value,
+                *derived_sources.DERIVED_SOURCE_COLUMN_NAMES[source_name],
             )
-            maker.candles[symbol][time_frame][
-                PriceDataSources.HEIKIN_ASHI_OPEN.value
-            ] = haOpen
-            maker.candles[symbol][time_frame][
-                PriceDataSources.HEIKIN_ASHI_HIGH.value
-            ] = haHigh
-            maker.candles[symbol][time_frame][
-                PriceDataSources.HEIKIN_ASHI_LOW.value
-            ] = haLow
-            maker.candles[symbol][time_frame][
-                PriceDataSources.HEIKIN_ASHI_CLOSE.value
-            ] = haClose
-            if source_name == PriceDataSources.HEIKIN_ASHI_CLOSE.value:
-                return haClose
-            if source_name == PriceDataSources.HEIKIN_ASHI_OPEN.value:
-                return haOpen
-            if source_name == PriceDataSources.HEIKIN_ASHI_HIGH.value:
-                return haHigh
-            if source_name == PriceDataSources.HEIKIN_ASHI_LOW.value:
-                return haLow
-        except ImportError as error:
-            raise RuntimeError(
-                "CandlesUtil tentacle is required to use Heikin Ashi"
-            ) from error
+        }
+        if symbol not in maker.derived_sources:
+            maker.derived_sources[symbol] = {}
+        if time_frame not in maker.derived_sources[symbol]:
+            maker.derived_sources[symbol][time_frame] = derived_sources.DerivedSources()
+        return maker.derived_sources[symbol][time_frame].get_candles(
+            source_name, candles_by_names
+        )
 
 
 # async def _load_backtesting_candles_manager(
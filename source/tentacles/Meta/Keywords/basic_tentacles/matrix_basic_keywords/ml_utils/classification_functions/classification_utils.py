@@ -30,7 +30,9 @@ def classify_current_candle(
     exit_long_trades: list,
     is_buy_signals: list,
     is_sell_signals: list,
+    prediction: typing.Optional[int] = None,
 ) -> typing.Tuple[int, int]:
+    # prediction is already computed when using the exact nearest neighbors mode
     historical_predictions.append(
         get_classification_predictions(
             current_candle_index,
@@ -38,6 +40,8 @@ def classify_current_candle(
             feature_arrays,
             y_train_series,
         )
+        if prediction is None
+        else prediction
     )
     (
         bars_since_green_entry,
@@ -17,6 +17,16 @@ def use_every_x_down_sampler(
     return not (candles_back % only_train_on_every_x_bars)
 
 
+def get_down_sampling_period(
+    down_sampler: typing.Callable[[int, int], bool],
+    only_train_on_every_x_bars: typing.Optional[int],
+) -> int:
+    # down samplers select training candles by their index modulo this period
+    if down_sampler is no_down_sampler:
+        return 4
+    return only_train_on_every_x_bars or 1
+
+
 class DownSamplers:
     SKIP_EVERY_X_DOWN_SAMPLER: str = (
         "Skip every x candles down sampler (TradingView downsampler)"
@@ -0,0 +1,256 @@
+import typing
+import numpy
+import numpy.typing as npt
+
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.utils as utils
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.classification_functions.metric_tree as metric_tree
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.classification_functions.quantization as quantization
+
+# max amount of distances computed at once,
+# keeps memory bounded for high max bars back values
+MAX_DISTANCES_PER_CHUNK: int = 4_000_000
+
+
+def get_exact_knn_predictions(
+    start_candle_index: int,
+    end_candle_index: int,
+    classification_settings: utils.ClassificationSettings,
+    feature_arrays: utils.FeatureArrays,
+    y_train_series: typing.Union[list, npt.NDArray[numpy.int64]],
+    use_feature_quantization: bool = True,
+) -> npt.NDArray[numpy.int64]:
+    # Exact Nearest Neighbors Search with Lorentzian Distance:
+    # Instead of walking chronologically through the training window like the
+    # ANN algorithm, every (down sampled) candle of the training window is
+    # compared to the current candle and the k closest ones are selected with a
+    # partial sort (numpy.argpartition).
+    # All candles are classified at once in chunks, so the whole history
+    # is computed vectorized.
+    candle_indices: npt.NDArray[numpy.int64] = numpy.arange(
+        start_candle_index, end_candle_index
+    )
+    predictions: npt.NDArray[numpy.int64] = numpy.zeros(
+        len(candle_indices), dtype=numpy.int64
+    )
+    if not len(candle_indices):
+        return predictions
+    features: npt.NDArray[numpy.float64] = get_feature_matrix(feature_arrays)
+    train_labels: npt.NDArray[numpy.int64] = numpy.asarray(y_train_series)
+    data_length: int = min(features.shape[1], len(train_labels))
+    is_training_candle: npt.NDArray[numpy.bool_] = get_down_sampling_mask(
+        classification_settings, data_length
+    )
+    window_starts, window_ends = get_training_windows(
+        classification_settings, candle_indices, data_length
+    )
+    window_size: int = int(numpy.max(window_ends - window_starts, initial=0))
+    if window_size <= 0:
+        return predictions
+    neighbors_count: int = min(classification_settings.neighbors_count, window_size)
+    if (
+        classification_settings.exact_knn_backend
+        == utils.ExactKnnBackends.VANTAGE_POINT_TREE
+    ):
+        return get_vp_tree_predictions(
+            candle_indices=candle_indices,
+            window_starts=window_starts,
+            window_ends=window_ends,
+            features=features,
+            train_labels=train_labels,
+            is_training_candle=is_training_candle,
+            neighbors_count=neighbors_count,
+        )
+    feature_codes: typing.Optional[npt.NDArray[numpy.unsignedinteger]] = None
+    lookup_table: typing.Optional[npt.NDArray[numpy.float64]] = None
+    if use_feature_quantization and classification_settings.feature_quantization_bits:
+        # compare small integer codes and look up the distance of their
+        # difference instead of computing log(1 + |a - b|) on floats
+        feature_codes = quantization.quantize_features(
+            features, classification_settings.feature_quantization_bits
+        )
+        lookup_table = quantization.get_distance_lookup_table(
+            classification_settings.feature_quantization_bits
+        )
+    chunk_size: int = max(
+        1, MAX_DISTANCES_PER_CHUNK // (window_size * max(len(features), 1))
+    )
+    window_offsets: npt.NDArray[numpy.int64] = numpy.arange(window_size)
+    for chunk_start in range(0, len(candle_indices), chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        neighbor_indices: npt.NDArray[numpy.int64] = (
+            window_starts[chunk, None] + window_offsets[None, :]
+        )
+        is_neighbor: npt.NDArray[numpy.bool_] = (
+            neighbor_indices < window_ends[chunk, None]
+        )
+        neighbor_indices = numpy.where(is_neighbor, neighbor_indices, 0)
+        is_neighbor &= is_training_candle[neighbor_indices]
+        if feature_codes is None:
+            distances: npt.NDArray[numpy.float64] = get_lorentzian_distances(
+                features, candle_indices[chunk], neighbor_indices
+            )
+        else:
+            distances: npt.NDArray[
+                numpy.float64
+            ] = quantization.get_quantized_lorentzian_distances(
+                feature_codes, lookup_table, candle_indices[chunk], neighbor_indices
+            )
+        distances[~is_neighbor] = numpy.inf
+        predictions[chunk] = sum_nearest_labels(
+            distances, neighbor_indices, train_labels, neighbors_count
+        )
+    return predictions
+
+
+def get_vp_tree_predictions(
+    candle_indices: npt.NDArray[numpy.int64],
+    window_starts: npt.NDArray[numpy.int64],
+    window_ends: npt.NDArray[numpy.int64],
+    features: npt.NDArray[numpy.float64],
+    train_labels: npt.NDArray[numpy.int64],
+    is_training_candle: npt.NDArray[numpy.bool_],
+    neighbors_count: int,
+) -> npt.NDArray[numpy.int64]:
+    # the training window only slides forward, so each candle gets inserted
+    # and expired once instead of comparing the full window on every candle
+    predictions: npt.NDArray[numpy.int64] = numpy.zeros(
+        len(candle_indices), dtype=numpy.int64
+    )
+    vp_tree: metric_tree.LorentzianVPTree = metric_tree.LorentzianVPTree(features)
+    window_start: int = int(window_starts[0])
+    window_end: int = window_start
+    for prediction_index, candle_index in enumerate(candle_indices.tolist()):
+        new_window_start: int = int(window_starts[prediction_index])
+        new_window_end: int = int(window_ends[prediction_index])
+        for expired_index in range(window_start, min(new_window_start, window_end)):
+            vp_tree.expire(expired_index)
+        for new_index in range(max(window_end, new_window_start), new_window_end):
+            if is_training_candle[new_index]:
+                vp_tree.insert(new_index)
+        window_start, window_end = new_window_start, new_window_end
+        _, nearest = vp_tree.query(features[:, candle_index], neighbors_count)
+        predictions[prediction_index] = numpy.sum(train_labels[nearest])
+    return predictions
+
+
+def get_feature_matrix(
+    feature_arrays: utils.FeatureArrays,
+) -> npt.NDArray[numpy.float64]:
+    return numpy.array(feature_arrays.feature_arrays, dtype=numpy.float64)
+
+
+def get_lorentzian_distances(
+    features: npt.NDArray[numpy.float64],
+    candle_indices: npt.NDArray[numpy.int64],
+    neighbor_indices: npt.NDArray[numpy.int64],
+) -> npt.NDArray[numpy.float64]:
+    distances: npt.NDArray[numpy.float64] = numpy.zeros(neighbor_indices.shape)
+    for feature_array in features:
+        distances += numpy.log1p(
+            numpy.abs(
+                feature_array[candle_indices, None] - feature_array[neighbor_indices]
+            )
+        )
+    return distances
+
+
+def sum_nearest_labels(
+    distances: npt.NDArray[numpy.float64],
+    neighbor_indices: npt.NDArray[numpy.int64],
+    train_labels: npt.NDArray[numpy.int64],
+    neighbors_count: int,
+) -> npt.NDArray[numpy.int64]:
+    nearest: npt.NDArray[numpy.int64] = numpy.argpartition(
+        distances, neighbors_count - 1, axis=1
+    )[:, :neighbors_count]
+    nearest_distances: npt.NDArray[numpy.float64] = numpy.take_along_axis(
+        distances, nearest, axis=1
+    )
+    nearest_labels: npt.NDArray[numpy.int64] = train_labels[
+        numpy.take_along_axis(neighbor_indices, nearest, axis=1)
+    ]
+    # windows with less training candles than neighbors_count
+    # contain excluded candles with an infinite distance
+    return numpy.sum(
+        numpy.where(numpy.isfinite(nearest_distances), nearest_labels, 0), axis=1
+    )
+
+
+def get_down_sampling_mask(
+    classification_settings: utils.ClassificationSettings, data_length: int
+) -> npt.NDArray[numpy.bool_]:
+    return numpy.fromiter(
+        (
+            bool(
+                classification_settings.down_sampler(
+                    candles_back, classification_settings.only_train_on_every_x_bars
+                )
+            )
+            for candles_back in range(data_length)
+        ),
+        dtype=numpy.bool_,
+        count=data_length,
+    )
+
+
+def get_training_windows(
+    classification_settings: utils.ClassificationSettings,
+    candle_indices: npt.NDArray[numpy.int64],
+    data_length: int,
+) -> typing.Tuple[npt.NDArray[numpy.int64], npt.NDArray[numpy.int64]]:
+    # same training window as classification_utils._get_candles_back_start_end_index
+    size_loops: npt.NDArray[numpy.int64] = numpy.minimum(
+        classification_settings.max_bars_back - 1, candle_indices
+    )
+    if classification_settings.use_remote_fractals:
+        window_starts: npt.NDArray[numpy.int64] = numpy.maximum(
+            candle_indices - classification_settings.live_history_size, 0
+        )
+        window_ends: npt.NDArray[numpy.int64] = window_starts + size_loops
+    else:
+        window_starts: npt.NDArray[numpy.int64] = candle_indices - size_loops
+        window_ends: npt.NDArray[numpy.int64] = candle_indices
+    return window_starts, numpy.minimum(window_ends, data_length)
+
+
+def get_signal_agreement_report(
+    reference_predictions: typing.Union[list, npt.NDArray[numpy.int64]],
+    predictions: typing.Union[list, npt.NDArray[numpy.int64]],
+    required_neighbors: float,
+) -> dict:
+    reference_predictions = numpy.asarray(reference_predictions)
+    predictions = numpy.asarray(predictions)
+    candles_count: int = min(len(reference_predictions), len(predictions))
+    if not candles_count:
+        return {"candles": 0}
+    reference_predictions = reference_predictions[-candles_count:]
+    predictions = predictions[-candles_count:]
+    reference_signals = _get_unfiltered_signals(
+        reference_predictions, required_neighbors
+    )
+    signals = _get_unfiltered_signals(predictions, required_neighbors)
+    return {
+        "candles": candles_count,
+        "same_prediction_percent": round(
+            float(numpy.mean(reference_predictions == predictions)) * 100, 2
+        ),
+        "same_signal_percent": round(
+            float(numpy.mean(reference_signals == signals)) * 100, 2
+        ),
+        "reference_signals": int(numpy.count_nonzero(reference_signals)),
+        "signals": int(numpy.count_nonzero(signals)),
+    }
+
+
+def _get_unfiltered_signals(
+    predictions: npt.NDArray[numpy.int64], required_neighbors: float
+) -> npt.NDArray[numpy.int64]:
+    return numpy.where(
+        predictions > required_neighbors,
+        utils.SignalDirection.long,
+        numpy.where(
+            predictions < -required_neighbors,
+            utils.SignalDirection.short,
+            utils.SignalDirection.neutral,
+        ),
+    )
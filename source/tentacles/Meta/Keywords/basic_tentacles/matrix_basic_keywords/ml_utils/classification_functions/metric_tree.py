@@ -0,0 +1,225 @@
+import heapq
+import typing
+import numpy
+import numpy.typing as npt
+
+# max amount of candles in a leaf, leaves are compared vectorized
+LEAF_SIZE: int = 128
+# the tree gets rebuilt once the insertion buffer reaches this share of the tree
+REBUILD_BUFFER_RATIO: float = 0.25
+MIN_REBUILD_BUFFER_SIZE: int = 256
+# the tree gets rebuilt once this share of the tree is expired
+REBUILD_EXPIRED_RATIO: float = 0.5
+
+
+def get_lorentzian_distances_to(
+    features: npt.NDArray[numpy.float64],
+    point: npt.NDArray[numpy.float64],
+    candidate_indices: npt.NDArray[numpy.int64],
+) -> npt.NDArray[numpy.float64]:
+    return numpy.sum(
+        numpy.log1p(numpy.abs(features[:, candidate_indices] - point[:, None])),
+        axis=0,
+    )
+
+
+class LorentzianVPTree:
+    # Vantage point tree over the feature vectors of the training window.
+    # Lorentzian distance sum(log(1 + |dx|)) is a metric, so whole branches
+    # can be skipped using the triangle inequality.
+    # New candles go to a buffer which is compared brute force and expired
+    # candles are only flagged, the tree is rebuilt once too many of them piled up.
+    def __init__(self, features: npt.NDArray[numpy.float64], seed: int = 0):
+        # features shape: (feature_count, data_length), candles are identified
+        # by their index in the feature arrays
+        self.features: npt.NDArray[numpy.float64] = features
+        self.is_active: npt.NDArray[numpy.bool_] = numpy.zeros(
+            features.shape[1], dtype=numpy.bool_
+        )
+        self.is_in_tree: npt.NDArray[numpy.bool_] = numpy.zeros(
+            features.shape[1], dtype=numpy.bool_
+        )
+        self.active_count: int = 0
+        self.tree_size: int = 0
+        self.expired_tree_count: int = 0
+        self.buffer: typing.List[int] = []
+        self._random: numpy.random.Generator = numpy.random.default_rng(seed)
+        self._root: int = -1
+        self._vantage_points: typing.List[int] = []
+        self._radiuses: typing.List[float] = []
+        self._insides: typing.List[int] = []
+        self._outsides: typing.List[int] = []
+        self._leaves: typing.List[typing.Optional[npt.NDArray[numpy.int64]]] = []
+
+    def insert(self, candle_index: int) -> None:
+        if self.is_active[candle_index]:
+            return
+        self.is_active[candle_index] = True
+        self.active_count += 1
+        if self.is_in_tree[candle_index]:
+            self.expired_tree_count -= 1
+        else:
+            self.buffer.append(candle_index)
+            self._rebuild_if_necessary()
+
+    def expire(self, candle_index: int) -> None:
+        if not self.is_active[candle_index]:
+            return
+        self.is_active[candle_index] = False
+        self.active_count -= 1
+        if self.is_in_tree[candle_index]:
+            self.expired_tree_count += 1
+            self._rebuild_if_necessary()
+        # expired buffer candles are skipped when querying
+
+    def query(
+        self, point: npt.NDArray[numpy.float64], neighbors_count: int
+    ) -> typing.Tuple[npt.NDArray[numpy.float64], npt.NDArray[numpy.int64]]:
+        # max heap of the k nearest candles as (-distance, candle_index)
+        nearest: typing.List[typing.Tuple[float, int]] = []
+        if self._root != -1:
+            self._search(self._root, point, neighbors_count, nearest)
+        if self.buffer:
+            buffer: npt.NDArray[numpy.int64] = numpy.array(
+                self.buffer, dtype=numpy.int64
+            )
+            self._push_candidates(
+                buffer[self.is_active[buffer]], point, neighbors_count, nearest
+            )
+        nearest.sort(reverse=True)
+        return (
+            numpy.array([-distance for distance, _ in nearest], dtype=numpy.float64),
+            numpy.array([candle_index for _, candle_index in nearest], dtype=numpy.int64),
+        )
+
+    def rebuild(self) -> None:
+        candle_indices: npt.NDArray[numpy.int64] = numpy.flatnonzero(self.is_active)
+        self.is_in_tree[:] = False
+        self.is_in_tree[candle_indices] = True
+        self.tree_size = len(candle_indices)
+        self.expired_tree_count = 0
+        self.buffer = []
+        self._vantage_points = []
+        self._radiuses = []
+        self._insides = []
+        self._outsides = []
+        self._leaves = []
+        self._root = self._build(candle_indices) if self.tree_size else -1
+
+    def _rebuild_if_necessary(self) -> None:
+        if len(self.buffer) > max(
+            MIN_REBUILD_BUFFER_SIZE, self.tree_size * REBUILD_BUFFER_RATIO
+        ) or (
+            self.tree_size
+            and self.expired_tree_count > self.tree_size * REBUILD_EXPIRED_RATIO
+        ):
+            self.rebuild()
+
+    def _build(self, candle_indices: npt.NDArray[numpy.int64]) -> int:
+        node: int = self._add_node()
+        if len(candle_indices) <= LEAF_SIZE:
+            self._leaves[node] = candle_indices
+            return node
+        vantage_point_position: int = int(self._random.integers(len(candle_indices)))
+        vantage_point: int = int(candle_indices[vantage_point_position])
+        others: npt.NDArray[numpy.int64] = numpy.delete(
+            candle_indices, vantage_point_position
+        )
+        distances: npt.NDArray[numpy.float64] = get_lorentzian_distances_to(
+            self.features, self.features[:, vantage_point], others
+        )
+        radius: float = float(numpy.median(distances))
+        is_inside: npt.NDArray[numpy.bool_] = distances <= radius
+        if is_inside.all():
+            # all candles are at the same distance, splitting wouldn't help
+            self._leaves[node] = candle_indices
+            return node
+        self._vantage_points[node] = vantage_point
+        self._radiuses[node] = radius
+        self._insides[node] = self._build(others[is_inside])
+        self._outsides[node] = self._build(others[~is_inside])
+        return node
+
+    def _add_node(self) -> int:
+        self._vantage_points.append(-1)
+        self._radiuses.append(0.0)
+        self._insides.append(-1)
+        self._outsides.append(-1)
+        self._leaves.append(None)
+        return len(self._leaves) - 1
+
+    def _search(
+        self,
+        node: int,
+        point: npt.NDArray[numpy.float64],
+        neighbors_count: int,
+        nearest: typing.List[typing.Tuple[float, int]],
+    ) -> None:
+        leaf: typing.Optional[npt.NDArray[numpy.int64]] = self._leaves[node]
+        if leaf is not None:
+            self._push_candidates(
+                leaf[self.is_active[leaf]], point, neighbors_count, nearest
+            )
+            return
+        vantage_point: int = self._vantage_points[node]
+        distance: float = float(
+            numpy.sum(numpy.log1p(numpy.abs(self.features[:, vantage_point] - point)))
+        )
+        if self.is_active[vantage_point]:
+            _push_nearest(nearest, neighbors_count, distance, vantage_point)
+        radius: float = self._radiuses[node]
+        # triangle inequality: candles inside are at least distance - radius away
+        # and candles outside at least radius - distance
+        if distance <= radius:
+            self._search(self._insides[node], point, neighbors_count, nearest)
+            if radius - distance <= _get_search_radius(nearest, neighbors_count):
+                self._search(self._outsides[node], point, neighbors_count, nearest)
+        else:
+            self._search(self._outsides[node], point, neighbors_count, nearest)
+            if distance - radius <= _get_search_radius(nearest, neighbors_count):
+                self._search(self._insides[node], point, neighbors_count, nearest)
+
+    def _push_candidates(
+        self,
+        candle_indices: npt.NDArray[numpy.int64],
+        point: npt.NDArray[numpy.float64],
+        neighbors_count: int,
+        nearest: typing.List[typing.Tuple[float, int]],
+    ) -> None:
+        if not len(candle_indices):
+            return
+        distances: npt.NDArray[numpy.float64] = get_lorentzian_distances_to(
+            self.features, point, candle_indices
+        )
+        # only push candles which can still be part of the k nearest
+        is_closer: npt.NDArray[numpy.bool_] = distances < _get_search_radius(
+            nearest, neighbors_count
+        )
+        distances, candle_indices = distances[is_closer], candle_indices[is_closer]
+        if len(distances) > neighbors_count:
+            closest: npt.NDArray[numpy.int64] = numpy.argpartition(
+                distances, neighbors_count - 1
+            )[:neighbors_count]
+            distances, candle_indices = distances[closest], candle_indices[closest]
+        for distance, candle_index in zip(distances.tolist(), candle_indices.tolist()):
+            _push_nearest(nearest, neighbors_count, distance, candle_index)
+
+
+def _get_search_radius(
+    nearest: typing.List[typing.Tuple[float, int]], neighbors_count: int
+) -> float:
+    if len(nearest) < neighbors_count:
+        return numpy.inf
+    return -nearest[0][0]
+
+
+def _push_nearest(
+    nearest: typing.List[typing.Tuple[float, int]],
+    neighbors_count: int,
+    distance: float,
+    candle_index: int,
+) -> None:
+    if len(nearest) < neighbors_count:
+        heapq.heappush(nearest, (-distance, candle_index))
+    elif distance < -nearest[0][0]:
+        heapq.heapreplace(nearest, (-distance, candle_index))
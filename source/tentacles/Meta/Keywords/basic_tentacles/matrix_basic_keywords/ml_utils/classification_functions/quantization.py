@@ -0,0 +1,62 @@
+import typing
+import numpy
+import numpy.typing as npt
+
+# all features are normalized or rescaled to 0 - 1,
+# so a feature code is round(feature * max_code)
+CODE_TYPES_BY_BITS: typing.Dict[int, type] = {
+    8: numpy.uint8,
+    16: numpy.uint16,
+}
+_LOOKUP_TABLES_BY_BITS: typing.Dict[int, npt.NDArray[numpy.float64]] = {}
+
+
+def quantize_features(
+    features: npt.NDArray[numpy.float64], bits: int
+) -> npt.NDArray[numpy.unsignedinteger]:
+    max_code: int = (1 << bits) - 1
+    return numpy.rint(numpy.clip(features, 0, 1) * max_code).astype(
+        CODE_TYPES_BY_BITS[bits]
+    )
+
+
+def get_distance_lookup_table(bits: int) -> npt.NDArray[numpy.float64]:
+    # log(1 + |a - b|) for every possible code difference
+    if bits not in _LOOKUP_TABLES_BY_BITS:
+        max_code: int = (1 << bits) - 1
+        _LOOKUP_TABLES_BY_BITS[bits] = numpy.log1p(
+            numpy.arange(max_code + 1, dtype=numpy.float64) / max_code
+        )
+    return _LOOKUP_TABLES_BY_BITS[bits]
+
+
+def get_quantized_lorentzian_distances(
+    feature_codes: npt.NDArray[numpy.unsignedinteger],
+    lookup_table: npt.NDArray[numpy.float64],
+    candle_indices: npt.NDArray[numpy.int64],
+    neighbor_indices: npt.NDArray[numpy.int64],
+) -> npt.NDArray[numpy.float64]:
+    distances: npt.NDArray[numpy.float64] = numpy.zeros(neighbor_indices.shape)
+    for feature_codes_array in feature_codes:
+        candle_codes = feature_codes_array[candle_indices, None]
+        neighbor_codes = feature_codes_array[neighbor_indices]
+        # max - min keeps the difference unsigned without overflowing
+        distances += lookup_table[
+            numpy.maximum(candle_codes, neighbor_codes)
+            - numpy.minimum(candle_codes, neighbor_codes)
+        ]
+    return distances
+
+
+def get_quantization_error_report(
+    features: npt.NDArray[numpy.float64], bits: int
+) -> dict:
+    max_code: int = (1 << bits) - 1
+    errors: npt.NDArray[numpy.float64] = numpy.abs(
+        quantize_features(features, bits) / max_code - features
+    )
+    return {
+        "bits": bits,
+        "mean_feature_error": float(numpy.mean(errors)) if errors.size else 0.0,
+        "max_feature_error": float(numpy.max(errors)) if errors.size else 0.0,
+    }
@@ -3,9 +3,26 @@ import typing
 import numpy.typing as npt
 import numpy as numpy
 
-import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.tools.utilities as basic_utilities
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.utils as utils
 
+# names of the get_kernel_data return values
+KERNEL_DATA_NAMES: typing.Tuple[str, ...] = (
+    "alerts_bullish",
+    "alerts_bearish",
+    "is_bullishs",
+    "is_bearishs",
+    "is_bearish_changes",
+    "is_bullish_changes",
+    "is_bullish_cross_alerts",
+    "is_bearish_cross_alerts",
+    "kernel_estimate",
+    "yhat2",
+    "is_bearish_rates",
+    "was_bullish_rates",
+    "is_bullish_rates",
+    "was_bearish_rates",
+)
+
 
 def rationalQuadratic(
     data_source: npt.NDArray[numpy.float64],
@@ -70,28 +87,23 @@ def get_kernel_data(
         kernel_settings.lookback_window - kernel_settings.lag,
         kernel_settings.regression_level,
     )
-    yhat1, yhat2 = basic_utilities.cut_data_to_same_len((yhat1, yhat2))
+    # both regressions start on the same bar, so yhat1 and yhat2 are aligned
 
     kernel_estimate: npt.NDArray[numpy.float64] = yhat1
     # Kernel Rates of Change
-    # shift and cut data for numpy
-    yhat1_cutted_1, yhat1_shifted_1 = basic_utilities.shift_data(yhat1, 1)
-    yhat1_cutted_2, yhat1_shifted_2 = basic_utilities.shift_data(yhat1, 2)
-    was_bearish_rates: npt.NDArray[numpy.bool_] = yhat1_shifted_2 > yhat1_cutted_2
-    was_bullish_rates: npt.NDArray[numpy.bool_] = yhat1_shifted_2 < yhat1_cutted_2
+    # views starting on the third bar, so all rates are aligned
+    yhat1_current: npt.NDArray[numpy.float64] = yhat1[2:]
+    yhat1_1_bar_back: npt.NDArray[numpy.float64] = yhat1[1:-1]
+    yhat1_2_bars_back: npt.NDArray[numpy.float64] = yhat1[:-2]
+    was_bearish_rates: npt.NDArray[numpy.bool_] = yhat1_2_bars_back > yhat1_current
+    was_bullish_rates: npt.NDArray[numpy.bool_] = yhat1_2_bars_back < yhat1_current
 
-    is_bearish_rates: npt.NDArray[numpy.bool_] = yhat1_shifted_1 > yhat1_cutted_1
-    is_bullish_rates: npt.NDArray[numpy.bool_] = yhat1_shifted_1 < yhat1_cutted_1
+    is_bearish_rates: npt.NDArray[numpy.bool_] = yhat1_1_bar_back > yhat1_current
+    is_bullish_rates: npt.NDArray[numpy.bool_] = yhat1_1_bar_back < yhat1_current
 
-    is_bearish_rates, was_bullish_rates = basic_utilities.cut_data_to_same_len(
-        (is_bearish_rates, was_bullish_rates)
-    )
     is_bearish_changes: npt.NDArray[numpy.bool_] = numpy.logical_and(
         is_bearish_rates, was_bullish_rates
     )
-    is_bullish_rates, was_bearish_rates = basic_utilities.cut_data_to_same_len(
-        (is_bullish_rates, was_bearish_rates)
-    )
     is_bullish_changes: npt.NDArray[numpy.bool_] = numpy.logical_and(
         is_bullish_rates, was_bearish_rates
     )
@@ -0,0 +1,164 @@
+import collections
+import math
+import typing
+import numpy as numpy
+
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.kernel_functions.kernel as kernel
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.ml_extensions_2.streaming_extensions as streaming_extensions
+
+# Streaming version of kernel.get_kernel_data:
+# keeps the last regression_level bars and the last kernel estimates
+# and only computes the newest bar, so a live candle doesn't depend on the history size
+
+
+class StreamingKernelRegression:
+    # same as kernel.rationalQuadratic / kernel.gaussian with precomputed weights
+    def __init__(self, weights: typing.List[float]):
+        # weights by bars back
+        self.weights: typing.List[float] = weights
+        self.cumulative_weight: float = 0
+        for weight in weights:
+            self.cumulative_weight += weight
+        # +1 as the first estimate is on the bar after the window is filled
+        self.values: collections.deque = collections.deque(maxlen=len(weights) + 1)
+
+    def update(self, value: float) -> typing.Optional[float]:
+        self.values.append(value)
+        if len(self.values) < self.values.maxlen:
+            return None
+        current_weight: float = 0
+        for bars_back_index, weight in enumerate(self.weights):
+            current_weight += self.values[-1 - bars_back_index] * weight
+        return current_weight / self.cumulative_weight
+
+
+def get_rational_quadratic_weights(
+    look_back: int, relative_weight: float, start_at_Bar: int
+) -> typing.List[float]:
+    return [
+        pow(
+            1
+            + (pow(bars_back_index, 2) / ((pow(look_back, 2) * 2 * relative_weight))),
+            -relative_weight,
+        )
+        for bars_back_index in range(0, start_at_Bar + 1)
+    ]
+
+
+def get_gaussian_weights(look_back: int, start_at_Bar: int) -> typing.List[float]:
+    return [
+        math.exp(-pow(bars_back_index, 2) / (2 * pow(look_back, 2)))
+        for bars_back_index in range(0, start_at_Bar + 1)
+    ]
+
+
+class StreamingKernel:
+    # streamed series of kernel.get_kernel_data, each one skips as many warm up
+    # candles as the full recomputation
+    def __init__(self, kernel_settings):
+        self.use_kernel_smoothing: bool = kernel_settings.use_kernel_smoothing
+        self.use_kernel_filter: bool = kernel_settings.use_kernel_filter
+        self.rational_quadratic: StreamingKernelRegression = StreamingKernelRegression(
+            get_rational_quadratic_weights(
+                kernel_settings.lookback_window,
+                kernel_settings.relative_weighting,
+                kernel_settings.regression_level,
+            )
+        )
+        self.gaussian: StreamingKernelRegression = StreamingKernelRegression(
+            get_gaussian_weights(
+                kernel_settings.lookback_window - kernel_settings.lag,
+                kernel_settings.regression_level,
+            )
+        )
+        # the rates of change need the last 3 estimates
+        self.yhat1s: collections.deque = collections.deque(maxlen=3)
+        self.yhat2s: collections.deque = collections.deque(maxlen=2)
+        self.series_by_names: typing.Dict[str, streaming_extensions.StreamedSeries] = {
+            name: streaming_extensions.StreamedSeries(
+                numpy.float64 if name in ("kernel_estimate", "yhat2") else numpy.bool_
+            )
+            for name in kernel.KERNEL_DATA_NAMES
+        }
+
+    def update(self, user_selected_candle: float) -> None:
+        values_by_names: typing.Dict[str, typing.Any] = self._get_values_by_names(
+            user_selected_candle
+        )
+        for name, series in self.series_by_names.items():
+            series.update(values_by_names.get(name))
+
+    def _get_values_by_names(
+        self, user_selected_candle: float
+    ) -> typing.Dict[str, typing.Any]:
+        # newest values, series without a value are in their warm up
+        values_by_names: typing.Dict[str, typing.Any] = {}
+        if not self.use_kernel_filter:
+            values_by_names["is_bullishs"] = values_by_names["is_bearishs"] = True
+        yhat1: typing.Optional[float] = self.rational_quadratic.update(
+            user_selected_candle
+        )
+        yhat2: typing.Optional[float] = self.gaussian.update(user_selected_candle)
+        if yhat1 is None or yhat2 is None:
+            return values_by_names
+        self.yhat1s.append(yhat1)
+        self.yhat2s.append(yhat2)
+        values_by_names["kernel_estimate"] = yhat1
+        values_by_names["yhat2"] = yhat2
+        if len(self.yhat1s) > 1:
+            yhat1_1: float = self.yhat1s[-2]
+            yhat2_1: float = self.yhat2s[-2]
+            # Kernel Crossovers
+            values_by_names["is_bullish_cross_alerts"] = (
+                yhat2_1 < yhat1_1 and yhat2 > yhat1
+            )
+            values_by_names["is_bearish_cross_alerts"] = (
+                yhat2_1 > yhat1_1 and yhat2 < yhat1
+            )
+        if len(self.yhat1s) == self.yhat1s.maxlen:
+            yhat1_2, yhat1_1, _ = self.yhat1s
+            # like kernel.get_kernel_data, compares 2 bars back with the current bar
+            values_by_names["is_bearish_rates"] = yhat1_1 > yhat1
+            values_by_names["was_bullish_rates"] = yhat1_2 < yhat1
+            values_by_names["is_bullish_rates"] = yhat1_1 < yhat1
+            values_by_names["was_bearish_rates"] = yhat1_2 > yhat1
+            values_by_names["is_bearish_changes"] = (
+                values_by_names["is_bearish_rates"]
+                and values_by_names["was_bullish_rates"]
+            )
+            values_by_names["is_bullish_changes"] = (
+                values_by_names["is_bullish_rates"]
+                and values_by_names["was_bearish_rates"]
+            )
+        if self.use_kernel_smoothing:
+            alert_names: typing.Tuple[str, str] = (
+                "is_bullish_cross_alerts",
+                "is_bearish_cross_alerts",
+            )
+            if self.use_kernel_filter:
+                values_by_names["is_bullishs"] = yhat2 >= yhat1
+                values_by_names["is_bearishs"] = yhat2 <= yhat1
+        else:
+            alert_names: typing.Tuple[str, str] = (
+                "is_bullish_changes",
+                "is_bearish_changes",
+            )
+            if self.use_kernel_filter and "is_bullish_rates" in values_by_names:
+                values_by_names["is_bullishs"] = values_by_names["is_bullish_rates"]
+                values_by_names["is_bearishs"] = values_by_names["is_bearish_rates"]
+        # Alert Variables
+        if alert_names[0] in values_by_names:
+            values_by_names["alerts_bullish"] = values_by_names[alert_names[0]]
+            values_by_names["alerts_bearish"] = values_by_names[alert_names[1]]
+        return values_by_names
+
+    def get_kernel_data(self, data_length: int) -> tuple:
+        # same as kernel.get_kernel_data on the last data_length candles
+        return tuple(
+            self.series_by_names[name].get_values(data_length)
+            for name in kernel.KERNEL_DATA_NAMES
+        )
+
+    def trim(self, keep_length: int) -> None:
+        for series in self.series_by_names.values():
+            series.trim(keep_length)
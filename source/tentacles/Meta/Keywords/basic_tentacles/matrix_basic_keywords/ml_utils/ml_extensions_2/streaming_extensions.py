@@ -0,0 +1,568 @@
+import abc
+import math
+import typing
+import numpy
+import numpy.typing as npt
+
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.ml_extensions_2.ml_extensions as ml_extensions
+
+# Streaming versions of the ml_extensions features:
+# each indicator keeps its state and gets updated with one candle at a time,
+# instead of recomputing tulipy indicators over the whole history on every candle.
+# The math and the warm up (amount of skipped candles) is the same as in
+# ml_extensions, so the streamed series matches the full recomputation
+# of the candles they were fed with.
+
+# initial capacity of the growable value buffers
+INITIAL_BUFFER_SIZE: int = 1024
+
+
+class GrowableSeries:
+    # numpy buffer with amortized O(1) appends
+    def __init__(
+        self, dtype: type = numpy.float64, capacity: int = INITIAL_BUFFER_SIZE
+    ):
+        self._values: npt.NDArray = numpy.empty(max(capacity, 1), dtype=dtype)
+        self.length: int = 0
+
+    def append(self, value) -> None:
+        if self.length == len(self._values):
+            values = numpy.empty(len(self._values) * 2, dtype=self._values.dtype)
+            values[: self.length] = self._values
+            self._values = values
+        self._values[self.length] = value
+        self.length += 1
+
+    def trim(self, keep_length: int) -> None:
+        # only keeps the newest keep_length values
+        if self.length > keep_length:
+            self._values[:keep_length] = self._values[
+                self.length - keep_length : self.length
+            ]
+            self.length = keep_length
+
+    @property
+    def values(self) -> npt.NDArray:
+        return self._values[: self.length]
+
+    def __len__(self) -> int:
+        return self.length
+
+
+class StreamedSeries:
+    # values of a streamed indicator: the full recomputation skips as many
+    # warm up candles and returns a value for each candle after them
+    def __init__(self, dtype: type = numpy.float64):
+        self.values: GrowableSeries = GrowableSeries(dtype)
+        # candles fed before the first value, None until then
+        self.warm_up_length: typing.Optional[int] = None
+        self.candles_count: int = 0
+
+    def update(self, value) -> None:
+        # value is None during the warm up
+        if value is not None:
+            if self.warm_up_length is None:
+                self.warm_up_length = self.candles_count
+            self.values.append(value)
+        self.candles_count += 1
+
+    def get_values(self, data_length: int) -> npt.NDArray:
+        # copy of the values the full recomputation returns on the last
+        # data_length candles, the buffer keeps changing with the next candles
+        values_count: int = 0
+        if self.warm_up_length is not None:
+            values_count = max(
+                min(data_length - self.warm_up_length, len(self.values)), 0
+            )
+        return self.values.values[len(self.values) - values_count :].copy()
+
+    def trim(self, keep_length: int) -> None:
+        self.values.trim(keep_length)
+
+
+class StreamingEMA:
+    # same as tulipy.ema: seeded with the first value
+    def __init__(self, length: int):
+        self.per: float = 2 / (length + 1)
+        self.value: typing.Optional[float] = None
+
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value = (value - self.value) * self.per + self.value
+        return self.value
+
+
+class StreamingSMA:
+    # same as tulipy.sma: first value after length candles
+    def __init__(self, length: int):
+        self.length: int = length
+        self.scale: float = 1 / length
+        self.window: typing.List[float] = []
+        self.index: int = 0
+        self.sum: float = 0
+
+    def update(self, value: float) -> typing.Optional[float]:
+        if len(self.window) < self.length:
+            self.window.append(value)
+            self.sum += value
+            if len(self.window) < self.length:
+                return None
+        else:
+            self.sum += value
+            self.sum -= self.window[self.index]
+            self.window[self.index] = value
+            self.index = (self.index + 1) % self.length
+        return self.sum * self.scale
+
+
+class StreamingRSI:
+    # same as tulipy.rsi: first value after length + 1 candles
+    def __init__(self, length: int):
+        self.length: int = length
+        self.per: float = 1 / length
+        self.previous_value: typing.Optional[float] = None
+        self.candles_count: int = 0
+        self.smooth_up: float = 0
+        self.smooth_down: float = 0
+
+    def update(self, value: float) -> typing.Optional[float]:
+        previous_value = self.previous_value
+        self.previous_value = value
+        self.candles_count += 1
+        if previous_value is None:
+            return None
+        upward: float = value - previous_value if value > previous_value else 0
+        downward: float = previous_value - value if value < previous_value else 0
+        if self.candles_count <= self.length:
+            self.smooth_up += upward
+            self.smooth_down += downward
+            return None
+        if self.candles_count == self.length + 1:
+            self.smooth_up += upward
+            self.smooth_down += downward
+            self.smooth_up /= self.length
+            self.smooth_down /= self.length
+        else:
+            self.smooth_up = (upward - self.smooth_up) * self.per + self.smooth_up
+            self.smooth_down = (
+                downward - self.smooth_down
+            ) * self.per + self.smooth_down
+        return 100 * _divide(self.smooth_up, self.smooth_up + self.smooth_down)
+
+
+class StreamingCCI:
+    # same as tulipy.cci: first value after 2 * length - 1 candles
+    # the mean deviation needs the whole window, so an update is O(length)
+    def __init__(self, length: int):
+        self.length: int = length
+        self.scale: float = 1 / length
+        self.window: typing.List[float] = []
+        self.index: int = 0
+        self.sum: float = 0
+        self.candles_count: int = 0
+
+    def update(
+        self, high: float, low: float, close: float
+    ) -> typing.Optional[float]:
+        typical_price: float = (high + low + close) * (1 / 3)
+        if len(self.window) < self.length:
+            self.window.append(typical_price)
+        else:
+            self.sum -= self.window[self.index]
+            self.window[self.index] = typical_price
+            self.index = (self.index + 1) % self.length
+        self.sum += typical_price
+        self.candles_count += 1
+        if self.candles_count < self.length * 2 - 1:
+            return None
+        average: float = self.sum * self.scale
+        mean_deviation: float = 0
+        for window_value in self.window:
+            mean_deviation += abs(average - window_value)
+        return _divide(typical_price - average, mean_deviation * self.scale * 0.015)
+
+
+class StreamingRMA:
+    # same as utils.calculate_rma: skips the first 50 sma values
+    # and starts with the sma of the values at that point
+    SKIPPED_SMA_VALUES: int = 50
+
+    def __init__(self, length: int):
+        self.alpha: float = 1 / length
+        self.sma: StreamingSMA = StreamingSMA(length)
+        self.sma_count: int = 0
+        self.value: typing.Optional[float] = None
+
+    def update(self, value: float) -> typing.Optional[float]:
+        if self.value is not None:
+            self.value = (value * self.alpha) + ((1 - self.alpha) * self.value)
+            return self.value
+        sma: typing.Optional[float] = self.sma.update(value)
+        if sma is None:
+            return None
+        self.sma_count += 1
+        if self.sma_count > self.SKIPPED_SMA_VALUES:
+            self.value = sma
+        return self.value
+
+
+class StreamingFeature(abc.ABC):
+    # base class for the streamed features of utils.series_from
+    def __init__(self, normalize: bool = False):
+        self.normalize: bool = normalize
+        self.raw_values: StreamedSeries = StreamedSeries()
+
+    def update(self, close: float, high: float, low: float, hlc3: float) -> None:
+        self.raw_values.update(self._get_raw_value(close, high, low, hlc3))
+
+    def get_series(self, data_length: int) -> npt.NDArray[numpy.float64]:
+        # same output as utils.series_from on the last data_length candles,
+        # normalized features are rescaled on these candles like ml_extensions
+        raw_values: npt.NDArray[numpy.float64] = self.raw_values.get_values(
+            data_length
+        )
+        if self.normalize and len(raw_values):
+            return ml_extensions.normalize(raw_values)
+        return raw_values
+
+    def trim(self, keep_length: int) -> None:
+        self.raw_values.trim(keep_length)
+
+    @abc.abstractmethod
+    def _get_raw_value(
+        self, close: float, high: float, low: float, hlc3: float
+    ) -> typing.Optional[float]:
+        # the feature value before its normalization, None during the warm up
+        raise NotImplementedError("_get_raw_value is not implemented")
+
+
+class StreamingRSIFeature(StreamingFeature):
+    # ml_extensions.n_rsi
+    def __init__(self, f_paramA: int, f_paramB: int):
+        super().__init__(normalize=False)
+        self.rsi: StreamingRSI = StreamingRSI(f_paramA)
+        self.ema: StreamingEMA = StreamingEMA(f_paramB)
+
+    def _get_raw_value(
+        self, close: float, high: float, low: float, hlc3: float
+    ) -> typing.Optional[float]:
+        rsi: typing.Optional[float] = self.rsi.update(close)
+        if rsi is None:
+            return None
+        return self.ema.update(rsi) / 100
+
+
+class StreamingWTFeature(StreamingFeature):
+    # ml_extensions.n_wt
+    def __init__(self, f_paramA: int, f_paramB: int):
+        super().__init__(normalize=True)
+        self.ema1: StreamingEMA = StreamingEMA(f_paramA)
+        self.ema2: StreamingEMA = StreamingEMA(f_paramA)
+        self.wt1_ema: StreamingEMA = StreamingEMA(f_paramB)
+        self.wt2_sma: StreamingSMA = StreamingSMA(4)
+        self.is_first_candle: bool = True
+
+    def _get_raw_value(
+        self, close: float, high: float, low: float, hlc3: float
+    ) -> typing.Optional[float]:
+        ema1: float = self.ema1.update(hlc3)
+        ema2: float = self.ema2.update(abs(hlc3 - ema1))
+        if self.is_first_candle:
+            # the first ema2 value is 0, n_wt skips it
+            self.is_first_candle = False
+            return None
+        wt1: float = self.wt1_ema.update(_divide(hlc3 - ema1, 0.015 * ema2))
+        wt2: typing.Optional[float] = self.wt2_sma.update(wt1)
+        if wt2 is None:
+            return None
+        return wt1 - wt2
+
+
+class StreamingCCIFeature(StreamingFeature):
+    # ml_extensions.n_cci
+    def __init__(self, f_paramA: int, f_paramB: int):
+        super().__init__(normalize=True)
+        self.cci: StreamingCCI = StreamingCCI(f_paramA)
+        self.ema: StreamingEMA = StreamingEMA(f_paramB)
+
+    def _get_raw_value(
+        self, close: float, high: float, low: float, hlc3: float
+    ) -> typing.Optional[float]:
+        # use closes, closes, closes to get same cci as on tradingview
+        cci: typing.Optional[float] = self.cci.update(close, close, close)
+        if cci is None:
+            return None
+        return self.ema.update(cci)
+
+
+class StreamingADXFeature(StreamingFeature):
+    # ml_extensions.n_adx
+    def __init__(self, f_paramA: int):
+        super().__init__(normalize=False)
+        self.adx: StreamingADX = StreamingADX(f_paramA)
+
+    def _get_raw_value(
+        self, close: float, high: float, low: float, hlc3: float
+    ) -> typing.Optional[float]:
+        adx: typing.Optional[float] = self.adx.update(high, low, close)
+        if adx is None:
+            return None
+        return adx / 100
+
+
+class StreamingADX:
+    # same as the adx of ml_extensions.n_adx
+    def __init__(self, length: int):
+        self.length: int = length
+        self.rma: StreamingRMA = StreamingRMA(length)
+        self.previous_candle: typing.Optional[typing.Tuple[float, float, float]] = None
+        self.candles_count: int = 0
+        self.tr_smooth: float = 0
+        self.smooth_directional_movement_plus: float = 0
+        self.smooth_neg_movement: float = 0
+
+    def update(self, high: float, low: float, close: float) -> typing.Optional[float]:
+        previous_candle = self.previous_candle
+        self.previous_candle = (close, high, low)
+        index: int = self.candles_count
+        self.candles_count += 1
+        if previous_candle is None:
+            return None
+        previous_close, previous_high, previous_low = previous_candle
+        tr: float = max(
+            max(high - low, abs(high - previous_close)),
+            abs(low - previous_close),
+        )
+        directional_movement_plus: float = (
+            max(high - previous_high, 0)
+            if high - previous_high > previous_low - low
+            else 0
+        )
+        neg_movement: float = (
+            max(previous_low - low, 0)
+            if previous_low - low > high - previous_high
+            else 0
+        )
+        self.tr_smooth = self.tr_smooth - self.tr_smooth / self.length + tr
+        self.smooth_directional_movement_plus = (
+            self.smooth_directional_movement_plus
+            - self.smooth_directional_movement_plus / self.length
+            + directional_movement_plus
+        )
+        self.smooth_neg_movement = (
+            self.smooth_neg_movement
+            - self.smooth_neg_movement / self.length
+            + neg_movement
+        )
+        if index <= 3:
+            # skip early candles as its division by 0
+            return None
+        di_positive: float = (
+            _divide(self.smooth_directional_movement_plus, self.tr_smooth) * 100
+        )
+        di_negative: float = _divide(self.smooth_neg_movement, self.tr_smooth) * 100
+        return self.rma.update(
+            _divide(abs(di_positive - di_negative), di_positive + di_negative) * 100
+        )
+
+
+class StreamingATR:
+    # same as tulipy.atr: first value after length candles
+    def __init__(self, length: int):
+        self.length: int = length
+        self.per: float = 1 / length
+        self.previous_close: typing.Optional[float] = None
+        self.candles_count: int = 0
+        self.sum: float = 0
+        self.value: typing.Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> typing.Optional[float]:
+        previous_close = self.previous_close
+        self.previous_close = close
+        self.candles_count += 1
+        true_range: float = high - low
+        if previous_close is not None:
+            true_range = max(
+                true_range, abs(high - previous_close), abs(low - previous_close)
+            )
+        if self.value is not None:
+            self.value = (true_range - self.value) * self.per + self.value
+            return self.value
+        self.sum += true_range
+        if self.candles_count == self.length:
+            self.value = self.sum / self.length
+        return self.value
+
+
+# Streaming filters: they emit the newest candle values, None during the warm up.
+
+
+class StreamingRegimeFilter:
+    # ml_extensions.regime_filter
+    EMA_LENGTH: int = 200
+
+    def __init__(self, threshold: float, use_regime_filter: bool):
+        self.threshold: float = threshold
+        self.use_regime_filter: bool = use_regime_filter
+        self.previous_ohlc4: typing.Optional[float] = None
+        self.value_1: float = 0.0
+        self.value_2: float = 0.0
+        self.klmf: float = 0.0
+        self.abs_curve_slope_ema: StreamingEMA = StreamingEMA(self.EMA_LENGTH)
+
+    def update(self, ohlc4: float, high: float, low: float) -> typing.Optional[bool]:
+        if not self.use_regime_filter:
+            return True
+        previous_ohlc4 = self.previous_ohlc4
+        self.previous_ohlc4 = ohlc4
+        if previous_ohlc4 is None:
+            return None
+        self.value_1 = 0.2 * (ohlc4 - previous_ohlc4) + 0.8 * self.value_1
+        self.value_2 = 0.1 * (high - low) + 0.8 * self.value_2
+        omega: float = abs(_divide(self.value_1, self.value_2))
+        alpha: float = (
+            -pow(omega, 2) + math.sqrt(pow(omega, 4) + 16 * pow(omega, 2))
+        ) / 8
+        previous_klmf: float = self.klmf
+        self.klmf = alpha * ohlc4 + (1 - alpha) * previous_klmf
+        abs_curve_slope: float = abs(self.klmf - previous_klmf)
+        exponential_average_abs_curve_slope: float = self.abs_curve_slope_ema.update(
+            abs_curve_slope
+        )
+        return (
+            _divide(
+                abs_curve_slope - exponential_average_abs_curve_slope,
+                exponential_average_abs_curve_slope,
+            )
+            >= self.threshold
+        )
+
+
+class StreamingVolatilityFilter:
+    # ml_extensions.filter_volatility
+    def __init__(
+        self,
+        min_length: int = 1,
+        max_length: int = 10,
+        use_volatility_filter: bool = True,
+    ):
+        self.use_volatility_filter: bool = use_volatility_filter
+        self.recent_atr: StreamingATR = StreamingATR(min_length)
+        self.historical_atr: StreamingATR = StreamingATR(max_length)
+
+    def update(self, high: float, low: float, close: float) -> typing.Optional[bool]:
+        if not self.use_volatility_filter:
+            return True
+        recent_atr: typing.Optional[float] = self.recent_atr.update(high, low, close)
+        historical_atr: typing.Optional[float] = self.historical_atr.update(
+            high, low, close
+        )
+        if recent_atr is None or historical_atr is None:
+            return None
+        return recent_atr > historical_atr
+
+
+class StreamingTrendFilter:
+    # ema and sma filters of the lorentzian classification
+    def __init__(
+        self,
+        use_ema_filter: bool,
+        ema_period: int,
+        use_sma_filter: bool,
+        sma_period: int,
+    ):
+        self.ema: typing.Optional[StreamingEMA] = (
+            StreamingEMA(ema_period) if use_ema_filter else None
+        )
+        self.sma: typing.Optional[StreamingSMA] = (
+            StreamingSMA(sma_period) if use_sma_filter else None
+        )
+
+    def update(
+        self, close: float
+    ) -> typing.Tuple[
+        typing.Optional[bool],
+        typing.Optional[bool],
+        typing.Optional[bool],
+        typing.Optional[bool],
+    ]:
+        # returns is_ema_uptrend, is_ema_downtrend, is_sma_uptrend, is_sma_downtrend
+        is_ema_uptrend = is_ema_downtrend = is_sma_uptrend = is_sma_downtrend = True
+        if self.ema is not None:
+            ema: float = self.ema.update(close)
+            is_ema_uptrend, is_ema_downtrend = close > ema, close < ema
+        if self.sma is not None:
+            sma: typing.Optional[float] = self.sma.update(close)
+            if sma is None:
+                is_sma_uptrend = is_sma_downtrend = None
+            else:
+                is_sma_uptrend, is_sma_downtrend = close > sma, close < sma
+        return is_ema_uptrend, is_ema_downtrend, is_sma_uptrend, is_sma_downtrend
+
+
+class StreamingFilters:
+    # streamed series of utils.Filter, ml_extensions.filter_adx uses the last
+    # candles of the history for every candle, so it can't be streamed
+    SERIES_NAMES: typing.Tuple[str, ...] = (
+        "volatility",
+        "regime",
+        "is_ema_uptrend",
+        "is_ema_downtrend",
+        "is_sma_uptrend",
+        "is_sma_downtrend",
+    )
+
+    def __init__(self, filter_settings):
+        self.volatility_filter: StreamingVolatilityFilter = StreamingVolatilityFilter(
+            min_length=1,
+            max_length=10,
+            use_volatility_filter=filter_settings.use_volatility_filter,
+        )
+        self.regime_filter: StreamingRegimeFilter = StreamingRegimeFilter(
+            threshold=filter_settings.regime_threshold,
+            use_regime_filter=filter_settings.use_regime_filter,
+        )
+        self.trend_filter: StreamingTrendFilter = StreamingTrendFilter(
+            use_ema_filter=filter_settings.use_ema_filter,
+            ema_period=filter_settings.ema_period,
+            use_sma_filter=filter_settings.use_sma_filter,
+            sma_period=filter_settings.sma_period,
+        )
+        self.series_by_names: typing.Dict[str, StreamedSeries] = {
+            name: StreamedSeries(numpy.bool_) for name in self.SERIES_NAMES
+        }
+
+    def update(self, close: float, high: float, low: float, ohlc4: float) -> None:
+        for name, value in zip(
+            self.SERIES_NAMES,
+            (
+                self.volatility_filter.update(high, low, close),
+                self.regime_filter.update(ohlc4, high, low),
+                *self.trend_filter.update(close),
+            ),
+        ):
+            self.series_by_names[name].update(value)
+
+    def get_series_by_names(
+        self, data_length: int
+    ) -> typing.Dict[str, npt.NDArray[numpy.bool_]]:
+        # same filters as on a full recomputation of data_length candles
+        return {
+            name: series.get_values(data_length)
+            for name, series in self.series_by_names.items()
+        }
+
+    def trim(self, keep_length: int) -> None:
+        for series in self.series_by_names.values():
+            series.trim(keep_length)
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    # divisions by 0 return inf / nan like tulipy and numpy instead of raising
+    if denominator:
+        return numerator / denominator
+    if numerator == 0 or math.isnan(numerator):
+        return math.nan
+    return math.copysign(math.inf, numerator) * math.copysign(1, denominator)
@@ -0,0 +1,238 @@
+import typing
+import weakref
+import numpy
+import numpy.typing as npt
+
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.ml_extensions_2.streaming_extensions as streaming_extensions
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.kernel_functions.streaming_kernel as streaming_kernel
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.utils as utils
+
+# Live pipeline of the streamed features, filters and kernel: each
+# classification only feeds the candles that are new since the previous one
+# to the indicators, instead of recomputing them on the whole history on
+# every candle.
+# The streamed series have the same length as the full recomputation of the
+# live history and the same values while the history grows. Recursive
+# indicators (ema, rma, ...) are seeded on the first candle they were fed with:
+# once the live history slides, the recomputation is seeded on a later candle
+# and the values differ by an amount that fades with each candle. Normalized
+# features are rescaled on the min / max of the live history, which the
+# recomputation takes from its warm up, so they can keep differing.
+# The kernel only uses the last bars, it is the same as the recomputation.
+
+# pipelines by classification key, for as long as their exchange manager exists
+_STREAMING_INDICATORS_BY_EXCHANGE_MANAGERS: weakref.WeakKeyDictionary = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class StreamingIndicators:
+    def __init__(
+        self,
+        feature_engineering_settings: utils.FeatureEngineeringSettings,
+        filter_settings: utils.FilterSettings,
+        kernel_settings: utils.KernelSettings,
+    ):
+        self.feature_engineering_settings: utils.FeatureEngineeringSettings = (
+            feature_engineering_settings
+        )
+        self.filter_settings: utils.FilterSettings = filter_settings
+        self.kernel_settings: utils.KernelSettings = kernel_settings
+        self.features: typing.List[streaming_extensions.StreamingFeature] = []
+        self.filters: typing.Optional[streaming_extensions.StreamingFilters] = None
+        self.kernel: typing.Optional[streaming_kernel.StreamingKernel] = None
+        self.first_candle_time: typing.Optional[float] = None
+        self.last_candle_time: typing.Optional[float] = None
+        self.last_candle_close: typing.Optional[float] = None
+        # candles kept by the streamed series
+        self.kept_candles_count: int = 0
+        self.rebuilds_count: int = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self.features = [
+            utils.streaming_series_from(
+                feature_settings.indicator_name,
+                feature_settings.param_a,
+                feature_settings.param_b,
+            )
+            for feature_settings in self.feature_engineering_settings.features_settings
+        ]
+        self.filters = streaming_extensions.StreamingFilters(self.filter_settings)
+        self.kernel = streaming_kernel.StreamingKernel(self.kernel_settings)
+        self.first_candle_time = None
+        self.last_candle_time = None
+        self.last_candle_close = None
+        self.kept_candles_count = 0
+
+    def update(
+        self,
+        candle_closes: npt.NDArray[numpy.float64],
+        candle_highs: npt.NDArray[numpy.float64],
+        candle_lows: npt.NDArray[numpy.float64],
+        candles_hlc3: npt.NDArray[numpy.float64],
+        candles_ohlc4: npt.NDArray[numpy.float64],
+        user_selected_candles: npt.NDArray[numpy.float64],
+        candle_times: npt.NDArray[numpy.float64],
+    ) -> None:
+        # feeds the candles of this live history that weren't fed yet
+        data_length: int = len(candle_times)
+        if not data_length:
+            return
+        start_index: typing.Optional[int] = self._get_new_candles_start_index(
+            candle_closes, candle_times
+        )
+        if start_index is None:
+            # the fed candles don't continue this history: start over from it
+            if self.last_candle_time is not None:
+                self.rebuilds_count += 1
+            self._reset()
+            self.first_candle_time = float(candle_times[0])
+            start_index = 0
+        for close, high, low, hlc3, ohlc4, user_selected in zip(
+            *(
+                numpy.asarray(candles[start_index:], dtype=numpy.float64).tolist()
+                for candles in (
+                    candle_closes,
+                    candle_highs,
+                    candle_lows,
+                    candles_hlc3,
+                    candles_ohlc4,
+                    user_selected_candles,
+                )
+            )
+        ):
+            self._update_candle(close, high, low, hlc3, ohlc4, user_selected)
+        self.kept_candles_count += data_length - start_index
+        self.last_candle_time = float(candle_times[-1])
+        self.last_candle_close = float(candle_closes[-1])
+        if self.kept_candles_count > 2 * data_length:
+            # older values aren't part of the live history anymore
+            self._trim(data_length)
+
+    def _update_candle(
+        self,
+        close: float,
+        high: float,
+        low: float,
+        hlc3: float,
+        ohlc4: float,
+        user_selected: float,
+    ) -> None:
+        for feature in self.features:
+            feature.update(close, high, low, hlc3)
+        self.filters.update(close, high, low, ohlc4)
+        self.kernel.update(user_selected)
+
+    def _trim(self, keep_length: int) -> None:
+        for feature in self.features:
+            feature.trim(keep_length)
+        self.filters.trim(keep_length)
+        self.kernel.trim(keep_length)
+        self.kept_candles_count = keep_length
+
+    def _get_new_candles_start_index(
+        self,
+        candle_closes: npt.NDArray[numpy.float64],
+        candle_times: npt.NDArray[numpy.float64],
+    ) -> typing.Optional[int]:
+        # None when the history doesn't contain the last fed candle as it was
+        # fed or starts before the first fed candle
+        if self.last_candle_time is None or candle_times[0] < self.first_candle_time:
+            return None
+        last_candle_index: int = int(
+            numpy.searchsorted(candle_times, self.last_candle_time)
+        )
+        if (
+            last_candle_index == len(candle_times)
+            or candle_times[last_candle_index] != self.last_candle_time
+            or candle_closes[last_candle_index] != self.last_candle_close
+        ):
+            return None
+        return last_candle_index + 1
+
+    def get_feature_arrays(self, data_length: int) -> utils.FeatureArrays:
+        # same feature arrays as on a full recomputation of data_length candles
+        feature_arrays: utils.FeatureArrays = utils.FeatureArrays()
+        for feature in self.features:
+            feature_arrays.add_feature_array(
+                feature_array=feature.get_series(data_length)
+            )
+        return feature_arrays
+
+    def get_filters(self, data_length: int) -> typing.Dict[str, npt.NDArray[numpy.bool_]]:
+        # utils.Filter arguments except adx, by names
+        return self.filters.get_series_by_names(data_length)
+
+    def get_kernel_data(self, data_length: int) -> tuple:
+        return self.kernel.get_kernel_data(data_length)
+
+
+def get_streaming_indicators(
+    exchange_manager,
+    key: tuple,
+    first_candle_time: float,
+    feature_engineering_settings: utils.FeatureEngineeringSettings,
+    filter_settings: utils.FilterSettings,
+    kernel_settings: utils.KernelSettings,
+) -> StreamingIndicators:
+    # key: (data source symbol, time frame, settings hash)
+    streaming_indicators_by_keys: typing.Dict[
+        tuple, StreamingIndicators
+    ] = _STREAMING_INDICATORS_BY_EXCHANGE_MANAGERS.setdefault(exchange_manager, {})
+    for other_key, streaming_indicators in list(streaming_indicators_by_keys.items()):
+        if (
+            other_key != key
+            and other_key[:2] == key[:2]
+            and streaming_indicators.last_candle_time is not None
+            and streaming_indicators.last_candle_time < first_candle_time
+        ):
+            # previous settings of this symbol: their candles left the history,
+            # they would be rebuilt anyway
+            streaming_indicators_by_keys.pop(other_key)
+    if key not in streaming_indicators_by_keys:
+        streaming_indicators_by_keys[key] = StreamingIndicators(
+            feature_engineering_settings, filter_settings, kernel_settings
+        )
+    return streaming_indicators_by_keys[key]
+
+
+def get_parity_report(
+    streamed_series_by_names: typing.Dict[str, npt.NDArray],
+    series_by_names: typing.Dict[str, npt.NDArray],
+    tolerance: float = 1e-9,
+) -> dict:
+    # compares streamed series with their full recomputation,
+    # mismatches are None when the amount of values doesn't match
+    mismatches_by_names: typing.Dict[str, typing.Optional[int]] = {}
+    max_difference: float = 0.0
+    for name, series in series_by_names.items():
+        series = numpy.asarray(series)
+        streamed_series = numpy.asarray(streamed_series_by_names[name])
+        if len(series) != len(streamed_series):
+            mismatches_by_names[name] = None
+            continue
+        if series.dtype == numpy.bool_:
+            mismatches_count: int = int(numpy.count_nonzero(series != streamed_series))
+        else:
+            differences = numpy.abs(series - streamed_series)
+            if len(differences) and not numpy.isnan(differences).all():
+                max_difference = max(max_difference, float(numpy.nanmax(differences)))
+            mismatches_count: int = int(
+                numpy.count_nonzero(
+                    ~numpy.isclose(
+                        streamed_series,
+                        series,
+                        rtol=tolerance,
+                        atol=tolerance,
+                        equal_nan=True,
+                    )
+                )
+            )
+        if mismatches_count:
+            mismatches_by_names[name] = mismatches_count
+    return {
+        "mismatches": mismatches_by_names,
+        "max_difference": max_difference,
+        "is_matching": not mismatches_by_names,
+    }
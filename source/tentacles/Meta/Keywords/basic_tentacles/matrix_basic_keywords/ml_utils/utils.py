@@ -5,7 +5,9 @@ import numpy.typing as npt
 
 import numpy
 import tulipy
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.classification_functions.downsampling as downsampling
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.ml_extensions_2.ml_extensions as ml_extensions
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.ml_extensions_2.streaming_extensions as streaming_extensions
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.tools.utilities as basic_utils
 
 
@@ -28,6 +30,24 @@ def series_from(
         return ml_extensions.n_adx(_high, _low, _close, f_paramA)
 
 
+def streaming_series_from(
+    feature_string: str,
+    f_paramA: int,
+    f_paramB: int,
+) -> streaming_extensions.StreamingFeature:
+    # incremental version of series_from:
+    # update it with each new candle and get the same series with get_series()
+    if feature_string == "RSI":
+        return streaming_extensions.StreamingRSIFeature(f_paramA, f_paramB)
+    if feature_string == "WT":
+        return streaming_extensions.StreamingWTFeature(f_paramA, f_paramB)
+    if feature_string == "CCI":
+        return streaming_extensions.StreamingCCIFeature(f_paramA, f_paramB)
+    if feature_string == "ADX":
+        return streaming_extensions.StreamingADXFeature(f_paramA)
+    raise ValueError(f"Unknown feature {feature_string}")
+
+
 class YTrainTypes(enum.Enum):
     IS_IN_PROFIT_AFTER_4_BARS = "is_in_profit_after_x_bars"
     IS_IN_PROFIT_AFTER_4_BARS_CLOSES = "is_in_profit_after_x_bars_based_on_closes"
@@ -75,6 +95,15 @@ class ClassificationSettings:
         training_data_settings: YTrainSettings,
         down_sampler: typing.Callable[[int, int], bool],
         only_train_on_every_x_bars: typing.Optional[int] = None,
+        classifier_mode: str = None,
+        compare_classifier_modes: bool = False,
+        exact_knn_backend: str = None,
+        feature_quantization_bits: typing.Optional[int] = None,
+        compare_feature_quantization: bool = False,
+        use_live_tail_window: bool = False,
+        compare_live_tail_window: bool = False,
+        use_streaming_indicators: bool = False,
+        compare_streaming_indicators: bool = False,
     ):
         self.neighbors_count: int = neighbors_count
         self.required_neighbors: float = required_neighbors
@@ -88,6 +117,58 @@ class ClassificationSettings:
         ] = only_train_on_every_x_bars
         self.down_sampler: typing.Callable[[int, int], bool] = down_sampler
         self.training_data_settings: YTrainSettings = training_data_settings
+        self.classifier_mode: str = classifier_mode or ClassifierModes.DEFAULT_MODE
+        self.compare_classifier_modes: bool = compare_classifier_modes
+        self.exact_knn_backend: str = (
+            exact_knn_backend or ExactKnnBackends.DEFAULT_BACKEND
+        )
+        self.feature_quantization_bits: typing.Optional[
+            int
+        ] = feature_quantization_bits
+        self.compare_feature_quantization: bool = compare_feature_quantization
+        self.use_live_tail_window: bool = use_live_tail_window
+        self.compare_live_tail_window: bool = compare_live_tail_window
+        self.use_streaming_indicators: bool = use_streaming_indicators
+        self.compare_streaming_indicators: bool = compare_streaming_indicators
+
+
+class ClassifierModes:
+    APPROXIMATE_NEAREST_NEIGHBORS: str = (
+        "Approximate nearest neighbors (TradingView default)"
+    )
+    EXACT_NEAREST_NEIGHBORS: str = "Exact nearest neighbors"
+    DEFAULT_MODE: str = APPROXIMATE_NEAREST_NEIGHBORS
+    AVAILABLE_MODES: list = [
+        APPROXIMATE_NEAREST_NEIGHBORS,
+        EXACT_NEAREST_NEIGHBORS,
+    ]
+
+
+class ExactKnnBackends:
+    BRUTE_FORCE: str = "Vectorized brute force"
+    VANTAGE_POINT_TREE: str = "Vantage point tree (for very high max bars back)"
+    DEFAULT_BACKEND: str = BRUTE_FORCE
+    AVAILABLE_BACKENDS: list = [
+        BRUTE_FORCE,
+        VANTAGE_POINT_TREE,
+    ]
+
+
+class FeatureQuantizations:
+    DISABLED: str = "Disabled (float64)"
+    UINT16: str = "16 bit codes (uint16)"
+    UINT8: str = "8 bit codes (uint8)"
+    DEFAULT_QUANTIZATION: str = DISABLED
+    AVAILABLE_QUANTIZATIONS: list = [
+        DISABLED,
+        UINT16,
+        UINT8,
+    ]
+    BITS_BY_TITLES: typing.Dict[str, typing.Optional[int]] = {
+        DISABLED: None,
+        UINT16: 16,
+        UINT8: 8,
+    }
 
 
 class SignalDirection:
@@ -285,6 +366,20 @@ class FeatureSettings:
 
 
 class Filter:
+    # names of the filter series
+    SERIES_NAMES: typing.Tuple[str, ...] = (
+        "filter_all",
+        "is_uptrend",
+        "is_downtrend",
+        "volatility",
+        "regime",
+        "adx",
+        "is_ema_uptrend",
+        "is_sma_uptrend",
+        "is_ema_downtrend",
+        "is_sma_downtrend",
+    )
+
     def __init__(
         self,
         volatility: npt.NDArray[numpy.bool_],
@@ -295,6 +390,19 @@ class Filter:
         is_sma_uptrend: npt.NDArray[numpy.bool_],
         is_sma_downtrend: npt.NDArray[numpy.bool_],
     ):
+        filters_by_names: typing.Dict[str, npt.NDArray[numpy.bool_]] = {
+            "volatility": volatility,
+            "regime": regime,
+            "adx": adx,
+            "is_ema_uptrend": is_ema_uptrend,
+            "is_sma_uptrend": is_sma_uptrend,
+            "is_ema_downtrend": is_ema_downtrend,
+            "is_sma_downtrend": is_sma_downtrend,
+        }
+        aligned_series: basic_utils.AlignedSeries = basic_utils.AlignedSeries(
+            axis_length=max(len(series) for series in filters_by_names.values())
+        )
+        aligned_series.add_many(filters_by_names)
         (
             volatility,
             regime,
@@ -303,17 +411,7 @@ class Filter:
             is_sma_uptrend,
             is_ema_downtrend,
             is_sma_downtrend,
-        ) = basic_utils.cut_data_to_same_len(
-            (
-                volatility,
-                regime,
-                adx,
-                is_ema_uptrend,
-                is_sma_uptrend,
-                is_ema_downtrend,
-                is_sma_downtrend,
-            )
-        )
+        ) = aligned_series.get_many(*filters_by_names)
         # User Defined Filters: Used for adjusting the frequency of the ML Model's predictions
         self.filter_all = numpy.logical_and(
             volatility,
@@ -333,6 +431,95 @@ class Filter:
         self.is_sma_downtrend = is_sma_downtrend
 
 
+# bars before the first training label: the "in profit after 4 bars" labels
+LABELS_WARM_UP_LENGTH: int = 4
+# periods after which the seed of a recursive indicator fades below ~1e-4:
+# ema alpha is 2 / (length + 1), rma (wilder) alpha is 1 / length
+EMA_SETTLE_PERIODS: int = 5
+RMA_SETTLE_PERIODS: int = 10
+# lengths ml_extensions uses for the regime and adx filters
+REGIME_FILTER_EMA_LENGTH: int = 200
+ADX_FILTER_LENGTH: int = 14
+# calculate_rma skips its first sma values
+RMA_SMA_SKIPPED_VALUES: int = 50
+
+
+def get_live_tail_length(
+    classification_settings: ClassificationSettings,
+    kernel_settings: KernelSettings,
+    classified_bars_count: int,
+) -> int:
+    # bars required to compute the kernel and the training labels of the
+    # classified bars and their training data. Features and filters
+    # additionally need get_indicators_warm_up_length bars before the tail.
+    return (
+        # the kernel rates of change start 2 bars after the first estimate
+        max(kernel_settings.regression_level + 3, LABELS_WARM_UP_LENGTH)
+        # each classified bar is trained on up to max_bars_back - 1 previous bars
+        + classification_settings.max_bars_back
+        - 1
+        + classified_bars_count
+        # room to align the down sampled training bars with the whole history
+        + downsampling.get_down_sampling_period(
+            classification_settings.down_sampler,
+            classification_settings.only_train_on_every_x_bars,
+        )
+    )
+
+
+def get_indicators_warm_up_length(
+    feature_engineering_settings: FeatureEngineeringSettings,
+    filter_settings: FilterSettings,
+) -> int:
+    # bars before the first used value of the features and filters until their
+    # recursive averages settled, normalized features keep a small drift
+    # as they are rescaled on the min / max of the sliced history
+    warm_up_lengths: typing.List[int] = [
+        # rma(dx) of the adx filter on top of its smoothed directional movement
+        RMA_SMA_SKIPPED_VALUES
+        + ADX_FILTER_LENGTH
+        + 3
+        + 2 * RMA_SETTLE_PERIODS * ADX_FILTER_LENGTH
+        if filter_settings.use_adx_filter
+        else 0,
+        # atr 10
+        RMA_SETTLE_PERIODS * 10 if filter_settings.use_volatility_filter else 0,
+        # ema 200 of the kalman filter slope
+        1 + EMA_SETTLE_PERIODS * REGIME_FILTER_EMA_LENGTH
+        if filter_settings.use_regime_filter
+        else 0,
+        EMA_SETTLE_PERIODS * filter_settings.ema_period
+        if filter_settings.use_ema_filter
+        else 0,
+        filter_settings.sma_period if filter_settings.use_sma_filter else 0,
+    ]
+    for feature_settings in feature_engineering_settings.features_settings:
+        param_a: int = feature_settings.param_a
+        param_b: int = feature_settings.param_b
+        if feature_settings.indicator_name == "RSI":
+            # ema(b) of the wilder rsi(a)
+            warm_up_lengths.append(
+                param_a
+                + 1
+                + RMA_SETTLE_PERIODS * param_a
+                + EMA_SETTLE_PERIODS * param_b
+            )
+        elif feature_settings.indicator_name == "WT":
+            # ema(b) of the channel index of two ema(a), then a sma 4
+            warm_up_lengths.append(
+                1 + 2 * EMA_SETTLE_PERIODS * param_a + EMA_SETTLE_PERIODS * param_b + 4
+            )
+        elif feature_settings.indicator_name == "CCI":
+            # ema(b) of cci(a)
+            warm_up_lengths.append(2 * param_a - 1 + EMA_SETTLE_PERIODS * param_b)
+        elif feature_settings.indicator_name == "ADX":
+            # rma(a) of dx on top of the smoothed directional movement
+            warm_up_lengths.append(
+                RMA_SMA_SKIPPED_VALUES + param_a + 3 + 2 * RMA_SETTLE_PERIODS * param_a
+            )
+    return max(warm_up_lengths)
+
+
 def get_is_crossing_data(
     data1: npt.NDArray[numpy.float64], data2: npt.NDArray[numpy.float64]
 ) -> typing.Tuple[npt.NDArray[numpy.bool_], npt.NDArray[numpy.bool_]]:
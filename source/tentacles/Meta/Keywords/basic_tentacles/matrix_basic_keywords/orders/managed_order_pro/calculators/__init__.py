@@ -19,6 +19,7 @@
 # please contact me at max@a42.ch
 
 from .position_sizing import *
+from .open_risk import *
 from .stop_loss import *
 from .take_profit import *
 from .stop_losses import *
@@ -0,0 +1,205 @@
+# a42.ch CONFIDENTIAL
+# __________________
+#
+#  [2021] - [∞] a42.ch Incorporated
+#  All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of a42.ch Incorporated and its suppliers,
+# if any.  The intellectual and technical concepts contained
+# herein are proprietary to a42.ch Incorporated
+# and its suppliers and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from a42.ch Incorporated.
+#
+# If you want to use any code for commercial purposes,
+# or you want your own custom solution,
+# please contact me at max@a42.ch
+
+
+import decimal
+import typing
+import weakref
+
+import octobot_trading.enums as trading_enums
+import octobot_trading.exchange_channel as exchanges_channel
+import octobot_trading.personal_data as trading_personal_data
+
+# The open risk of all stop losses is
+#   sum(fee * quantity + quantity * (average_entry - stop_price) / stop_price)
+# for sell stops (and inverted for buy stops), which only depends on
+# sum(quantity) and sum(quantity / stop_price) by side.
+# The ledger keeps those sums up to date from the orders channel,
+# so sizing doesn't walk every open order on each entry. Managed orders
+# also update it right after creating or editing their stop losses, as the
+# channel is only consumed after the next sizing of the same tick.
+
+# one ledger by exchange
+_OPEN_RISK_LEDGERS_BY_EXCHANGE_MANAGERS: weakref.WeakKeyDictionary = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class StopLossRiskSums:
+    def __init__(self):
+        self.quantity: decimal.Decimal = decimal.Decimal("0")
+        self.quantity_by_price: decimal.Decimal = decimal.Decimal("0")
+
+    def add(
+        self, quantity: decimal.Decimal, quantity_by_price: decimal.Decimal
+    ) -> None:
+        self.quantity += quantity
+        self.quantity_by_price += quantity_by_price
+
+
+class OpenRiskLedger:
+    def __init__(self, exchange_manager):
+        self.orders_manager = exchange_manager.exchange_personal_data.orders_manager
+        # (symbol, is_sell, quantity, quantity / stop price) by order id
+        self.stop_losses_by_order_ids: typing.Dict[
+            str, typing.Tuple[str, bool, decimal.Decimal, decimal.Decimal]
+        ] = {}
+        # sell and buy stop losses sums of all symbols
+        self.sell_stop_losses: StopLossRiskSums = StopLossRiskSums()
+        self.buy_stop_losses: StopLossRiskSums = StopLossRiskSums()
+        self.sell_stop_losses_by_symbols: typing.Dict[str, StopLossRiskSums] = {}
+        self.buy_stop_losses_by_symbols: typing.Dict[str, StopLossRiskSums] = {}
+        for order in list(self.orders_manager.orders.values()):
+            self.update_order(order)
+
+    def get_open_risk(
+        self,
+        market_fee: decimal.Decimal,
+        average_long_entry: decimal.Decimal,
+        average_short_entry: decimal.Decimal,
+        symbol: typing.Optional[str] = None,
+    ) -> decimal.Decimal:
+        # account wide open risk when symbol is None
+        if symbol is None:
+            sell_stop_losses = self.sell_stop_losses
+            buy_stop_losses = self.buy_stop_losses
+        else:
+            sell_stop_losses = self.sell_stop_losses_by_symbols.get(
+                symbol, StopLossRiskSums()
+            )
+            buy_stop_losses = self.buy_stop_losses_by_symbols.get(
+                symbol, StopLossRiskSums()
+            )
+        if not (
+            sell_stop_losses.quantity_by_price or buy_stop_losses.quantity_by_price
+        ):
+            # no stop loss
+            return decimal.Decimal("0")
+        return (
+            (market_fee / 100) * (sell_stop_losses.quantity + buy_stop_losses.quantity)
+            + average_long_entry * sell_stop_losses.quantity_by_price
+            - sell_stop_losses.quantity
+            + buy_stop_losses.quantity
+            - average_short_entry * buy_stop_losses.quantity_by_price
+        )
+
+    def update_order(self, order) -> None:
+        # replaces the previous risk of this order, handles
+        # created, edited, filled and cancelled orders the same way
+        self._remove_order(order.order_id)
+        if (
+            order.order_type == trading_enums.TraderOrderType.STOP_LOSS
+            and order.is_open()
+        ):
+            self._add_order(
+                order.order_id,
+                order.symbol,
+                order.side
+                in (
+                    trading_enums.PositionSide.SHORT.value,
+                    trading_enums.TradeOrderSide.SELL.value,
+                ),
+                order.origin_quantity,
+                order.origin_quantity / order.origin_price,
+            )
+
+    async def order_callback(
+        self,
+        exchange: str,
+        exchange_id: str,
+        cryptocurrency: str,
+        symbol: str,
+        order: dict,
+        update_type: str,
+        is_from_bot: bool,
+    ):
+        self.sync_order(order[trading_enums.ExchangeConstantsOrderColumns.ID.value])
+
+    def sync_order(self, order_id: str) -> None:
+        # takes the current state of this order from the orders manager
+        try:
+            self.update_order(self.orders_manager.get_order(order_id))
+        except KeyError:
+            # not open anymore
+            self._remove_order(order_id)
+
+    def _add_order(
+        self,
+        order_id: str,
+        symbol: str,
+        is_sell: bool,
+        quantity: decimal.Decimal,
+        quantity_by_price: decimal.Decimal,
+    ) -> None:
+        self.stop_losses_by_order_ids[order_id] = (
+            symbol,
+            is_sell,
+            quantity,
+            quantity_by_price,
+        )
+        self._add_to_sums(symbol, is_sell, quantity, quantity_by_price)
+
+    def _remove_order(self, order_id: str) -> None:
+        if order_id in self.stop_losses_by_order_ids:
+            symbol, is_sell, quantity, quantity_by_price = (
+                self.stop_losses_by_order_ids.pop(order_id)
+            )
+            self._add_to_sums(symbol, is_sell, -quantity, -quantity_by_price)
+
+    def _add_to_sums(
+        self,
+        symbol: str,
+        is_sell: bool,
+        quantity: decimal.Decimal,
+        quantity_by_price: decimal.Decimal,
+    ) -> None:
+        if is_sell:
+            self.sell_stop_losses.add(quantity, quantity_by_price)
+            stop_losses_by_symbols = self.sell_stop_losses_by_symbols
+        else:
+            self.buy_stop_losses.add(quantity, quantity_by_price)
+            stop_losses_by_symbols = self.buy_stop_losses_by_symbols
+        if symbol not in stop_losses_by_symbols:
+            stop_losses_by_symbols[symbol] = StopLossRiskSums()
+        stop_losses_by_symbols[symbol].add(quantity, quantity_by_price)
+
+
+async def get_open_risk_ledger(exchange_manager) -> OpenRiskLedger:
+    # created from the open orders on first use and then kept up to date
+    if exchange_manager in _OPEN_RISK_LEDGERS_BY_EXCHANGE_MANAGERS:
+        return _OPEN_RISK_LEDGERS_BY_EXCHANGE_MANAGERS[exchange_manager]
+    ledger: OpenRiskLedger = OpenRiskLedger(exchange_manager)
+    _OPEN_RISK_LEDGERS_BY_EXCHANGE_MANAGERS[exchange_manager] = ledger
+    await exchanges_channel.get_chan(
+        trading_personal_data.OrdersChannel.get_name(), exchange_manager.id
+    ).new_consumer(ledger.order_callback)
+    return ledger
+
+
+async def update_open_risk_orders(exchange_manager, orders: list) -> None:
+    # created or edited orders and their opened chained stop losses,
+    # rejected orders are None or dicts
+    ledger: OpenRiskLedger = await get_open_risk_ledger(exchange_manager)
+    for order in orders:
+        if order is None or isinstance(order, dict):
+            continue
+        ledger.sync_order(order.order_id)
+        for chained_order in order.chained_orders:
+            ledger.sync_order(chained_order.order_id)
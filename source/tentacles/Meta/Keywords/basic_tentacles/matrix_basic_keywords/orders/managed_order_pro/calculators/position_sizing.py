@@ -27,6 +27,7 @@ from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.manage
 )
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong.ping_pong_storage.storage as storage
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.settings.position_size_settings as size_settings
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.open_risk as open_risk
 import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
 import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_private_data.open_positions as open_positions
 import octobot_trading.modes.script_keywords.basic_keywords.account_balance as account_balance
@@ -64,7 +65,7 @@ async def get_manged_order_position_size(
             position_size,
             max_position_size,
             current_open_risk,
-        ) = get_position_size_based_ref_market_quantity_risk(
+        ) = await get_position_size_based_ref_market_quantity_risk(
             maker.ctx,
             entry_order_type=entry_order_type,
             stop_loss_percent=stop_loss_percent,
@@ -218,37 +219,12 @@ async def get_current_open_risk(ctx, market_fee):
         ctx, side="short"
     )
 
-    current_open_orders = (
-        ctx.exchange_manager.exchange_personal_data.orders_manager.orders
+    ledger: open_risk.OpenRiskLedger = await open_risk.get_open_risk_ledger(
+        ctx.exchange_manager
+    )
+    return ledger.get_open_risk(
+        market_fee, current_average_long_entry, current_average_short_entry
     )
-    current_open_risk = 0
-    for order in current_open_orders:
-        if (
-            current_open_orders[order].order_type
-            == trading_enums.TraderOrderType.STOP_LOSS
-        ):
-            if current_open_orders[order].side in (
-                trading_enums.PositionSide.SHORT.value,
-                trading_enums.TradeOrderSide.SELL.value,
-            ):
-                stop_loss_distance = (
-                    current_average_long_entry - current_open_orders[order].origin_price
-                )
-            else:
-                stop_loss_distance = (
-                    current_open_orders[order].origin_price
-                    - current_average_short_entry
-                )
-
-            current_open_risk += (
-                ((market_fee) / 100) * current_open_orders[order].origin_quantity
-            ) + (
-                (current_open_orders[order].origin_quantity)
-                * stop_loss_distance
-                / current_open_orders[order].origin_price
-            )
-
-    return current_open_risk
 
 
 async def get_position_size_based_ref_market_quantity_risk(
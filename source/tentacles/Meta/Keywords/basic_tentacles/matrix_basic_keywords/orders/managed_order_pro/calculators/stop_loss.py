@@ -20,7 +20,10 @@
 
 import decimal as decimal
 import typing
+import numpy
+import numpy.typing as npt
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.stop_losses.stop_loss_types as stop_loss_types
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.stop_losses.stop_loss_utilities as stop_loss_utilities
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.settings.sl_settings as sl_settings
 import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
 
@@ -124,3 +127,83 @@ async def get_manged_order_stop_loss(
         )
         # no SL
     return None, None
+
+
+async def get_manged_order_stop_losses(
+    maker,
+    order_block,
+    stop_loss_settings,
+    trading_side,
+    entry_prices: npt.NDArray[numpy.float64],
+    current_price: float,
+) -> typing.Optional[npt.NDArray[numpy.float64]]:
+    # stop loss prices of many entries, like get_manged_order_stop_loss
+    # but candle based stop loss sources are only fetched once.
+    # Not adapted to the exchange precision yet
+    if (
+        stop_loss_settings.sl_type
+        == sl_settings.ManagedOrderSettingsSLTypes.NO_SL_DESCRIPTION
+    ):
+        return None
+    is_long: bool = trading_side == "buy"
+    # entries behind the current price get filled at the current price
+    filled_entry_prices: npt.NDArray[numpy.float64] = (
+        numpy.minimum(entry_prices, current_price)
+        if is_long
+        else numpy.maximum(entry_prices, current_price)
+    )
+    if (
+        stop_loss_settings.sl_type
+        == sl_settings.ManagedOrderSettingsSLTypes.AT_LOW_HIGH_DESCRIPTION
+    ):
+        return stop_loss_utilities.trim_sl_prices(
+            numpy.full(
+                len(filled_entry_prices),
+                float(
+                    await stop_loss_types.get_low_high_stop_loss_price(
+                        maker, stop_loss_settings, trading_side
+                    )
+                ),
+            ),
+            filled_entry_prices,
+            float(stop_loss_settings.sl_max_p),
+            float(stop_loss_settings.sl_min_p),
+            is_long,
+        )
+    if (
+        stop_loss_settings.sl_type
+        == sl_settings.ManagedOrderSettingsSLTypes.BASED_ON_ATR_DESCRIPTION
+    ):
+        atr: float = await stop_loss_types.get_atr(
+            maker, stop_loss_settings.atr_period
+        )
+        return stop_loss_utilities.trim_sl_prices(
+            filled_entry_prices - atr if is_long else filled_entry_prices + atr,
+            filled_entry_prices,
+            float(stop_loss_settings.sl_max_p),
+            float(stop_loss_settings.sl_min_p),
+            is_long,
+        )
+    if (
+        stop_loss_settings.sl_type
+        == sl_settings.ManagedOrderSettingsSLTypes.BASED_ON_PERCENT_ENTRY_DESCRIPTION
+    ):
+        sl_in_p: float = float(stop_loss_settings.sl_in_p_value)
+        return filled_entry_prices * (
+            1 - sl_in_p / 100 if is_long else 1 + sl_in_p / 100
+        )
+    # other types don't depend on candles, compute them one by one
+    stop_loss_prices: typing.List[float] = []
+    for entry_price in filled_entry_prices.tolist():
+        stop_loss_price, _ = await get_manged_order_stop_loss(
+            maker=maker,
+            order_block=order_block,
+            stop_loss_settings=stop_loss_settings,
+            trading_side=trading_side,
+            entry_price=decimal.Decimal(str(entry_price)),
+            current_price=decimal.Decimal(str(current_price)),
+        )
+        if stop_loss_price is None:
+            return None
+        stop_loss_prices.append(float(stop_loss_price))
+    return numpy.array(stop_loss_prices, dtype=numpy.float64)
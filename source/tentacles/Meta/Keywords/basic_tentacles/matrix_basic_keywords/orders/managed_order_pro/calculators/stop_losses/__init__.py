@@ -19,4 +19,5 @@
 # please contact me at max@a42.ch
 
 from .stop_loss_utilities import *
+from .stop_sources import *
 from .stop_loss_types import *
@@ -22,31 +22,42 @@ import decimal
 import tulipy as tulipy
 import octobot_trading.enums as trading_enums
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.stop_losses.stop_loss_utilities as stop_loss_utilities
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.stop_losses.stop_sources as stop_sources
 import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
 import tentacles.Meta.Keywords.scripting_library.settings.script_settings as script_settings
 
 
+async def get_atr(maker, atr_period: int) -> float:
+    # current atr of the context symbol and time frame
+    script_settings.set_minimum_candles(maker.ctx, atr_period)
+
+    async def _compute_atr() -> float:
+        return float(
+            tulipy.atr(
+                await exchange_public_data.High(maker.ctx),
+                await exchange_public_data.Low(maker.ctx),
+                await exchange_public_data.Close(maker.ctx),
+                int(atr_period),
+            )[-1]
+        )
+
+    return await stop_sources.get_stop_source(
+        maker.ctx, stop_sources.ATR_SOURCE_NAME, atr_period, _compute_atr
+    )
+
+
 async def get_stop_loss_based_on_atr(
     maker,
     stop_loss_settings,
     trading_side: str,
     entry_price: decimal.Decimal,
 ):
-    script_settings.set_minimum_candles(maker.ctx, stop_loss_settings.atr_period)
+    atr = decimal.Decimal(str(await get_atr(maker, stop_loss_settings.atr_period)))
     if trading_side in (
         trading_enums.PositionSide.LONG.value,
         trading_enums.TradeOrderSide.BUY.value,
     ):
-        sl_price = entry_price - decimal.Decimal(
-            str(
-                tulipy.atr(
-                    await exchange_public_data.High(maker.ctx),
-                    await exchange_public_data.Low(maker.ctx),
-                    await exchange_public_data.Close(maker.ctx),
-                    int(stop_loss_settings.atr_period),
-                )[-1]
-            )
-        )
+        sl_price = entry_price - atr
         sl_in_p, sl_price = stop_loss_utilities.trim_sl_long_price(
             sl_price,
             entry_price,
@@ -58,16 +69,7 @@ async def get_stop_loss_based_on_atr(
         trading_enums.PositionSide.SHORT.value,
         trading_enums.TradeOrderSide.SELL.value,
     ):
-        sl_price = entry_price + decimal.Decimal(
-            str(
-                tulipy.atr(
-                    await exchange_public_data.High(maker.ctx),
-                    await exchange_public_data.Low(maker.ctx),
-                    await exchange_public_data.Close(maker.ctx),
-                    int(stop_loss_settings.atr_period),
-                )[-1]
-            )
-        )
+        sl_price = entry_price + atr
         sl_in_p, sl_price = stop_loss_utilities.trim_sl_short_price(
             sl_price,
             entry_price,
@@ -23,50 +23,77 @@ import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_da
 import tentacles.Meta.Keywords.scripting_library.settings.script_settings as script_settings
 import octobot_trading.enums as trading_enums
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.stop_losses.stop_loss_utilities as stop_loss_utilities
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.stop_losses.stop_sources as stop_sources
 
 
-async def get_stop_loss_based_on_low_high(
-    maker,
-    stop_loss_settings,
-    trading_side: str,
-    entry_price: decimal.Decimal,
-):
-    script_settings.set_minimum_candles(
-        maker.ctx, stop_loss_settings.sl_low_high_lookback
-    )
+async def get_low_high_stop_loss_price(
+    maker, stop_loss_settings, trading_side: str
+) -> decimal.Decimal:
+    # lowest low or highest high of the look back with the buffer,
+    # doesn't depend on the entry price
+    lookback = int(stop_loss_settings.sl_low_high_lookback)
+    script_settings.set_minimum_candles(maker.ctx, lookback)
     if trading_side in (
         trading_enums.PositionSide.LONG.value,
         trading_enums.TradeOrderSide.BUY.value,
     ):
-        lows = await exchange_public_data.Low(
-            maker.ctx, limit=int(stop_loss_settings.sl_low_high_lookback)
+
+        async def _compute_lowest_low() -> float:
+            return float(min(await exchange_public_data.Low(maker.ctx, limit=lookback)))
+
+        lowest_low = await stop_sources.get_stop_source(
+            maker.ctx,
+            stop_sources.LOWEST_LOW_SOURCE_NAME,
+            lookback,
+            _compute_lowest_low,
         )
-        sl_price = (decimal.Decimal(min(lows))) * (
+        return (decimal.Decimal(lowest_low)) * (
             1 - (stop_loss_settings.sl_low_high_buffer / 100)
         )
-
-        return stop_loss_utilities.trim_sl_long_price(
-            sl_price,
-            entry_price,
-            stop_loss_settings.sl_max_p,
-            stop_loss_settings.sl_min_p,
-        )
-
     if trading_side in (
         trading_enums.PositionSide.SHORT.value,
         trading_enums.TradeOrderSide.SELL.value,
     ):
-        highs = await exchange_public_data.High(
-            maker.ctx, limit=int(stop_loss_settings.sl_low_high_lookback)
+
+        async def _compute_highest_high() -> float:
+            return float(
+                max(await exchange_public_data.High(maker.ctx, limit=lookback))
+            )
+
+        highest_high = await stop_sources.get_stop_source(
+            maker.ctx,
+            stop_sources.HIGHEST_HIGH_SOURCE_NAME,
+            lookback,
+            _compute_highest_high,
         )
-        sl_price = (decimal.Decimal(max(highs))) * (
+        return (decimal.Decimal(highest_high)) * (
             1 + (stop_loss_settings.sl_low_high_buffer / 100)
         )
+    raise RuntimeError('Side needs to be "long" or "short" for your managed order')
+
 
-        return stop_loss_utilities.trim_sl_short_price(
+async def get_stop_loss_based_on_low_high(
+    maker,
+    stop_loss_settings,
+    trading_side: str,
+    entry_price: decimal.Decimal,
+):
+    sl_price = await get_low_high_stop_loss_price(
+        maker, stop_loss_settings, trading_side
+    )
+    if trading_side in (
+        trading_enums.PositionSide.LONG.value,
+        trading_enums.TradeOrderSide.BUY.value,
+    ):
+        return stop_loss_utilities.trim_sl_long_price(
             sl_price,
             entry_price,
             stop_loss_settings.sl_max_p,
             stop_loss_settings.sl_min_p,
         )
-    raise RuntimeError('Side needs to be "long" or "short" for your managed order')
+    return stop_loss_utilities.trim_sl_short_price(
+        sl_price,
+        entry_price,
+        stop_loss_settings.sl_max_p,
+        stop_loss_settings.sl_min_p,
+    )
@@ -19,6 +19,9 @@
 # please contact me at max@a42.ch
 
 import decimal as decimal
+import numpy
+import numpy.typing as npt
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.open_risk as open_risk
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.stop_loss as stop_loss
 import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
 import tentacles.Meta.Keywords.scripting_library.orders.editing as editing
@@ -45,6 +48,30 @@ def trim_sl_short_price(sl_price, current_price, sl_max_p, sl_min_p):
     return sl_in_p, sl_price
 
 
+def trim_sl_prices(
+    sl_prices: npt.NDArray[numpy.float64],
+    entry_prices: npt.NDArray[numpy.float64],
+    sl_max_p: float,
+    sl_min_p: float,
+    is_long: bool,
+) -> npt.NDArray[numpy.float64]:
+    # same as trim_sl_long_price / trim_sl_short_price for all entries at once
+    sl_distances_in_p = (
+        (entry_prices - sl_prices) if is_long else (sl_prices - entry_prices)
+    ) / entry_prices * 100
+    trimmed_distances_in_p = numpy.clip(sl_distances_in_p, sl_min_p, sl_max_p)
+    return numpy.where(
+        trimmed_distances_in_p == sl_distances_in_p,
+        sl_prices,
+        entry_prices
+        * (
+            1 - trimmed_distances_in_p / 100
+            if is_long
+            else 1 + trimmed_distances_in_p / 100
+        ),
+    )
+
+
 async def adjust_managed_stop_loss(maker, managed_orders_settings, managed_order_data):
     # edit stop loss to accurate values in real trading
 
@@ -90,6 +117,9 @@ async def adjust_managed_stop_loss(maker, managed_orders_settings, managed_order
                     maker.ctx, order=init_stop_order, edited_stop_price=new_sl_price
                 )
                 managed_order_data.sl_in_d = float(new_sl_price)
+                await open_risk.update_open_risk_orders(
+                    maker.ctx.exchange_manager, [init_stop_order]
+                )
             except (
                 Exception
             ) as error:  # fails if we try to set an SL above the current price
@@ -99,6 +129,9 @@ async def adjust_managed_stop_loss(maker, managed_orders_settings, managed_order
                         maker.ctx, order=init_stop_order, edited_stop_price=new_sl_price
                     )
                     managed_order_data.sl_in_d = float(new_sl_price)
+                    await open_risk.update_open_risk_orders(
+                        maker.ctx.exchange_manager, [init_stop_order]
+                    )
                 except (
                     Exception
                 ) as error:  # catch all errors to continue placing take profits
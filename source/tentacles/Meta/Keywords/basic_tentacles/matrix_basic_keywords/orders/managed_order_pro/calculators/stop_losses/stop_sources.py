@@ -0,0 +1,69 @@
+# a42.ch CONFIDENTIAL
+# __________________
+#
+#  [2021] - [∞] a42.ch Incorporated
+#  All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of a42.ch Incorporated and its suppliers,
+# if any.  The intellectual and technical concepts contained
+# herein are proprietary to a42.ch Incorporated
+# and its suppliers and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from a42.ch Incorporated.
+#
+# If you want to use any code for commercial purposes,
+# or you want your own custom solution,
+# please contact me at max@a42.ch
+
+
+import typing
+import weakref
+
+import octobot_commons.enums as commons_enums
+
+# ATR and low/high stop losses only change once per candle but are requested
+# by every stop loss price: scaled order levels, trailing stop updates and
+# each managed order group. Their sources are computed once per closed candle
+# and shared by all of those until the next candle.
+
+ATR_SOURCE_NAME: str = "atr"
+LOWEST_LOW_SOURCE_NAME: str = "lowest_low"
+HIGHEST_HIGH_SOURCE_NAME: str = "highest_high"
+
+# (symbol, time frame, source name, period) -> (candle time, value) by exchange,
+# only the latest candle is kept
+_STOP_SOURCES_BY_EXCHANGE_MANAGERS: weakref.WeakKeyDictionary = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def get_stop_source(
+    ctx,
+    source_name: str,
+    period: int,
+    compute_source: typing.Callable[[], typing.Awaitable[float]],
+) -> float:
+    # source of the context symbol and time frame at the current candle
+    if (
+        ctx.trigger_source
+        == commons_enums.ActivationTopics.IN_CONSTRUCTION_CANDLES.value
+    ):
+        # the current candle is still moving
+        return await compute_source()
+    if ctx.exchange_manager not in _STOP_SOURCES_BY_EXCHANGE_MANAGERS:
+        _STOP_SOURCES_BY_EXCHANGE_MANAGERS[ctx.exchange_manager] = {}
+    stop_sources_by_keys: typing.Dict[
+        tuple, typing.Tuple[float, float]
+    ] = _STOP_SOURCES_BY_EXCHANGE_MANAGERS[ctx.exchange_manager]
+    key: tuple = (ctx.symbol, ctx.time_frame, source_name, int(period))
+    candle_time: float = ctx.trigger_cache_timestamp
+    if key in stop_sources_by_keys:
+        cached_candle_time, value = stop_sources_by_keys[key]
+        if cached_candle_time == candle_time:
+            return value
+    value: float = await compute_source()
+    stop_sources_by_keys[key] = (candle_time, value)
+    return value
@@ -39,6 +39,9 @@ class PingPongConstants:
     }
     PING_PONG_INFO_STORAGE = "ping_pong_info_storage"
     PING_PONG_STORAGE = "ping_pong_storage"
+    # older recreated entry orders are archived or dropped
+    MAX_RECREATED_ENTRY_ORDERS_COUNT = 20
+    ARCHIVE_RECREATED_ENTRY_ORDERS = True
 
     ENTRIES = "entries"
     EXITS = "exits"
@@ -24,27 +24,27 @@ import octobot_commons.logging.logging_util as logging_util
 from octobot_trading.personal_data.orders.order import Order
 from octobot_trading.personal_data.orders.orders_manager import OrdersManager
 from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords import matrix_enums
-from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums import (
-    PriceDataSources,
-)
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.tools.utilities as utilities
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong.ping_pong_constants as ping_pong_constants
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong.ping_pong_storage.order_data as order_data
 import tentacles.Meta.Keywords.scripting_library.orders.order_types.create_order as create_order
 
 
 class PingPongSingleData:
-    grid_id: str = None
-    calculated_entry: float = None
-    entry_counter: int = None
-    original_orders = None
-    all_recreated_entry_orders: list = None
-    last_order = None
-    is_first_entry: bool = None
-    ping_pong_active: bool = None
-    enabled: bool = None
-
-    order_group_id: str = None
-    group_key: str = None
+    __slots__ = (
+        "grid_id",
+        "calculated_entry",
+        "entry_counter",
+        "original_orders",
+        "all_recreated_entry_orders",
+        "last_order",
+        "is_first_entry",
+        "ping_pong_active",
+        "enabled",
+        "order_group_id",
+        "group_key",
+        "ping_pong_storage",
+    )
 
     def __init__(
         self,
@@ -56,91 +56,116 @@ class PingPongSingleData:
         entry_order=None,
         init_only: bool = False,
     ):
-        self.enabled = True
-        self.grid_id = grid_id
+        self.enabled: bool = True
+        self.grid_id: str = grid_id
         self.ping_pong_storage = ping_pong_storage
-        self.order_group_id = order_group_id
-        self.group_key = group_key
-        self.calculated_entry = float(str(calculated_entry))
-        self.all_recreated_entry_orders = []
+        self.order_group_id: str = order_group_id
+        self.group_key: str = group_key
+        self.calculated_entry: float = float(str(calculated_entry))
+        self.entry_counter: int = None
+        self.original_orders: order_data.PingPongOrdersData = None
+        # latest recreated entry orders only, see MAX_RECREATED_ENTRY_ORDERS_COUNT
+        self.all_recreated_entry_orders: typing.List[
+            order_data.PingPongOrdersData
+        ] = []
+        self.last_order: order_data.PingPongOrdersData = None
+        self.is_first_entry: bool = None
+        self.ping_pong_active: bool = None
         if not init_only:
             self.entry_counter = 1 if entry_order else 0
             self.is_first_entry = True
-            self.last_order = self.original_orders
             try:
                 self.ping_pong_active = bool(
                     entry_order.status != trading_enums.OrderStatus.REJECTED
                 )
                 if self.ping_pong_active:
-                    self.original_orders = self._format_entry_order(entry_order)
+                    self.original_orders = order_data.PingPongOrdersData.from_order(
+                        entry_order
+                    )
             except AttributeError:
-                t = 1
                 pass
+            self.last_order = self.original_orders
 
     def log_replaced_entry_order(
         self,
         recreated_entry_order,
     ) -> typing.List[str]:
         self.is_first_entry: bool = False
-        self.last_order = self._format_entry_order(recreated_entry_order)
+        self.last_order = order_data.PingPongOrdersData.from_order(
+            recreated_entry_order
+        )
         self.all_recreated_entry_orders.append(self.last_order)
+        archived_orders: typing.List[order_data.PingPongOrdersData] = []
+        if (
+            len(self.all_recreated_entry_orders)
+            > ping_pong_constants.PingPongConstants.MAX_RECREATED_ENTRY_ORDERS_COUNT
+        ):
+            archived_orders = self.all_recreated_entry_orders[
+                : -ping_pong_constants.PingPongConstants.MAX_RECREATED_ENTRY_ORDERS_COUNT
+            ]
+            self.all_recreated_entry_orders = self.all_recreated_entry_orders[
+                -ping_pong_constants.PingPongConstants.MAX_RECREATED_ENTRY_ORDERS_COUNT :
+            ]
         if not self.ping_pong_storage.exchange_manager.is_backtesting:
             try:
-                self.ping_pong_storage.store_ping_pong_storage()
+                if (
+                    archived_orders
+                    and ping_pong_constants.PingPongConstants.ARCHIVE_RECREATED_ENTRY_ORDERS
+                ):
+                    self.ping_pong_storage.archive_orders(self, archived_orders)
+                self.ping_pong_storage.journal_grids([self])
             except Exception as error:
                 logging_util.get_logger("PingPongStorage").exception(
                     error, True, "Failed to permanently store ping pong storage"
                 )
 
-    def _format_entry_order(self, entry_order):
-        if not entry_order:
-            return {ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER: {}}
-        if isinstance(entry_order, dict):
-            return {
-                ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER: entry_order
-            }
-        return {
-            ping_pong_constants.PingPongSingleDataColumns.EXIT_ORDERS: [
-                (exit_order if exit_order else {})
-                for exit_order in entry_order.chained_orders
-            ],
-            ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER: entry_order,
-        }
-
-    async def restore_from_raw(self, raw_grid):
-        orders_manager: OrdersManager = (
-            self.ping_pong_storage.exchange_manager.exchange_personal_data.orders_manager
+    async def restore_from_raw(self, raw_grid, open_orders_by_tags: dict = None):
+        if open_orders_by_tags is None:
+            open_orders_by_tags = get_open_orders_by_tags(
+                self.ping_pong_storage.exchange_manager.exchange_personal_data.orders_manager
+            )
+        self.last_order = order_data.PingPongOrdersData.from_dict(
+            raw_grid[ping_pong_constants.PingPongSingleDataColumns.LAST_ORDER]
         )
-        self.last_order = raw_grid[
-            ping_pong_constants.PingPongSingleDataColumns.LAST_ORDER
-        ]
         self.ping_pong_active = raw_grid[
             ping_pong_constants.PingPongSingleDataColumns.PING_PONG_ACTIVE
         ]
         self.entry_counter = raw_grid[
             ping_pong_constants.PingPongSingleDataColumns.ENTRY_COUNTER
         ]
-        self.original_orders = raw_grid[
+        raw_original_orders = raw_grid[
             ping_pong_constants.PingPongSingleDataColumns.ORIGINAL_ENTRY_ORDER
         ]
+        self.original_orders = (
+            order_data.PingPongOrdersData.from_dict(raw_original_orders)
+            if raw_original_orders
+            else None
+        )
         self.is_first_entry = raw_grid[
             ping_pong_constants.PingPongSingleDataColumns.IS_FIRST_ENTRY
         ]
-        self.all_recreated_entry_orders = raw_grid[
-            ping_pong_constants.PingPongSingleDataColumns.ALL_RECREATED_ENTRY_ORDERS
+        self.all_recreated_entry_orders = [
+            order_data.PingPongOrdersData.from_dict(raw_recreated_orders)
+            for raw_recreated_orders in raw_grid[
+                ping_pong_constants.PingPongSingleDataColumns.ALL_RECREATED_ENTRY_ORDERS
+            ][-ping_pong_constants.PingPongConstants.MAX_RECREATED_ENTRY_ORDERS_COUNT :]
         ]
+        if self.last_order.entry_order is None and self.original_orders:
+            # the entry was never replaced
+            self.last_order = self.original_orders
 
-        if self.ping_pong_active:
+        if self.ping_pong_active and self.last_order.entry_order:
             if (
-                self.last_order[
-                    ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER
-                ]["status"]
-                == PriceDataSources.OPEN.value
+                self.last_order.entry_order.status
+                == trading_enums.OrderStatus.OPEN.value
             ):
                 try:
-                    last_entry: Order = orders_manager.get_open_orders(
-                        symbol=self.last_order["entry_orders"]["symbol"],
-                        tag=self.last_order["entry_orders"]["tag"],
+                    last_entry: Order = open_orders_by_tags.get(
+                        (
+                            self.last_order.entry_order.symbol,
+                            self.last_order.entry_order.tag,
+                        ),
+                        [],
                     )[0]
                     take_profit_tag = None
                     take_profit_price = None
@@ -164,23 +189,22 @@ class PingPongSingleData:
                     #     stop_loss_tag=stop_loss_tag,
                     #     stop_loss_price=stop_loss_price,
                     # )
-                    self.last_order = self._format_entry_order(last_entry)
+                    self.last_order = order_data.PingPongOrdersData.from_order(
+                        last_entry
+                    )
                 except IndexError:
                     self.ping_pong_active = False
-                    self.last_order["entry_orders"]["status"] = "closed"
+                    self.last_order.entry_order.status = (
+                        trading_enums.OrderStatus.CLOSED.value
+                    )
             else:
-                try:
-                    last_exits = []
-                    for order in self.last_order["exit_orders"]:
-                        last_exits += orders_manager.get_open_orders(
-                            symbol=order["symbol"],
-                            tag=order["tag"],
-                        )
-                    self.last_order["exit_orders"] = last_exits
-                except IndexError:
-                    self.ping_pong_active = False
-                    for order in self.last_order["exit_orders"].values():
-                        order["status"] = "closed"
+                self.last_order.exit_orders = [
+                    order_data.PingPongOrderData.from_order(open_exit_order)
+                    for exit_order in self.last_order.exit_orders
+                    for open_exit_order in open_orders_by_tags.get(
+                        (exit_order.symbol, exit_order.tag), []
+                    )
+                ]
 
     async def recreate_chained_exits(
         self,
@@ -219,65 +243,30 @@ class PingPongSingleData:
     def get_to_replace_order_details(self):
         self.entry_counter += 1
         tag_suffix = f"{matrix_enums.TAG_SEPERATOR}{self.entry_counter}"
-        entry_order = self.original_orders[
-            ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER
-        ]
-        if isinstance(entry_order, dict):
-            data = {
-                ping_pong_constants.PingPongOrderColumns.SIDE.value: entry_order[
-                    "side"
-                ],
-                ping_pong_constants.PingPongOrderColumns.AMOUNT.value: entry_order[
-                    "amount"
-                ],
-                ping_pong_constants.PingPongOrderColumns.ENTRY_PRICE.value: self.calculated_entry,
-                ping_pong_constants.PingPongOrderColumns.ENTRY_TAG.value: (
-                    entry_order["tag"] + tag_suffix
-                ),
-            }
-        else:
-            data = {
-                ping_pong_constants.PingPongOrderColumns.SIDE.value: entry_order.side.value,
-                ping_pong_constants.PingPongOrderColumns.AMOUNT.value: entry_order.origin_quantity,
-                ping_pong_constants.PingPongOrderColumns.ENTRY_PRICE.value: self.calculated_entry,
-                ping_pong_constants.PingPongOrderColumns.ENTRY_TAG.value: (
-                    entry_order.tag + tag_suffix
-                ),
-            }
-        exit_orders = self.original_orders[
-            ping_pong_constants.PingPongSingleDataColumns.EXIT_ORDERS
-        ]
-        for order in exit_orders:
-            if isinstance(order, dict):
-                if is_take_profit(order["type"]):
-                    data[
-                        ping_pong_constants.PingPongOrderColumns.TAKE_PROFIT_PRICE.value
-                    ] = order["price"]
-                    data[
-                        ping_pong_constants.PingPongOrderColumns.TAKE_PROFIT_TAG.value
-                    ] = (order["tag"] + tag_suffix)
-                elif is_stop_loss(order["type"]):
-                    data[
-                        ping_pong_constants.PingPongOrderColumns.STOP_LOSS_PRICE.value
-                    ] = order["price"]
-                    data[
-                        ping_pong_constants.PingPongOrderColumns.STOP_LOSS_TAG.value
-                    ] = (order["tag"] + tag_suffix)
-            else:
-                if is_take_profit(order.order_type):
-                    data[
-                        ping_pong_constants.PingPongOrderColumns.TAKE_PROFIT_PRICE.value
-                    ] = order.origin_price
-                    data[
-                        ping_pong_constants.PingPongOrderColumns.TAKE_PROFIT_TAG.value
-                    ] = (order.tag + tag_suffix)
-                elif is_stop_loss(order.order_type):
-                    data[
-                        ping_pong_constants.PingPongOrderColumns.STOP_LOSS_PRICE.value
-                    ] = (order.origin_stop_price or order.origin_price)
-                    data[
-                        ping_pong_constants.PingPongOrderColumns.STOP_LOSS_TAG.value
-                    ] = (order.tag + tag_suffix)
+        entry_order = self.original_orders.entry_order
+        data = {
+            ping_pong_constants.PingPongOrderColumns.SIDE.value: entry_order.side,
+            ping_pong_constants.PingPongOrderColumns.AMOUNT.value: entry_order.amount,
+            ping_pong_constants.PingPongOrderColumns.ENTRY_PRICE.value: self.calculated_entry,
+            ping_pong_constants.PingPongOrderColumns.ENTRY_TAG.value: (
+                entry_order.tag + tag_suffix
+            ),
+        }
+        for order in self.original_orders.exit_orders:
+            if is_take_profit(order.order_type):
+                data[
+                    ping_pong_constants.PingPongOrderColumns.TAKE_PROFIT_PRICE.value
+                ] = order.price
+                data[ping_pong_constants.PingPongOrderColumns.TAKE_PROFIT_TAG.value] = (
+                    order.tag + tag_suffix
+                )
+            elif is_stop_loss(order.order_type):
+                data[
+                    ping_pong_constants.PingPongOrderColumns.STOP_LOSS_PRICE.value
+                ] = order.price
+                data[ping_pong_constants.PingPongOrderColumns.STOP_LOSS_TAG.value] = (
+                    order.tag + tag_suffix
+                )
         return data
 
     def get_last_entry_order(self):
@@ -291,14 +280,14 @@ class PingPongSingleData:
             ping_pong_constants.PingPongSingleDataColumns.GRID_ID: self.grid_id,
             ping_pong_constants.PingPongSingleDataColumns.CALCULATED_ENTRY: self.calculated_entry,
             ping_pong_constants.PingPongSingleDataColumns.ENTRY_COUNTER: self.entry_counter,
-            ping_pong_constants.PingPongSingleDataColumns.ORIGINAL_ENTRY_ORDER: convert_order_object_to_dict(
+            ping_pong_constants.PingPongSingleDataColumns.ORIGINAL_ENTRY_ORDER: orders_data_to_dict(
                 self.original_orders
             ),
             ping_pong_constants.PingPongSingleDataColumns.ALL_RECREATED_ENTRY_ORDERS: [
-                convert_order_object_to_dict(recreated_order)
-                for recreated_order in self.all_recreated_entry_orders
+                orders_data_to_dict(recreated_orders)
+                for recreated_orders in self.all_recreated_entry_orders
             ],
-            ping_pong_constants.PingPongSingleDataColumns.LAST_ORDER: convert_order_object_to_dict(
+            ping_pong_constants.PingPongSingleDataColumns.LAST_ORDER: orders_data_to_dict(
                 self.last_order
             ),
             ping_pong_constants.PingPongSingleDataColumns.IS_FIRST_ENTRY: self.is_first_entry,
@@ -306,33 +295,26 @@ class PingPongSingleData:
         }
 
 
-def convert_order_object_to_dict(orders_dict: dict):
-    if not orders_dict or not orders_dict.get("entry_orders"):
-        return {
-            ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER: {},
-            ping_pong_constants.PingPongSingleDataColumns.EXIT_ORDERS: {},
-        }
-    data = {}
-    if isinstance(orders_dict["entry_orders"], dict):
-        data[ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER] = orders_dict[
-            "entry_orders"
-        ]
-    else:
-        data[ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER] = order_to_dict(
-            orders_dict["entry_orders"]
-        )
-    data[ping_pong_constants.PingPongSingleDataColumns.EXIT_ORDERS] = []
+def orders_data_to_dict(
+    orders_data: typing.Optional[order_data.PingPongOrdersData],
+) -> dict:
+    if orders_data is None:
+        return order_data.PingPongOrdersData().to_dict()
+    return orders_data.to_dict()
 
-    for order in orders_dict.get("exit_orders", []):
-        if isinstance(order, dict):
-            data[ping_pong_constants.PingPongSingleDataColumns.EXIT_ORDERS].append(
-                order
-            )
-        else:
-            data[ping_pong_constants.PingPongSingleDataColumns.EXIT_ORDERS].append(
-                order_to_dict(order)
-            )
-    return data
+
+def get_open_orders_by_tags(
+    orders_manager: OrdersManager,
+) -> typing.Dict[typing.Tuple[str, str], typing.List[Order]]:
+    # open orders by (symbol, tag), built once instead of scanning
+    # the open orders for each restored order
+    open_orders_by_tags: typing.Dict[typing.Tuple[str, str], typing.List[Order]] = {}
+    for order in orders_manager.get_open_orders():
+        key = (order.symbol, order.tag)
+        if key not in open_orders_by_tags:
+            open_orders_by_tags[key] = []
+        open_orders_by_tags[key].append(order)
+    return open_orders_by_tags
 
 
 def is_stop_loss(order_type: str):
@@ -353,28 +335,3 @@ def is_take_profit(order_type: str):
         trading_enums.TradeOrderType.LIMIT.value,
         trading_enums.TradeOrderType.LIMIT,
     )
-
-
-def order_to_dict(order):
-    order_dict = order.to_dict()
-    fees = order_dict[trading_enums.ExchangeConstantsOrderColumns.FEE.value]
-    if fees:
-        fees[trading_enums.ExchangeConstantsOrderColumns.COST.value] = float(
-            str(fees.get(trading_enums.ExchangeConstantsOrderColumns.COST.value) or 0)
-        )
-    order_dict[trading_enums.ExchangeConstantsOrderColumns.PRICE.value] = float(
-        str(order_dict[trading_enums.ExchangeConstantsOrderColumns.PRICE.value])
-    )
-    order_dict[trading_enums.ExchangeConstantsOrderColumns.AMOUNT.value] = float(
-        str(order_dict[trading_enums.ExchangeConstantsOrderColumns.AMOUNT.value])
-    )
-    order_dict[trading_enums.ExchangeConstantsOrderColumns.COST.value] = float(
-        str(order_dict[trading_enums.ExchangeConstantsOrderColumns.COST.value])
-    )
-    order_dict[trading_enums.ExchangeConstantsOrderColumns.AMOUNT.value] = float(
-        str(order_dict[trading_enums.ExchangeConstantsOrderColumns.AMOUNT.value])
-    )
-    order_dict[trading_enums.ExchangeConstantsOrderColumns.FILLED.value] = float(
-        str(order_dict[trading_enums.ExchangeConstantsOrderColumns.FILLED.value])
-    )
-    return order_dict
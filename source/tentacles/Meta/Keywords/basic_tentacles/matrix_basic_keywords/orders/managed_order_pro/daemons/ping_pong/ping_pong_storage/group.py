@@ -18,6 +18,7 @@
 # or you want your own custom solution,
 # please contact me at max@a42.ch
 
+import asyncio
 import typing
 from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong import (
     ping_pong_constants,
@@ -26,7 +27,7 @@ import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.mana
 
 
 class PingPongGroupData:
-    group_data: typing.Dict[str, element.PingPongSingleData] = {}
+    __slots__ = ("ping_pong_info_storage", "group_data", "order_group_id", "group_key")
 
     def __init__(
         self,
@@ -38,6 +39,8 @@ class PingPongGroupData:
         init_only: bool = False,
     ):
         self.ping_pong_info_storage = ping_pong_info_storage
+        # by instance, the grid ids of each group start from 0
+        self.group_data: typing.Dict[str, element.PingPongSingleData] = {}
         self.order_group_id: str = order_group_id
         self.group_key: str = group_key
         if not init_only:
@@ -48,7 +51,10 @@ class PingPongGroupData:
                     calculated_entry=calculated_entries[grid_id],
                 )
 
-    async def restore_from_raw(self, raw_group_instance) -> None:
+    async def restore_from_raw(
+        self, raw_group_instance, open_orders_by_tags: dict = None
+    ) -> None:
+        restored_grids = []
         for grid_id, raw_grid in raw_group_instance.items():
             self.group_data[grid_id] = element.PingPongSingleData(
                 ping_pong_storage=self.ping_pong_info_storage,
@@ -60,7 +66,12 @@ class PingPongGroupData:
                 group_key=self.group_key,
                 init_only=True,
             )
-            await self.group_data[grid_id].restore_from_raw(raw_grid)
+            restored_grids.append(
+                self.group_data[grid_id].restore_from_raw(
+                    raw_grid, open_orders_by_tags
+                )
+            )
+        await asyncio.gather(*restored_grids)
 
     def set_grid_data(self, grid_id, order, calculated_entry) -> None:
         self.group_data[grid_id] = element.PingPongSingleData(
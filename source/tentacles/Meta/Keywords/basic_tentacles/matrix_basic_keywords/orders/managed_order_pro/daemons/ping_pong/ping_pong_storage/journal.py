@@ -0,0 +1,143 @@
+# a42.ch CONFIDENTIAL
+# __________________
+#
+#  [2021] - [∞] a42.ch Incorporated
+#  All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of a42.ch Incorporated and its suppliers,
+# if any.  The intellectual and technical concepts contained
+# herein are proprietary to a42.ch Incorporated
+# and its suppliers and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from a42.ch Incorporated.
+#
+# If you want to use any code for commercial purposes,
+# or you want your own custom solution,
+# please contact me at max@a42.ch
+
+
+import json
+import os
+import typing
+
+import octobot_commons.logging.logging_util as logging_util
+
+# The ping pong storage snapshot is the PingPongStorage tentacle config.
+# Rewriting it on each new order group or fill costs O(storage size), so
+# changed grids are appended to a json lines journal instead and the snapshot
+# is only rewritten when compacting. On restore the journal is replayed over
+# the snapshot, each entry holds the full grid state so replaying an entry
+# that is already in the snapshot changes nothing.
+# Each exchange of a profile has its own journal next to the profile snapshot,
+# only the owning storage replays and clears it.
+
+JOURNAL_FILE_NAME: str = "PingPongStorage_{exchange_name}.jsonl"
+# recreated entry orders dropped from the grids history
+ARCHIVE_FILE_NAME: str = "PingPongStorageArchive_{exchange_name}.jsonl"
+# the snapshot is rewritten and the journal cleared after this many entries
+COMPACT_AFTER_ENTRIES_COUNT: int = 1000
+
+
+class JournalEntryColumns:
+    GROUP_KEY = "group_key"
+    ORDER_GROUP_ID = "order_group_id"
+    GRID_ID = "grid_id"
+    GRID = "grid"
+    INFO = "info"
+    ARCHIVED_ORDERS = "archived_orders"
+
+
+class PingPongJournal:
+    def __init__(self, file_path: str):
+        self.file_path: str = file_path
+        self.entries_count: int = 0
+
+    def append(self, entries: typing.List[dict]) -> None:
+        # serialized before writing so a failing entry doesn't leave
+        # a partial line
+        lines: str = "".join(f"{json.dumps(entry)}\n" for entry in entries)
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        with open(self.file_path, "a", encoding="utf-8") as journal_file:
+            journal_file.write(lines)
+            journal_file.flush()
+        self.entries_count += len(entries)
+
+    def read(self) -> typing.List[dict]:
+        entries: typing.List[dict] = []
+        try:
+            with open(self.file_path, encoding="utf-8") as journal_file:
+                for line in journal_file:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # interrupted while writing the last entry
+                        logging_util.get_logger("PingPongStorage").warning(
+                            f"Skipped an incomplete ping pong journal entry: {line}"
+                        )
+        except FileNotFoundError:
+            pass
+        self.entries_count = len(entries)
+        return entries
+
+    def clear(self) -> None:
+        # called once the snapshot contains all the entries
+        if os.path.isfile(self.file_path):
+            os.remove(self.file_path)
+        self.entries_count = 0
+
+    def should_compact(self) -> bool:
+        return self.entries_count >= COMPACT_AFTER_ENTRIES_COUNT
+
+
+def get_journal_file_path(
+    tentacles_setup_config, file_name: str, exchange_name: str
+) -> str:
+    # in the profile tentacles config folder, like the snapshot
+    return os.path.join(
+        tentacles_setup_config.get_config_folder(),
+        file_name.format(exchange_name=exchange_name),
+    )
+
+
+def get_grid_entry(
+    group_key: str, order_group_id: str, grid_id: str, grid: dict, info: dict
+) -> dict:
+    return {
+        JournalEntryColumns.GROUP_KEY: group_key,
+        JournalEntryColumns.ORDER_GROUP_ID: order_group_id,
+        JournalEntryColumns.GRID_ID: grid_id,
+        JournalEntryColumns.GRID: grid,
+        JournalEntryColumns.INFO: info,
+    }
+
+
+def get_archive_entry(
+    group_key: str, order_group_id: str, grid_id: str, archived_orders: list
+) -> dict:
+    return {
+        JournalEntryColumns.GROUP_KEY: group_key,
+        JournalEntryColumns.ORDER_GROUP_ID: order_group_id,
+        JournalEntryColumns.GRID_ID: grid_id,
+        JournalEntryColumns.ARCHIVED_ORDERS: archived_orders,
+    }
+
+
+def replay_entries(
+    raw_ping_pong_storage: dict, info: dict, entries: typing.List[dict]
+) -> dict:
+    # applies the entries to the raw snapshot storage, returns the latest info
+    for entry in entries:
+        group_key: str = entry[JournalEntryColumns.GROUP_KEY]
+        order_group_id: str = entry[JournalEntryColumns.ORDER_GROUP_ID]
+        if group_key not in raw_ping_pong_storage:
+            raw_ping_pong_storage[group_key] = {}
+        if order_group_id not in raw_ping_pong_storage[group_key]:
+            raw_ping_pong_storage[group_key][order_group_id] = {}
+        raw_ping_pong_storage[group_key][order_group_id][
+            entry[JournalEntryColumns.GRID_ID]
+        ] = entry[JournalEntryColumns.GRID]
+        info = entry[JournalEntryColumns.INFO]
+    return info
@@ -0,0 +1,154 @@
+# a42.ch CONFIDENTIAL
+# __________________
+#
+#  [2021] - [∞] a42.ch Incorporated
+#  All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of a42.ch Incorporated and its suppliers,
+# if any.  The intellectual and technical concepts contained
+# herein are proprietary to a42.ch Incorporated
+# and its suppliers and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from a42.ch Incorporated.
+#
+# If you want to use any code for commercial purposes,
+# or you want your own custom solution,
+# please contact me at max@a42.ch
+
+
+import typing
+import octobot_trading.enums as trading_enums
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong.ping_pong_constants as ping_pong_constants
+
+# Grids only keep the order fields required to recreate and restore their
+# orders instead of full order dicts or order objects, the dicts keep the
+# order dict keys so previously stored grids can still be restored.
+
+
+class PingPongOrderData:
+    __slots__ = ("symbol", "side", "order_type", "amount", "price", "tag", "status")
+
+    def __init__(
+        self,
+        symbol: typing.Optional[str] = None,
+        side: typing.Optional[str] = None,
+        order_type: typing.Optional[str] = None,
+        amount: typing.Optional[float] = None,
+        price: typing.Optional[float] = None,
+        tag: typing.Optional[str] = None,
+        status: typing.Optional[str] = None,
+    ):
+        self.symbol: typing.Optional[str] = symbol
+        self.side: typing.Optional[str] = side
+        self.order_type: typing.Optional[str] = order_type
+        self.amount: typing.Optional[float] = amount
+        # stop price for stop orders
+        self.price: typing.Optional[float] = price
+        self.tag: typing.Optional[str] = tag
+        self.status: typing.Optional[str] = status
+
+    @classmethod
+    def from_order(cls, order) -> "PingPongOrderData":
+        return cls(
+            symbol=order.symbol,
+            side=order.side.value if order.side else None,
+            order_type=order.order_type.value if order.order_type else None,
+            amount=float(str(order.origin_quantity)),
+            price=float(str(order.origin_stop_price or order.origin_price)),
+            tag=order.tag,
+            status=order.status.value if order.status else None,
+        )
+
+    @classmethod
+    def from_dict(cls, raw_order: dict) -> "PingPongOrderData":
+        return cls(
+            symbol=raw_order.get(
+                trading_enums.ExchangeConstantsOrderColumns.SYMBOL.value
+            ),
+            side=raw_order.get(trading_enums.ExchangeConstantsOrderColumns.SIDE.value),
+            order_type=raw_order.get(
+                trading_enums.ExchangeConstantsOrderColumns.TYPE.value
+            ),
+            amount=raw_order.get(
+                trading_enums.ExchangeConstantsOrderColumns.AMOUNT.value
+            ),
+            price=raw_order.get(
+                trading_enums.ExchangeConstantsOrderColumns.PRICE.value
+            ),
+            tag=raw_order.get(trading_enums.ExchangeConstantsOrderColumns.TAG.value),
+            status=raw_order.get(
+                trading_enums.ExchangeConstantsOrderColumns.STATUS.value
+            ),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            trading_enums.ExchangeConstantsOrderColumns.SYMBOL.value: self.symbol,
+            trading_enums.ExchangeConstantsOrderColumns.SIDE.value: self.side,
+            trading_enums.ExchangeConstantsOrderColumns.TYPE.value: self.order_type,
+            trading_enums.ExchangeConstantsOrderColumns.AMOUNT.value: self.amount,
+            trading_enums.ExchangeConstantsOrderColumns.PRICE.value: self.price,
+            trading_enums.ExchangeConstantsOrderColumns.TAG.value: self.tag,
+            trading_enums.ExchangeConstantsOrderColumns.STATUS.value: self.status,
+        }
+
+
+class PingPongOrdersData:
+    # an entry order and its exit orders
+    __slots__ = ("entry_order", "exit_orders")
+
+    def __init__(
+        self,
+        entry_order: typing.Optional[PingPongOrderData] = None,
+        exit_orders: typing.Optional[typing.List[PingPongOrderData]] = None,
+    ):
+        self.entry_order: typing.Optional[PingPongOrderData] = entry_order
+        self.exit_orders: typing.List[PingPongOrderData] = exit_orders or []
+
+    @classmethod
+    def from_order(cls, entry_order) -> "PingPongOrdersData":
+        if not entry_order:
+            return cls()
+        if isinstance(entry_order, dict):
+            return cls(PingPongOrderData.from_dict(entry_order))
+        return cls(
+            PingPongOrderData.from_order(entry_order),
+            [
+                PingPongOrderData.from_order(exit_order)
+                for exit_order in entry_order.chained_orders
+                if exit_order
+            ],
+        )
+
+    @classmethod
+    def from_dict(cls, raw_orders: typing.Optional[dict]) -> "PingPongOrdersData":
+        # raw_orders: {ENTRY_ORDER: order dict, EXIT_ORDERS: [order dicts]}
+        if not raw_orders:
+            return cls()
+        raw_entry_order: typing.Optional[dict] = raw_orders.get(
+            ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER
+        )
+        return cls(
+            PingPongOrderData.from_dict(raw_entry_order) if raw_entry_order else None,
+            [
+                PingPongOrderData.from_dict(raw_exit_order)
+                for raw_exit_order in raw_orders.get(
+                    ping_pong_constants.PingPongSingleDataColumns.EXIT_ORDERS
+                )
+                or []
+                if raw_exit_order
+            ],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            ping_pong_constants.PingPongSingleDataColumns.ENTRY_ORDER: (
+                self.entry_order.to_dict() if self.entry_order else {}
+            ),
+            ping_pong_constants.PingPongSingleDataColumns.EXIT_ORDERS: [
+                exit_order.to_dict() for exit_order in self.exit_orders
+            ],
+        }
@@ -19,14 +19,19 @@
 # please contact me at max@a42.ch
 
 import asyncio
+import typing
+import octobot_commons.enums as commons_enums
 import octobot_services.interfaces.util as interfaces_util
+import octobot_trading.util as trading_util
 import octobot_tentacles_manager.api as tentacles_manager_api
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong.ping_pong_constants as ping_pong_constants
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong.ping_pong_storage.group as ping_pong_group
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong.ping_pong_storage.element as element
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.ping_pong.ping_pong_storage.journal as journal
 
 RETRY_GET_ENTRY_ORDER_ATTEMPTS_COUNT: int = 20
 RETRY_GET_ENTRY_ORDER_WAITING_TIME: int = 5
+ORDERS_INITIALIZATION_TIMEOUT: int = 1000
 
 
 def get_all_ping_pong_data_as_dict(exchange_manager) -> dict:
@@ -70,6 +75,26 @@ class PingPongStorage:
 
     def __init__(self, exchange_manager):
         self.exchange_manager = exchange_manager
+        # live only, backtesting storages are never restored
+        self.journal: typing.Optional[journal.PingPongJournal] = None
+        # recreated entry orders dropped from the grids history, append only
+        self.archive: typing.Optional[journal.PingPongJournal] = None
+        if not exchange_manager.is_backtesting:
+            tentacles_setup_config = interfaces_util.get_edited_tentacles_config()
+            self.journal = journal.PingPongJournal(
+                journal.get_journal_file_path(
+                    tentacles_setup_config,
+                    journal.JOURNAL_FILE_NAME,
+                    exchange_manager.exchange_name,
+                )
+            )
+            self.archive = journal.PingPongJournal(
+                journal.get_journal_file_path(
+                    tentacles_setup_config,
+                    journal.ARCHIVE_FILE_NAME,
+                    exchange_manager.exchange_name,
+                )
+            )
 
     def set_ping_pong_data(
         self,
@@ -95,7 +120,13 @@ class PingPongStorage:
             group_key=group_key_str,
         )
         if not self.exchange_manager.is_backtesting:
-            self.store_ping_pong_storage()
+            self.journal_grids(
+                list(
+                    self.ping_pong_storage[group_key_str][
+                        order_group_id
+                    ].group_data.values()
+                )
+            )
 
     # def log_replaced_entry_order(
     #     self,
@@ -199,28 +230,44 @@ class PingPongStorage:
         )
 
     async def restore_ping_pong_storage(self):
-        orders_manager = self.exchange_manager.exchange_personal_data.orders_manager
-        if not (
-            orders_manager.are_exchange_orders_initialized
-            and orders_manager.is_initialized
-        ):
-            await asyncio.sleep(5)
-            return await self.restore_ping_pong_storage()
+        try:
+            await trading_util.wait_for_topic_init(
+                self.exchange_manager,
+                ORDERS_INITIALIZATION_TIMEOUT,
+                commons_enums.InitializationEventExchangeTopics.ORDERS.value,
+            )
+        except asyncio.TimeoutError as error:
+            raise RuntimeError(
+                "Failed to restore ping pong storage, orders are not initialized "
+                f"after {ORDERS_INITIALIZATION_TIMEOUT} seconds"
+            ) from error
         storage_file_content = _restore_ping_pong_storage() or {}
-        self.ping_pong_info_storage = storage_file_content.get(
-            ping_pong_constants.PingPongConstants.PING_PONG_INFO_STORAGE,
-            ping_pong_constants.PingPongConstants.START_INFO_DATA,
-        )
-        await self._restore_from_raw(
+        raw_ping_pong_storage = (
             storage_file_content.get(
-                ping_pong_constants.PingPongConstants.PING_PONG_STORAGE, {}
+                ping_pong_constants.PingPongConstants.PING_PONG_STORAGE
             )
+            or {}
+        )
+        # changes since the last snapshot
+        self.ping_pong_info_storage = journal.replay_entries(
+            raw_ping_pong_storage,
+            storage_file_content.get(
+                ping_pong_constants.PingPongConstants.PING_PONG_INFO_STORAGE,
+                ping_pong_constants.PingPongConstants.START_INFO_DATA,
+            ),
+            self.journal.read(),
         )
+        await self._restore_from_raw(raw_ping_pong_storage)
         # store updated storage
         self.store_ping_pong_storage()
 
     async def _restore_from_raw(self, raw_ping_pong_storage):
         self.ping_pong_storage = {}
+        # open orders are looked up by tag for each grid
+        open_orders_by_tags = element.get_open_orders_by_tags(
+            self.exchange_manager.exchange_personal_data.orders_manager
+        )
+        restored_groups = []
         for group_key, group in raw_ping_pong_storage.items():
             if group_key not in self.ping_pong_storage:
                 self.ping_pong_storage[group_key] = {}
@@ -233,12 +280,51 @@ class PingPongStorage:
                         init_only=True,
                     )
                 )
-                await restored_group.restore_from_raw(raw_group_instance)
                 self.ping_pong_storage[group_key][order_group_id] = restored_group
+                restored_groups.append(
+                    restored_group.restore_from_raw(
+                        raw_group_instance, open_orders_by_tags
+                    )
+                )
+        await asyncio.gather(*restored_groups)
+
+    def journal_grids(self, grids: list) -> None:
+        # only stores the changed grids
+        self.journal.append(
+            [
+                journal.get_grid_entry(
+                    group_key=grid.group_key,
+                    order_group_id=grid.order_group_id,
+                    grid_id=grid.grid_id,
+                    grid=grid.to_dict(),
+                    info=self.ping_pong_info_storage,
+                )
+                for grid in grids
+            ]
+        )
+        if self.journal.should_compact():
+            self.store_ping_pong_storage()
+
+    def archive_orders(self, grid, archived_orders: list) -> None:
+        self.archive.append(
+            [
+                journal.get_archive_entry(
+                    group_key=grid.group_key,
+                    order_group_id=grid.order_group_id,
+                    grid_id=grid.grid_id,
+                    archived_orders=[
+                        archived_order.to_dict() for archived_order in archived_orders
+                    ],
+                )
+            ]
+        )
 
     def store_ping_pong_storage(self):
+        # full snapshot, the journal is included and can be cleared
         storage_dict = self.to_dict()
         self._store_ping_pong_storage(storage_dict)
+        if self.journal:
+            self.journal.clear()
 
     def _store_ping_pong_storage(self, ping_pong_storage_dict: dict = None):
         storage_file_content = {
@@ -18,5 +18,7 @@
 # or you want your own custom solution,
 # please contact me at max@a42.ch
 
+from .managed_stop_losses import *
+from .trailing_state import *
 from .trail_stop_losses import *
 from .trailing_types import *
@@ -0,0 +1,140 @@
+# a42.ch CONFIDENTIAL
+# __________________
+#
+#  [2021] - [∞] a42.ch Incorporated
+#  All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of a42.ch Incorporated and its suppliers,
+# if any.  The intellectual and technical concepts contained
+# herein are proprietary to a42.ch Incorporated
+# and its suppliers and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from a42.ch Incorporated.
+#
+# If you want to use any code for commercial purposes,
+# or you want your own custom solution,
+# please contact me at max@a42.ch
+
+
+import typing
+import weakref
+
+import octobot_trading.enums as trading_enums
+import octobot_trading.exchange_channel as exchanges_channel
+import octobot_trading.personal_data as trading_personal_data
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums as matrix_enums
+
+# Managed order tags are
+#   {order type}{TAG_SEPERATOR}{managed order group id}{TAG_SEPERATOR}{order tag id}
+# the index maps each group id to its open stop losses and is kept up to date
+# from the orders channel, so trailing doesn't scan every open order
+# and parse its tag on each candle.
+
+# one index by exchange
+_STOP_LOSS_INDEXES_BY_EXCHANGE_MANAGERS: weakref.WeakKeyDictionary = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_managed_order_group_id(order_tag: typing.Optional[str]) -> typing.Optional[str]:
+    if not order_tag:
+        return None
+    tag_parts: typing.List[str] = order_tag.split(matrix_enums.TAG_SEPERATOR)
+    if len(tag_parts) < 3:
+        # not a managed order
+        return None
+    return tag_parts[1]
+
+
+class ManagedStopLossIndex:
+    def __init__(self, exchange_manager):
+        self.orders_manager = exchange_manager.exchange_personal_data.orders_manager
+        # group id -> symbol -> stop loss orders by order id
+        self.stop_losses_by_group_ids: typing.Dict[
+            str, typing.Dict[str, typing.Dict[str, typing.Any]]
+        ] = {}
+        # (group id, symbol) by order id
+        self.group_keys_by_order_ids: typing.Dict[str, typing.Tuple[str, str]] = {}
+        for order in list(self.orders_manager.orders.values()):
+            self.update_order(order)
+
+    def get_stop_losses(
+        self, group_id, symbol: typing.Optional[str] = None
+    ) -> typing.List[typing.Any]:
+        # open stop losses of the group, of all symbols when symbol is None
+        return [
+            order
+            for orders in self.get_stop_losses_by_symbols(group_id, symbol).values()
+            for order in orders
+        ]
+
+    def get_stop_losses_by_symbols(
+        self, group_id, symbol: typing.Optional[str] = None
+    ) -> typing.Dict[str, typing.List[typing.Any]]:
+        stop_losses_by_symbols = self.stop_losses_by_group_ids.get(str(group_id), {})
+        return {
+            stop_losses_symbol: [
+                order for order in orders_by_ids.values() if order.is_open()
+            ]
+            for stop_losses_symbol, orders_by_ids in stop_losses_by_symbols.items()
+            if symbol is None or stop_losses_symbol == symbol
+        }
+
+    def update_order(self, order) -> None:
+        # handles created, edited, filled and cancelled orders the same way
+        self._remove_order(order.order_id)
+        if (
+            order.exchange_order_type is trading_enums.TradeOrderType.STOP_LOSS
+            and order.is_open()
+            and (group_id := get_managed_order_group_id(order.tag)) is not None
+        ):
+            if group_id not in self.stop_losses_by_group_ids:
+                self.stop_losses_by_group_ids[group_id] = {}
+            if order.symbol not in self.stop_losses_by_group_ids[group_id]:
+                self.stop_losses_by_group_ids[group_id][order.symbol] = {}
+            self.stop_losses_by_group_ids[group_id][order.symbol][
+                order.order_id
+            ] = order
+            self.group_keys_by_order_ids[order.order_id] = (group_id, order.symbol)
+
+    async def order_callback(
+        self,
+        exchange: str,
+        exchange_id: str,
+        cryptocurrency: str,
+        symbol: str,
+        order: dict,
+        update_type: str,
+        is_from_bot: bool,
+    ):
+        order_id: str = order[trading_enums.ExchangeConstantsOrderColumns.ID.value]
+        try:
+            self.update_order(self.orders_manager.get_order(order_id))
+        except KeyError:
+            # not open anymore
+            self._remove_order(order_id)
+
+    def _remove_order(self, order_id: str) -> None:
+        if order_id in self.group_keys_by_order_ids:
+            group_id, symbol = self.group_keys_by_order_ids.pop(order_id)
+            stop_losses_by_symbols = self.stop_losses_by_group_ids[group_id]
+            stop_losses_by_symbols[symbol].pop(order_id, None)
+            if not stop_losses_by_symbols[symbol]:
+                stop_losses_by_symbols.pop(symbol)
+                if not stop_losses_by_symbols:
+                    self.stop_losses_by_group_ids.pop(group_id)
+
+
+async def get_managed_stop_loss_index(exchange_manager) -> ManagedStopLossIndex:
+    # created from the open orders on first use and then kept up to date
+    if exchange_manager in _STOP_LOSS_INDEXES_BY_EXCHANGE_MANAGERS:
+        return _STOP_LOSS_INDEXES_BY_EXCHANGE_MANAGERS[exchange_manager]
+    stop_loss_index: ManagedStopLossIndex = ManagedStopLossIndex(exchange_manager)
+    _STOP_LOSS_INDEXES_BY_EXCHANGE_MANAGERS[exchange_manager] = stop_loss_index
+    await exchanges_channel.get_chan(
+        trading_personal_data.OrdersChannel.get_name(), exchange_manager.id
+    ).new_consumer(stop_loss_index.order_callback)
+    return stop_loss_index
@@ -18,99 +18,210 @@
 # or you want your own custom solution,
 # please contact me at max@a42.ch
 
+import asyncio
 import decimal as decimal
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.open_risk as open_risk
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.trailing_stop_loss.managed_stop_losses as managed_stop_losses
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.trailing_stop_loss.trailing_state as trailing_state
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.trailing_stop_loss.trailing_types as trailing_types
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.settings.sl_settings as sl_settings
 import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
 import tentacles.Meta.Keywords.scripting_library.orders.editing as editing
-import tentacles.Meta.Keywords.scripting_library.orders.open_orders as open_orders
 import octobot_trading.enums as trading_enums
-import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums as matrix_enums
 
 
 async def trail_stop_losses_for_this_candle(
     maker, order_group_settings, order_settings
 ):
-    if (
-        not order_group_settings.stop_loss.sl_trail_type
+    is_trailing = not (
+        order_group_settings.stop_loss.sl_trail_type
         == sl_settings.ManagedOrderSettingsSLTrailTypes.DONT_TRAIL_DESCRIPTION
+    )
+    stop_losses_trailing_state = trailing_state.get_trailing_state(
+        maker.ctx.exchange_manager
+    )
+    if (
+        is_trailing
+        and order_group_settings.stop_loss.sl_trail_on_mark_price
+        and not maker.ctx.exchange_manager.is_backtesting
     ):
-        _open_orders = open_orders.get_open_orders(maker.ctx)
-        if _open_orders:
-            current_price = decimal.Decimal(
-                str(await exchange_public_data.current_candle_price(maker.ctx))
-            )
-            for order in _open_orders:
-                if (
-                    order.tag
-                    and f"{matrix_enums.TAG_SEPERATOR}{order_group_settings.order_manager_group_id}{matrix_constants.TAG_SEPERATOR}"
-                    in order.tag
-                ):
-                    new_sl_price = None
-                    trading_side = (
-                        trading_enums.PositionSide.LONG.value
-                        if order.side is trading_enums.TradeOrderSide.SELL
-                        else trading_enums.PositionSide.SHORT.value
-                    )
-                    if (
-                        order.exchange_order_type
-                        is trading_enums.TradeOrderType.STOP_LOSS
-                        and order.status.value == trading_enums.OrderStatus.OPEN.value
-                    ):
-                        if check_if_can_start_trailing(
-                            order_group_settings=order_group_settings,
-                            av_entry=order.created_last_price,
-                            current_price=current_price,
-                            trading_side=trading_side,
-                        ):
-                            if (
-                                order_group_settings.stop_loss.sl_trail_type
-                                == sl_settings.ManagedOrderSettingsSLTrailTypes.BREAK_EVEN_DESCRIPTION
-                            ):
-                                new_sl_price = await trailing_types.trail_to_break_even(
-                                    maker.ctx,
-                                    trading_side=trading_side,
-                                    av_entry=order.created_last_price,
-                                )
-                            elif (
-                                order_group_settings.stop_loss.sl_trail_type
-                                == sl_settings.ManagedOrderSettingsSLTrailTypes.TRAILING_DESCRIPTION
-                            ):
-                                new_sl_price = (
-                                    await trailing_types.trail_to_stop_loss_settings(
-                                        maker,
-                                        trading_side,
-                                        order_group_settings,
-                                        entry_price=order.created_last_price,
-                                        current_price=current_price,
-                                    )
-                                )
-                            elif (
-                                order_group_settings.stop_loss.sl_trail_type
-                                == sl_settings.ManagedOrderSettingsSLTrailTypes.TRAILING_INDICATOR_DESCRIPTION
-                            ):
-                                new_sl_price = await trailing_types.trail_to_indicator(
-                                    maker=maker,
-                                    order_group_settings=order_group_settings,
-                                    orders_settings=order_settings,
-                                )
-                            if new_sl_price := adapt_sl_price_and_check_if_can_continue_trailing(
-                                sl_trail_start_only_if_above_entry=order_group_settings.stop_loss.sl_trail_start_only_if_above_entry,
-                                order=order,
-                                new_sl_price=new_sl_price,
-                                av_entry=order.created_last_price,
-                                trading_side=trading_side,
-                            ):
-                                try:
-                                    await editing.edit_order(
-                                        maker.ctx, order, edited_stop_price=new_sl_price
-                                    )
-                                except Exception as error:
-                                    maker.ctx.logger.exception(
-                                        error,
-                                        True,
-                                        f"Error editing trailing stop loss. Error: {error}",
-                                    )
+        # also trailed on each mark price until the next candle
+        stop_losses_trailing_state.register_group(
+            maker, order_group_settings, order_settings
+        )
+    else:
+        stop_losses_trailing_state.unregister_group(
+            maker.ctx.symbol, order_group_settings.order_manager_group_id
+        )
+    if is_trailing:
+        await trail_stop_losses(maker, order_group_settings, order_settings)
+
+
+async def trail_stop_losses_on_mark_price(exchange_manager, symbol, mark_price):
+    current_price = decimal.Decimal(str(mark_price))
+    stop_losses_trailing_state = trailing_state.get_trailing_state(exchange_manager)
+    for maker, order_group_settings, order_settings in (
+        stop_losses_trailing_state.get_trailed_groups(symbol)
+    ):
+        await trail_stop_losses(
+            maker, order_group_settings, order_settings, current_price=current_price
+        )
+
+
+async def trail_stop_losses(
+    maker, order_group_settings, order_settings, current_price=None
+):
+    stop_loss_index = await managed_stop_losses.get_managed_stop_loss_index(
+        maker.ctx.exchange_manager
+    )
+    stop_losses = stop_loss_index.get_stop_losses(
+        order_group_settings.order_manager_group_id, symbol=maker.ctx.symbol
+    )
+    stop_losses_trailing_state = trailing_state.get_trailing_state(
+        maker.ctx.exchange_manager
+    )
+    stop_losses_trailing_state.remove_closed_stop_losses()
+    if not stop_losses:
+        return
+    is_mark_price = current_price is not None
+    current_price = current_price or decimal.Decimal(
+        str(await exchange_public_data.current_candle_price(maker.ctx))
+    )
+    price_tick = trailing_state.get_price_tick(
+        maker.ctx.exchange_manager, maker.ctx.symbol
+    )
+    trailed_stop_losses = []
+    for order in stop_losses:
+        trailed_stop_loss = stop_losses_trailing_state.get_trailed_stop_loss(order)
+        if trailed_stop_loss.is_editing:
+            # wait for the current edit of this stop loss
+            continue
+        if new_sl_price := await get_trailed_stop_loss_price(
+            maker,
+            order_group_settings,
+            order_settings,
+            order,
+            current_price,
+            is_mark_price,
+        ):
+            if trailing_state.is_stop_loss_change_above_threshold(
+                trailed_stop_loss.stop_price,
+                new_sl_price,
+                order_group_settings.stop_loss,
+                price_tick,
+            ):
+                trailed_stop_loss.is_editing = True
+                trailed_stop_losses.append((trailed_stop_loss, new_sl_price))
+            else:
+                stop_losses_trailing_state.skipped_edits_count += 1
+    # all the stop losses of this symbol are edited together
+    await asyncio.gather(
+        *(
+            edit_trailing_stop_loss(maker, trailed_stop_loss, new_sl_price)
+            for trailed_stop_loss, new_sl_price in trailed_stop_losses
+        )
+    )
+
+
+async def get_trailed_stop_loss_price(
+    maker, order_group_settings, order_settings, order, current_price, is_mark_price
+):
+    # None when the stop loss shouldn't move
+    new_sl_price = None
+    trading_side = (
+        trading_enums.PositionSide.LONG.value
+        if order.side is trading_enums.TradeOrderSide.SELL
+        else trading_enums.PositionSide.SHORT.value
+    )
+    if not check_if_can_start_trailing(
+        order_group_settings=order_group_settings,
+        av_entry=order.created_last_price,
+        current_price=current_price,
+        trading_side=trading_side,
+    ):
+        return None
+    if (
+        order_group_settings.stop_loss.sl_trail_type
+        == sl_settings.ManagedOrderSettingsSLTrailTypes.BREAK_EVEN_DESCRIPTION
+    ):
+        new_sl_price = await trailing_types.trail_to_break_even(
+            maker.ctx,
+            trading_side=trading_side,
+            av_entry=order.created_last_price,
+        )
+    elif (
+        order_group_settings.stop_loss.sl_trail_type
+        == sl_settings.ManagedOrderSettingsSLTrailTypes.TRAILING_DESCRIPTION
+    ):
+        new_sl_price = await trailing_types.trail_to_stop_loss_settings(
+            maker,
+            trading_side,
+            order_group_settings,
+            entry_price=order.created_last_price,
+            current_price=current_price,
+        )
+    elif (
+        order_group_settings.stop_loss.sl_trail_type
+        == sl_settings.ManagedOrderSettingsSLTrailTypes.TRAILING_INDICATOR_DESCRIPTION
+    ):
+        new_sl_price = await get_indicator_stop_loss_price(
+            maker, order_group_settings, order_settings, is_mark_price
+        )
+    return adapt_sl_price_and_check_if_can_continue_trailing(
+        sl_trail_start_only_if_above_entry=order_group_settings.stop_loss.sl_trail_start_only_if_above_entry,
+        order=order,
+        new_sl_price=new_sl_price,
+        av_entry=order.created_last_price,
+        trading_side=trading_side,
+    )
+
+
+async def get_indicator_stop_loss_price(
+    maker, order_group_settings, order_settings, is_mark_price
+):
+    # the indicator only changes on candles,
+    # mark prices reuse the stop price computed on their candle
+    stop_losses_trailing_state = trailing_state.get_trailing_state(
+        maker.ctx.exchange_manager
+    )
+    group_key = (maker.ctx.symbol, str(order_group_settings.order_manager_group_id))
+    if (
+        is_mark_price
+        and group_key in stop_losses_trailing_state.indicator_stop_prices_by_groups
+    ):
+        return stop_losses_trailing_state.indicator_stop_prices_by_groups[group_key]
+    new_sl_price = await trailing_types.trail_to_indicator(
+        maker=maker,
+        order_group_settings=order_group_settings,
+        orders_settings=order_settings,
+    )
+    stop_losses_trailing_state.indicator_stop_prices_by_groups[group_key] = new_sl_price
+    return new_sl_price
+
+
+async def edit_trailing_stop_loss(
+    maker, trailed_stop_loss: trailing_state.TrailedStopLoss, new_sl_price
+) -> None:
+    try:
+        await editing.edit_order(
+            maker.ctx, trailed_stop_loss.order, edited_stop_price=new_sl_price
+        )
+        trailed_stop_loss.stop_price = new_sl_price
+        await open_risk.update_open_risk_orders(
+            maker.ctx.exchange_manager, [trailed_stop_loss.order]
+        )
+        stop_losses_trailing_state = trailing_state.get_trailing_state(
+            maker.ctx.exchange_manager
+        )
+        stop_losses_trailing_state.edits_count += 1
+    except Exception as error:
+        maker.ctx.logger.exception(
+            error,
+            True,
+            f"Error editing trailing stop loss. Error: {error}",
+        )
+    finally:
+        trailed_stop_loss.is_editing = False
 
 
 def adapt_sl_price_and_check_if_can_continue_trailing(
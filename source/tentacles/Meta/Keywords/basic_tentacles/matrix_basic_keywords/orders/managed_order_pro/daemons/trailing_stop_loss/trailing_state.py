@@ -0,0 +1,128 @@
+# a42.ch CONFIDENTIAL
+# __________________
+#
+#  [2021] - [∞] a42.ch Incorporated
+#  All Rights Reserved.
+#
+# NOTICE:  All information contained herein is, and remains
+# the property of a42.ch Incorporated and its suppliers,
+# if any.  The intellectual and technical concepts contained
+# herein are proprietary to a42.ch Incorporated
+# and its suppliers and may be covered by U.S. and Foreign Patents,
+# patents in process, and are protected by trade secret or copyright law.
+# Dissemination of this information or reproduction of this material
+# is strictly forbidden unless prior written permission is obtained
+# from a42.ch Incorporated.
+#
+# If you want to use any code for commercial purposes,
+# or you want your own custom solution,
+# please contact me at max@a42.ch
+
+
+import decimal
+import typing
+import weakref
+
+import octobot_trading.enums as trading_enums
+
+# Trailing stop losses are moved on each candle and, when enabled, on each
+# mark price in between. The groups to trail on mark price are registered on
+# their candle along with the maker and settings of that candle, and each
+# trailed stop loss keeps its state so it isn't edited again while an edit
+# is in flight. Indicator based stop prices only change on candles and are
+# kept until the next candle of their group.
+
+# one state by exchange
+_TRAILING_STATES_BY_EXCHANGE_MANAGERS: weakref.WeakKeyDictionary = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class TrailedStopLoss:
+    def __init__(self, order):
+        self.order = order
+        # last stop price sent to the exchange
+        self.stop_price: decimal.Decimal = order.origin_price
+        self.is_editing: bool = False
+
+
+class TrailingState:
+    def __init__(self):
+        # (maker, order group settings, order settings) by group id by symbol
+        self.trailed_groups_by_symbols: typing.Dict[
+            str, typing.Dict[str, typing.Tuple[typing.Any, typing.Any, typing.Any]]
+        ] = {}
+        # stop price of the indicator by (symbol, group id) for the current candle
+        self.indicator_stop_prices_by_groups: typing.Dict[
+            typing.Tuple[str, str], typing.Optional[decimal.Decimal]
+        ] = {}
+        self.trailed_stop_losses_by_order_ids: typing.Dict[str, TrailedStopLoss] = {}
+        self.edits_count: int = 0
+        self.skipped_edits_count: int = 0
+
+    def register_group(self, maker, order_group_settings, order_settings) -> None:
+        # replaces the previous candle maker and settings of this group
+        symbol: str = maker.ctx.symbol
+        group_id: str = str(order_group_settings.order_manager_group_id)
+        if symbol not in self.trailed_groups_by_symbols:
+            self.trailed_groups_by_symbols[symbol] = {}
+        self.trailed_groups_by_symbols[symbol][group_id] = (
+            maker,
+            order_group_settings,
+            order_settings,
+        )
+        self.indicator_stop_prices_by_groups.pop((symbol, group_id), None)
+
+    def unregister_group(self, symbol: str, group_id) -> None:
+        self.trailed_groups_by_symbols.get(symbol, {}).pop(str(group_id), None)
+        self.indicator_stop_prices_by_groups.pop((symbol, str(group_id)), None)
+
+    def get_trailed_groups(
+        self, symbol: str
+    ) -> typing.List[typing.Tuple[typing.Any, typing.Any, typing.Any]]:
+        return list(self.trailed_groups_by_symbols.get(symbol, {}).values())
+
+    def get_trailed_stop_loss(self, order) -> TrailedStopLoss:
+        if order.order_id not in self.trailed_stop_losses_by_order_ids:
+            self.trailed_stop_losses_by_order_ids[order.order_id] = TrailedStopLoss(
+                order
+            )
+        return self.trailed_stop_losses_by_order_ids[order.order_id]
+
+    def remove_closed_stop_losses(self) -> None:
+        for order_id, trailed_stop_loss in list(
+            self.trailed_stop_losses_by_order_ids.items()
+        ):
+            if not (trailed_stop_loss.is_editing or trailed_stop_loss.order.is_open()):
+                self.trailed_stop_losses_by_order_ids.pop(order_id)
+
+
+def get_trailing_state(exchange_manager) -> TrailingState:
+    if exchange_manager not in _TRAILING_STATES_BY_EXCHANGE_MANAGERS:
+        _TRAILING_STATES_BY_EXCHANGE_MANAGERS[exchange_manager] = TrailingState()
+    return _TRAILING_STATES_BY_EXCHANGE_MANAGERS[exchange_manager]
+
+
+def get_price_tick(exchange_manager, symbol: str) -> decimal.Decimal:
+    # smallest price change of the symbol, 0 when unknown
+    price_precision = (
+        exchange_manager.exchange.get_market_status(symbol)
+        .get(trading_enums.ExchangeConstantsMarketStatusColumns.PRECISION.value, {})
+        .get(trading_enums.ExchangeConstantsMarketStatusColumns.PRECISION_PRICE.value)
+    )
+    if price_precision is None:
+        return decimal.Decimal("0")
+    return decimal.Decimal("1").scaleb(-int(price_precision))
+
+
+def is_stop_loss_change_above_threshold(
+    stop_price: decimal.Decimal,
+    new_stop_price: decimal.Decimal,
+    stop_loss_settings,
+    price_tick: decimal.Decimal,
+) -> bool:
+    # small stop moves aren't worth an exchange request
+    return abs(new_stop_price - stop_price) >= max(
+        stop_loss_settings.sl_trail_min_change_ticks * price_tick,
+        stop_price * stop_loss_settings.sl_trail_min_change_p / 100,
+    )
@@ -27,6 +27,7 @@ import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.data.public
 from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums import (
     PriceDataSources,
 )
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.open_risk as open_risk
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.position_sizing as position_sizing
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.stop_loss as stop_loss
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.calculators.take_profit as take_profit
@@ -338,6 +339,11 @@ class ManagedOrderPlacement:
         #     raise NotImplementedError("Unknown entry order type")
         if order_preview_mode:
             await self.plot_order_preview(maker)
+        elif self.created_orders:
+            # the next entry of this tick is sized with these stop losses
+            await open_risk.update_open_risk_orders(
+                maker.ctx.exchange_manager, self.created_orders
+            )
 
         # if (
         #     not maker.ctx.exchange_manager.is_backtesting
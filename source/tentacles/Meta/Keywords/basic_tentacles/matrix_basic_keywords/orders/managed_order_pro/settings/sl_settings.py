@@ -109,6 +109,10 @@ class ManagedOrderSettingsSL:
         self.sl_trail_start_only_if_above_entry: bool = None
         self.sl_trailing_min_p: float = None
         self.sl_trailing_max_p: float = None
+        self.sl_trail_on_mark_price: bool = False
+        # stop loss edits below both are skipped
+        self.sl_trail_min_change_ticks: int = 1
+        self.sl_trail_min_change_p: decimal.Decimal = decimal.Decimal("0")
 
         self.sl_indicator_id: int = None
         self.trailing_indicator_id: int = None
@@ -427,6 +431,44 @@ class ManagedOrderSettingsSL:
                         title="Start trailing only if SL would be above the entry",
                         parent_input_name=sl_trailing_setting_name,
                     )
+                if (
+                    self.sl_trail_type
+                    != ManagedOrderSettingsSLTrailTypes.DONT_TRAIL_DESCRIPTION
+                ):
+                    self.sl_trail_on_mark_price = await basic_keywords.user_input(
+                        maker.ctx,
+                        f"{sl_trailing_setting_name_prefix}_trail_stop_loss_on_mark_price",
+                        "boolean",
+                        False,
+                        title="Trail the SL on each mark price (live only)",
+                        parent_input_name=sl_trailing_setting_name,
+                        other_schema_values={
+                            "description": "Otherwise the SL is only trailed "
+                            "when a candle closes"
+                        },
+                    )
+                    self.sl_trail_min_change_ticks = await basic_keywords.user_input(
+                        maker.ctx,
+                        f"{sl_trailing_setting_name_prefix}_min_SL_change_in_ticks",
+                        "int",
+                        1,
+                        min_val=0,
+                        title="Only move the SL when it changes by at least x ticks",
+                        parent_input_name=sl_trailing_setting_name,
+                    )
+                    self.sl_trail_min_change_p = decimal.Decimal(
+                        str(
+                            await basic_keywords.user_input(
+                                maker.ctx,
+                                f"{sl_trailing_setting_name_prefix}_min_SL_change_in_%",
+                                "float",
+                                0,
+                                min_val=0,
+                                title="Only move the SL when it changes by at least x%",
+                                parent_input_name=sl_trailing_setting_name,
+                            )
+                        )
+                    )
 
             #     elif (
             #         self.sl_trail_type
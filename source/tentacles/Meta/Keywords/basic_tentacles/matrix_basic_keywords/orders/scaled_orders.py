@@ -18,8 +18,11 @@
 # or you want your own custom solution,
 # please contact me at max@a42.ch
 
+import asyncio
 import decimal
+import typing
 import numpy
+import numpy.typing as npt
 import octobot_trading.enums as trading_enums
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_errors as matrix_errors
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.order_placement as order_placement
@@ -30,6 +33,12 @@ import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.mana
 import tentacles.Meta.Keywords.scripting_library.orders.order_types.create_order as create_order
 import tentacles.Meta.Keywords.scripting_library.orders.position_size as position_size
 import tentacles.Meta.Keywords.scripting_library.orders.offsets as offsets
+import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
+
+
+# live scaled orders created at the same time, bounded to stay below
+# the exchanges rate limits
+MAX_CONCURRENT_ORDER_CREATIONS: int = 5
 
 
 class ScaledOrderValueDistributionTypes:
@@ -128,6 +137,8 @@ async def scaled_order(
         )
         return None, None, None, None, None, None, None
     created_orders = []
+    # all the orders are computed first and then created together
+    orders_parameters: typing.List[dict] = []
     take_profit_prices = []
     limit_fee, market_fee = position_sizing.get_fees(maker.ctx)
     entry_fee = limit_fee if order_type_name == "limit" else market_fee
@@ -194,67 +205,37 @@ async def scaled_order(
                     this_order_offset = None
                     this_entry_price = current_price
         if not order_preview_mode:
-            created_order = None
-            error = None
-            error_message = ""
-            try:
-                new_created_order = await create_order.create_order_instance(
-                    maker.ctx,
-                    side=side,
-                    symbol=symbol or maker.ctx.symbol,
-                    order_amount=order_amounts[order_index],
-                    order_type_name=this_order_type_name,
-                    order_offset=this_order_offset,
-                    stop_loss_offset=bundled_sl_offset or stop_loss_offset,
-                    stop_loss_tag=final_stop_loss_tag,
-                    stop_loss_group=bundled_sl_group or stop_loss_group,
-                    stop_loss_type=stop_loss_type,
-                    take_profit_offset=bundled_tp_offset or take_profit_offset,
-                    take_profit_tag=final_take_profit_tag,
-                    take_profit_group=bundled_tp_group or take_profit_group,
-                    take_profit_type=take_profit_type,
-                    slippage_limit=slippage_limit,
-                    time_limit=time_limit,
-                    reduce_only=reduce_only,
-                    post_only=post_only,
-                    # group=exit_order_group,
-                    tag=final_entry_tag,
-                    wait_for=wait_for,
-                )
-                created_order = new_created_order[0]
-                created_orders.append(created_order)
-                continue
-            except IndexError as _error:
-                error = _error
-                error_message = "Order not created"
-            except Exception as _error:
-                error = _error
-                error_message = f"{error}"
-            if not created_order:
-                created_order = {
+            orders_parameters.append(
+                {
                     "symbol": symbol or maker.ctx.symbol,
-                    "order_amount": float(str(order_amounts[order_index])),
+                    "order_amount": order_amounts[order_index],
                     "order_type_name": this_order_type_name,
                     "order_offset": this_order_offset,
-                    "entry_price": float(str(this_entry_price)),
+                    "entry_price": this_entry_price,
                     "stop_loss_offset": bundled_sl_offset or stop_loss_offset,
                     "stop_loss_tag": final_stop_loss_tag,
-                    "stop_loss_type": stop_loss_type,
+                    "stop_loss_group": bundled_sl_group or stop_loss_group,
                     "take_profit_offset": bundled_tp_offset or take_profit_offset,
                     "take_profit_tag": final_take_profit_tag,
-                    "take_profit_type": take_profit_type,
-                    "status": "rejected",
-                    "status_message": f"failed_to_create: error: {error_message}",
+                    "take_profit_group": bundled_tp_group or take_profit_group,
+                    "tag": final_entry_tag,
+                    "exit_group": exit_group,
                 }
-                maker.ctx.logger.warning(
-                    f"Scaled {side} order failed to create order: {created_order} - "
-                    f"error: {error_message}",
-                )
-            else:
-                maker.ctx.logger.exception(
-                    error, True, f"Scaled {side} order failed to create order"
-                )
-            created_orders.append(created_order)
+            )
+    if not order_preview_mode:
+        created_orders = await create_scaled_orders(
+            maker,
+            side=side,
+            orders_parameters=orders_parameters,
+            group_orders_settings=group_orders_settings,
+            stop_loss_type=stop_loss_type,
+            take_profit_type=take_profit_type,
+            slippage_limit=slippage_limit,
+            time_limit=time_limit,
+            reduce_only=reduce_only,
+            post_only=post_only,
+            wait_for=wait_for,
+        )
     if exit_group and not order_preview_mode:
         await group_orders_settings.enable_managed_order_groups()
     return (
@@ -268,6 +249,129 @@ async def scaled_order(
     )
 
 
+async def create_scaled_orders(
+    maker,
+    side: str,
+    orders_parameters: typing.List[dict],
+    group_orders_settings=None,
+    stop_loss_type=None,
+    take_profit_type=None,
+    slippage_limit=None,
+    time_limit=None,
+    reduce_only=False,
+    post_only=False,
+    wait_for=None,
+) -> list:
+    # live orders are sent concurrently, each order is a round trip to the
+    # exchange. Backtesting creates them one after the other to stay deterministic
+    concurrent_creations: int = (
+        1
+        if maker.ctx.exchange_manager.is_backtesting
+        else MAX_CONCURRENT_ORDER_CREATIONS
+    )
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrent_creations)
+
+    async def _create_scaled_order(order_parameters: dict):
+        async with semaphore:
+            return await _create_scaled_order_or_rejection(
+                maker,
+                side=side,
+                order_parameters=order_parameters,
+                stop_loss_type=stop_loss_type,
+                take_profit_type=take_profit_type,
+                slippage_limit=slippage_limit,
+                time_limit=time_limit,
+                reduce_only=reduce_only,
+                post_only=post_only,
+                wait_for=wait_for,
+            )
+
+    created_orders: list = list(
+        await asyncio.gather(
+            *(
+                _create_scaled_order(order_parameters)
+                for order_parameters in orders_parameters
+            )
+        )
+    )
+    if group_orders_settings and group_orders_settings.order_groups:
+        # only keep the exit groups of created entries, so no empty group
+        # is enabled when some of the orders failed
+        for created_order, order_parameters in zip(created_orders, orders_parameters):
+            if (
+                isinstance(created_order, dict)
+                and order_parameters["exit_group"] in group_orders_settings.order_groups
+            ):
+                group_orders_settings.order_groups.remove(
+                    order_parameters["exit_group"]
+                )
+    return created_orders
+
+
+async def _create_scaled_order_or_rejection(
+    maker,
+    side: str,
+    order_parameters: dict,
+    stop_loss_type=None,
+    take_profit_type=None,
+    slippage_limit=None,
+    time_limit=None,
+    reduce_only=False,
+    post_only=False,
+    wait_for=None,
+):
+    error_message = ""
+    try:
+        new_created_order = await create_order.create_order_instance(
+            maker.ctx,
+            side=side,
+            symbol=order_parameters["symbol"],
+            order_amount=order_parameters["order_amount"],
+            order_type_name=order_parameters["order_type_name"],
+            order_offset=order_parameters["order_offset"],
+            stop_loss_offset=order_parameters["stop_loss_offset"],
+            stop_loss_tag=order_parameters["stop_loss_tag"],
+            stop_loss_group=order_parameters["stop_loss_group"],
+            stop_loss_type=stop_loss_type,
+            take_profit_offset=order_parameters["take_profit_offset"],
+            take_profit_tag=order_parameters["take_profit_tag"],
+            take_profit_group=order_parameters["take_profit_group"],
+            take_profit_type=take_profit_type,
+            slippage_limit=slippage_limit,
+            time_limit=time_limit,
+            reduce_only=reduce_only,
+            post_only=post_only,
+            # group=exit_order_group,
+            tag=order_parameters["tag"],
+            wait_for=wait_for,
+        )
+        return new_created_order[0]
+    except IndexError:
+        error_message = "Order not created"
+    except Exception as error:
+        error_message = f"{error}"
+    rejected_order = {
+        "symbol": order_parameters["symbol"],
+        "order_amount": float(str(order_parameters["order_amount"])),
+        "order_type_name": order_parameters["order_type_name"],
+        "order_offset": order_parameters["order_offset"],
+        "entry_price": float(str(order_parameters["entry_price"])),
+        "stop_loss_offset": order_parameters["stop_loss_offset"],
+        "stop_loss_tag": order_parameters["stop_loss_tag"],
+        "stop_loss_type": stop_loss_type,
+        "take_profit_offset": order_parameters["take_profit_offset"],
+        "take_profit_tag": order_parameters["take_profit_tag"],
+        "take_profit_type": take_profit_type,
+        "status": "rejected",
+        "status_message": f"failed_to_create: error: {error_message}",
+    }
+    maker.ctx.logger.warning(
+        f"Scaled {side} order failed to create order: {rejected_order} - "
+        f"error: {error_message}",
+    )
+    return rejected_order
+
+
 async def calculate_scaled_order(
     maker,
     order_block,
@@ -340,179 +444,84 @@ async def calculate_scaled_order(
         scale_from_price, scale_to_price, side
     )
 
-    # price_distribution_types
-    entry_prices: list = []
-    stop_loss_prices: list = []
-    stop_loss_percents: list = []
-    filled_entry_prices: list = []
-    distance_factors: list = []
-    place_entries: bool = False
-    if price_distribution_type == "linear_growth":
-        distance_factors = calculate_linear_growth(
-            float(str(price_growth_factor)),
-            1,
-            # - one because start is given
-            order_count - 1,
-        )
-        total_factor = decimal.Decimal(str(sum(distance_factors)))
-        from_to_distance = normalized_scale_to_price - normalized_scale_from_price
-        prev_price = normalized_scale_from_price
-        entry_prices.append(normalized_scale_from_price)
-        await get_stop_loss_from_group_settings(
-            group_orders_settings=group_orders_settings,
+    # all levels are computed as float arrays,
+    # only the results are converted to decimals
+    entry_prices: npt.NDArray[numpy.float64] = get_scaled_entry_prices(
+        float(normalized_scale_from_price),
+        float(normalized_scale_to_price),
+        order_count,
+        price_distribution_type,
+        price_growth_factor,
+    )
+    value_weights: npt.NDArray[numpy.float64] = get_scaled_order_weights(
+        order_count, value_distribution_type, value_growth_factor, power=15
+    )
+    stop_loss_prices: typing.Optional[npt.NDArray[numpy.float64]] = None
+    if group_orders_settings:
+        stop_loss_prices = await stop_loss.get_manged_order_stop_losses(
+            maker,
             order_block=order_block,
-            side=side,
-            entry_price=normalized_scale_from_price,
-            current_price=current_price,
-            filled_entry_prices=filled_entry_prices,
-            maker=maker,
-            stop_loss_prices=stop_loss_prices,
-            stop_loss_percents=stop_loss_percents,
+            stop_loss_settings=group_orders_settings.stop_loss,
+            trading_side=side,
+            entry_prices=entry_prices,
+            current_price=float(current_price),
         )
-        for factor in distance_factors:
-            multiplier = 100 / total_factor  # 100%
-            percent_of_total_factor = (decimal.Decimal(str(factor)) * multiplier) / 100
-            entry_prices.append(
-                (percent_of_total_factor * from_to_distance) + prev_price
-            )
-            prev_price = entry_prices[-1]
-            await get_stop_loss_from_group_settings(
-                group_orders_settings=group_orders_settings,
-                order_block=order_block,
-                side=side,
-                entry_price=entry_prices[-1],
-                current_price=current_price,
-                filled_entry_prices=filled_entry_prices,
-                maker=maker,
-                stop_loss_prices=stop_loss_prices,
-                stop_loss_percents=stop_loss_percents,
-            )
-
-    elif price_distribution_type == "flat":
-        (
-            entry_prices,
-            stop_loss_prices,
-            filled_entry_prices,
-            stop_loss_percents,
-        ) = await calculate_flat_distribution(
-            normalized_scale_from_price,
-            normalized_scale_to_price,
-            order_count,
-            side,
-            group_orders_settings,
-            current_price,
-            maker,
-            order_block,
+    place_entries: bool = False
+    entry_order_tag = tp_order_tag = sl_order_tag = order_tag_id = None
+    if value:
+        order_amounts: npt.NDArray[numpy.float64] = (
+            float(value) * value_weights / entry_prices
         )
-    else:
-        raise RuntimeError(
-            "scaled order: unsupported amount_of_orders_distribution_type. "
-            "check the documentation for more informations"
+    elif total_amount:
+        order_amounts: npt.NDArray[numpy.float64] = float(total_amount) * value_weights
+    elif group_orders_settings:
+        # get average entry for the position site calculator
+        average_entry_price, average_stop_loss_price = get_scaled_average_prices(
+            entry_prices, value_weights, stop_loss_prices
         )
-    # value_distribution_types
-    order_amounts: list = []
-    order_tag_id = None
-    if value_distribution_type == "flat":
-        # distance_factors = [1] * order_count
-        if value:
-            value_per_order = value / order_count
-            for price in entry_prices:
-                order_amounts.append(value_per_order / price)
-        elif total_amount:
-            amount_per_order = total_amount / order_count
-            order_amounts = [amount_per_order] * order_count
-        elif group_orders_settings:
-            # get average entry for the position site calculator
-            tmp_total_value = 1000
-            tmp_value_per_order = decimal.Decimal(str(tmp_total_value / order_count))
-            tmp_total_quantity = 0
-            stop_loss_total_value = 0
-            for order_index, entry_price in enumerate(entry_prices):
-                this_quantity = entry_price / tmp_value_per_order
-                tmp_total_quantity += this_quantity
-                if stop_loss_prices:
-                    stop_loss_total_value += (
-                        stop_loss_prices[order_index] * this_quantity
-                    )
-            try:
-                average_entry_price = tmp_total_value / tmp_total_quantity
-            except ZeroDivisionError as error:
-                raise RuntimeError(
-                    "Scaled order failed to determine the average entry price"
-                ) from error
-            average_stop_loss_percentage = None
-            if stop_loss_total_value:
-                average_stop_loss_price = stop_loss_total_value / tmp_total_quantity
-                average_stop_loss_percentage = convert_sl_price_to_percent(
-                    side, average_entry_price, stop_loss_price=average_stop_loss_price
-                )
-            (
-                total_amount,
-                max_position_size,
-                current_open_risk,
-                max_buying_power,
-                place_entries,
-                entry_order_tag,
-                tp_order_tag,
-                sl_order_tag,
-                order_tag_id,
-            ) = await position_sizing.get_manged_order_position_size(
-                maker=maker,
-                position_size_settings=group_orders_settings.position_size,
-                trading_side=trading_enums.PositionSide.SHORT.value
-                if side == trading_enums.TradeOrderSide.SELL.value
-                else trading_enums.PositionSide.LONG.value,
-                entry_side=side,
-                entry_price=average_entry_price,
-                entry_order_type=order_type_name,
-                stop_loss_percent=average_stop_loss_percentage,
-                order_tag_prefix=group_orders_settings.order_tag_prefix,
-                recreate_exits=False,
-                forced_amount=forced_amount,
+        average_stop_loss_percentage = None
+        if average_stop_loss_price is not None:
+            average_stop_loss_percentage = convert_sl_price_to_percent(
+                side,
+                decimal.Decimal(str(average_entry_price)),
+                stop_loss_price=decimal.Decimal(str(average_stop_loss_price)),
             )
-            order_amounts = [total_amount / order_count] * order_count
-        else:
-            raise RuntimeError("Scaled order failed to determine the position size")
-    elif value_distribution_type in (
-        ScaledOrderValueDistributionTypes.LINEAR_GROWTH,
-        ScaledOrderValueDistributionTypes.EXPONENTIAL,
-    ):
         (
-            order_values,
+            total_amount,
+            max_position_size,
+            current_open_risk,
+            max_buying_power,
+            place_entries,
             entry_order_tag,
             tp_order_tag,
             sl_order_tag,
             order_tag_id,
-            place_entries,
-        ) = await calculate_scaled_growth_orders(
-            maker,
-            side=side,
-            total_value=value,
-            total_amount=total_amount,
-            group_orders_settings=group_orders_settings,
-            order_type_name=order_type_name,
-            entry_prices=entry_prices,
-            amount_of_orders=order_count,
-            growth_factor=value_growth_factor,
-            growth_type=value_distribution_type,
-            power=15,
-            stop_loss_prices=stop_loss_prices,
+        ) = await position_sizing.get_manged_order_position_size(
+            maker=maker,
+            position_size_settings=group_orders_settings.position_size,
+            trading_side=trading_enums.PositionSide.SHORT.value
+            if side == trading_enums.TradeOrderSide.SELL.value
+            else trading_enums.PositionSide.LONG.value,
+            entry_side=side,
+            entry_price=decimal.Decimal(str(average_entry_price)),
+            entry_order_type=order_type_name,
+            stop_loss_percent=average_stop_loss_percentage,
+            order_tag_prefix=group_orders_settings.order_tag_prefix,
+            recreate_exits=False,
+            forced_amount=forced_amount,
         )
-
-        if value:
-            for index, price in enumerate(entry_prices):
-                order_amounts.append(order_values[index] / price)
-        else:
-            order_amounts = order_values
+        order_amounts: npt.NDArray[numpy.float64] = float(total_amount) * value_weights
     else:
-        raise RuntimeError(
-            "scaled order: unsupported value_distribution_type. "
-            "check the documentation for more informations"
-        )
+        raise RuntimeError("Scaled order failed to determine the position size")
     return (
-        entry_prices,
-        stop_loss_prices,
-        order_amounts,
+        _to_decimals(entry_prices),
+        []
+        if stop_loss_prices is None
+        else [
+            exchange_public_data.get_digits_adapted_price(maker.ctx, stop_loss_price)
+            for stop_loss_price in _to_decimals(stop_loss_prices)
+        ],
+        _to_decimals(order_amounts),
         place_entries,
         entry_order_tag,
         tp_order_tag,
@@ -521,34 +530,90 @@ async def calculate_scaled_order(
     )
 
 
-async def get_stop_loss_from_group_settings(
-    group_orders_settings,
-    order_block,
-    side,
-    entry_price,
-    current_price,
-    filled_entry_prices,
-    maker,
-    stop_loss_prices,
-    stop_loss_percents,
-) -> list:
-    if group_orders_settings:
-        if side == "buy":
-            entry_price = entry_price if entry_price < current_price else current_price
-        else:
-            entry_price = entry_price if entry_price > current_price else current_price
-        filled_entry_prices.append(entry_price)
-        stop_loss_price, stop_loss_percent = await stop_loss.get_manged_order_stop_loss(
-            maker=maker,
-            order_block=order_block,
-            stop_loss_settings=group_orders_settings.stop_loss,
-            trading_side=side,
-            entry_price=entry_price,
-            current_price=current_price,
+def get_scaled_entry_prices(
+    scale_from: float,
+    scale_to: float,
+    order_count: int,
+    price_distribution_type: str,
+    price_growth_factor: float,
+) -> npt.NDArray[numpy.float64]:
+    if price_distribution_type == ScaledOrderPriceDistributionTypes.FLAT:
+        return numpy.linspace(scale_from, scale_to, order_count)
+    if price_distribution_type == ScaledOrderPriceDistributionTypes.LINEAR_GROWTH:
+        # distances between the levels grow linear
+        distance_factors: npt.NDArray[numpy.float64] = calculate_linear_growth(
+            float(str(price_growth_factor)),
+            1,
+            # - one because start is given
+            order_count - 1,
+        )
+        distance_percents: npt.NDArray[numpy.float64] = numpy.concatenate(
+            ([0.0], numpy.cumsum(distance_factors) / numpy.sum(distance_factors))
+        )
+        return scale_from + distance_percents * (scale_to - scale_from)
+    raise RuntimeError(
+        "scaled order: unsupported amount_of_orders_distribution_type. "
+        "check the documentation for more informations"
+    )
+
+
+def get_scaled_order_weights(
+    order_count: int,
+    value_distribution_type: str,
+    growth_factor: float = 2,
+    power: int = 15,
+) -> npt.NDArray[numpy.float64]:
+    # share of the total position of each order, sums up to 1
+    if value_distribution_type == ScaledOrderValueDistributionTypes.FLAT:
+        return numpy.full(order_count, 1 / order_count)
+    SUM_OF_ARRAY = 100
+    _array_start = SUM_OF_ARRAY / order_count
+    _array_end = (SUM_OF_ARRAY / order_count) * float(str(growth_factor))
+    if value_distribution_type == ScaledOrderValueDistributionTypes.LINEAR_GROWTH:
+        _growth_array = calculate_linear_growth(_array_start, _array_end, order_count)
+    elif value_distribution_type == ScaledOrderValueDistributionTypes.EXPONENTIAL:
+        # two given datapoints to which the exponential
+        # function with power pw should fit
+        x = [
+            _array_start,
+            _array_end,
+        ]
+        y = [1, order_count]
+
+        A = numpy.exp(numpy.log(y[0] / y[1]) / power)
+        a = (x[0] - x[1] * A) / (A - 1)
+        b = y[0] / (x[0] + a) ** power
+        xf = numpy.linspace(1, order_count, order_count)
+        _growth_array = ((xf + a) ** power) * b
+    else:
+        raise RuntimeError(
+            "scaled order: unsupported value_distribution_type. "
+            "check the documentation for more informations"
+        )
+    return _growth_array / numpy.sum(_growth_array)
+
+
+def get_scaled_average_prices(
+    entry_prices: npt.NDArray[numpy.float64],
+    value_weights: npt.NDArray[numpy.float64],
+    stop_loss_prices: typing.Optional[npt.NDArray[numpy.float64]] = None,
+) -> typing.Tuple[float, typing.Optional[float]]:
+    # average entry and stop loss prices weighted by the order quantities
+    quantities: npt.NDArray[numpy.float64] = value_weights / entry_prices
+    total_quantity: float = float(numpy.sum(quantities))
+    if not total_quantity:
+        raise RuntimeError("Scaled order failed to determine the average entry price")
+    average_entry_price: float = float(numpy.sum(value_weights)) / total_quantity
+    average_stop_loss_price: typing.Optional[float] = None
+    if stop_loss_prices is not None and len(stop_loss_prices):
+        average_stop_loss_price = (
+            float(numpy.sum(stop_loss_prices * quantities)) / total_quantity
         )
-        if stop_loss_price is not None:
-            stop_loss_prices.append(stop_loss_price)
-            stop_loss_percents.append(stop_loss_percent)
+    return average_entry_price, average_stop_loss_price
+
+
+def _to_decimals(values: npt.NDArray[numpy.float64]) -> typing.List[decimal.Decimal]:
+    return [decimal.Decimal(str(value)) for value in values.tolist()]
 
 
 def calculate_linear_growth(scale_from, scale_to, order_count) -> list:
@@ -561,55 +626,6 @@ def calculate_linear_growth(scale_from, scale_to, order_count) -> list:
     return _growth_array
 
 
-async def calculate_flat_distribution(
-    scale_from,
-    scale_to,
-    count: int,
-    side: str,
-    group_orders_settings,
-    current_price,
-    maker,
-    order_block,
-) -> list:
-    entry_prices = []
-    stop_loss_prices = []
-    filled_entry_prices = []
-    stop_loss_percents = []
-    if scale_from >= scale_to:
-        price_difference = scale_from - scale_to
-        step_size = price_difference / (count - 1)
-        for i in range(0, count):
-            entry_prices.append(scale_from - (step_size * i))
-            await get_stop_loss_from_group_settings(
-                group_orders_settings=group_orders_settings,
-                order_block=order_block,
-                side=side,
-                entry_price=entry_prices[-1],
-                current_price=current_price,
-                filled_entry_prices=filled_entry_prices,
-                maker=maker,
-                stop_loss_prices=stop_loss_prices,
-                stop_loss_percents=stop_loss_percents,
-            )
-    elif scale_to > scale_from:
-        price_difference = scale_to - scale_from
-        step_size = price_difference / (count - 1)
-        for i in range(0, count):
-            entry_prices.append(scale_from + (step_size * i))
-            await get_stop_loss_from_group_settings(
-                group_orders_settings=group_orders_settings,
-                order_block=order_block,
-                side=side,
-                entry_price=entry_prices[-1],
-                current_price=current_price,
-                filled_entry_prices=filled_entry_prices,
-                maker=maker,
-                stop_loss_prices=stop_loss_prices,
-                stop_loss_percents=stop_loss_percents,
-            )
-    return entry_prices, stop_loss_prices, filled_entry_prices, stop_loss_percents
-
-
 def get_normalized_scale(scale_from_price, scale_to_price, side) -> tuple:
     normalized_scale_from_price: decimal.Decimal = None
     normalized_scale_to_price: decimal.Decimal = None
@@ -643,115 +659,6 @@ def get_normalized_scale(scale_from_price, scale_to_price, side) -> tuple:
     )
 
 
-async def calculate_scaled_growth_orders(
-    maker,
-    side: str,
-    total_value: decimal.Decimal = None,
-    total_amount: decimal.Decimal = None,
-    group_orders_settings=None,
-    order_type_name: str = "limit",
-    amount_of_orders: int = 10,
-    growth_factor: float = 2,
-    growth_type="linear_growth",
-    power: int = 15,
-    stop_loss_prices: list = None,
-    entry_prices: list = None,
-):
-    SUM_OF_ARRAY = 100
-    _array_start = SUM_OF_ARRAY / amount_of_orders
-    _array_end = (SUM_OF_ARRAY / amount_of_orders) * float(str(growth_factor))
-    if growth_type == "linear_growth":
-        _growth_array = calculate_linear_growth(
-            _array_start, _array_end, amount_of_orders
-        )
-    elif growth_type == "exponential":
-
-        def func(x, adj1, adj2):
-            return ((x + adj1) ** power) * adj2
-
-        # two given datapoints to which the exponential
-        # function with power pw should fit
-        x = [
-            _array_start,
-            _array_end,
-        ]
-        y = [1, amount_of_orders]
-
-        A = numpy.exp(numpy.log(y[0] / y[1]) / power)
-        a = (x[0] - x[1] * A) / (A - 1)
-        b = y[0] / (x[0] + a) ** power
-        xf = numpy.linspace(1, amount_of_orders, amount_of_orders)
-        _growth_array = func(xf, a, b)
-    else:
-        # Handle other growth types here
-        raise NotImplementedError()
-
-    growth_array_sum = 0
-    growth_deci_array = []
-    for number in _growth_array:
-        growth_deci_array.append(decimal.Decimal(str(number)))
-        growth_array_sum += growth_deci_array[-1]
-    order_tag_id = None
-    if group_orders_settings:
-        # get average entry for the position site calculator
-        tmp_total_quantity = 0
-        stop_loss_total_value = 0
-        for order_index, entry_price in enumerate(entry_prices):
-            this_quantity = growth_deci_array[order_index] / entry_price
-            tmp_total_quantity += this_quantity
-            if len(stop_loss_prices):
-                stop_loss_total_value += stop_loss_prices[order_index] * this_quantity
-        try:
-            average_entry_price = growth_array_sum / tmp_total_quantity
-        except ZeroDivisionError as error:
-            raise RuntimeError(
-                "Scaled order failed to determine the average entry price"
-            ) from error
-        average_stop_loss_percentage = None
-        if stop_loss_total_value:
-            average_stop_loss_price = stop_loss_total_value / tmp_total_quantity
-            average_stop_loss_percentage = convert_sl_price_to_percent(
-                side, average_entry_price, stop_loss_price=average_stop_loss_price
-            )
-        (
-            total_amount,
-            max_position_size,
-            current_open_risk,
-            max_buying_power,
-            place_entries,
-            entry_order_tag,
-            tp_order_tag,
-            sl_order_tag,
-            order_tag_id,
-        ) = await position_sizing.get_manged_order_position_size(
-            maker=maker,
-            position_size_settings=group_orders_settings.position_size,
-            trading_side=trading_enums.PositionSide.SHORT.value
-            if side == trading_enums.TradeOrderSide.SELL.value
-            else trading_enums.PositionSide.LONG.value,
-            entry_side=side,
-            entry_price=average_entry_price,
-            entry_order_type=order_type_name,
-            stop_loss_percent=average_stop_loss_percentage,
-            order_tag_prefix=group_orders_settings.order_tag_prefix,
-            recreate_exits=False,
-        )
-
-    normalized_amount = []
-    for number in growth_deci_array:
-        normalized_amount.append(
-            total_amount * ((number / (growth_array_sum / 100)) / 100)
-        )
-    return (
-        normalized_amount,
-        entry_order_tag,
-        tp_order_tag,
-        sl_order_tag,
-        order_tag_id,
-        place_entries,
-    )
-
-
 def convert_sl_price_to_percent(
     side, entry_price: decimal.Decimal, stop_loss_price: decimal.Decimal
 ) -> decimal.Decimal:
@@ -90,6 +90,74 @@ def cut_data_to_same_len(
     return tuple(cutted_data)
 
 
+class AlignedSeries:
+    # Series of different lengths which all end on the same (newest) candle,
+    # like the data cut_data_to_same_len aligns.
+    # Each series is stored once with its start offset on the common candle axis
+    # (the absolute bar number of its first value), aligned views are slices
+    # so nothing gets cut or reshuffled multiple times.
+    def __init__(self, axis_length: int):
+        self.axis_length: int = axis_length
+        self.series_by_names: typing.Dict[str, typing.Union[list, npt.NDArray]] = {}
+        self.start_offsets_by_names: typing.Dict[str, int] = {}
+
+    def add(self, name: str, series: typing.Union[list, npt.NDArray]) -> None:
+        if len(series) > self.axis_length:
+            # values before the first candle of the axis
+            series = series[len(series) - self.axis_length :]
+        self.series_by_names[name] = series
+        self.start_offsets_by_names[name] = self.axis_length - len(series)
+
+    def add_many(
+        self, series_by_names: typing.Dict[str, typing.Union[list, npt.NDArray]]
+    ) -> None:
+        for name, series in series_by_names.items():
+            self.add(name, series)
+
+    def get_start_offset(self, *names: str) -> int:
+        # first bar where all (or the given) series have a value
+        return max(
+            self.start_offsets_by_names[name]
+            for name in (names or self.start_offsets_by_names)
+        )
+
+    def get(
+        self, name: str, start_offset: typing.Optional[int] = None
+    ) -> typing.Union[list, npt.NDArray]:
+        # values from the start_offset bar, aligned with all series by default
+        if start_offset is None:
+            start_offset = self.get_start_offset()
+        start_index: int = start_offset - self.start_offsets_by_names[name]
+        if start_index < 0:
+            raise ValueError(f"{name} has no values before bar {start_offset}")
+        return self.series_by_names[name][start_index:]
+
+    def get_many(
+        self, *names: str, start_offset: typing.Optional[int] = None
+    ) -> tuple:
+        # aligned with each other if no start_offset is given
+        if start_offset is None:
+            start_offset = self.get_start_offset(*names)
+        return tuple(self.get(name, start_offset) for name in names)
+
+    def value_at(self, name: str, bar_index: int):
+        # value of the absolute bar number
+        return self.series_by_names[name][
+            bar_index - self.start_offsets_by_names[name]
+        ]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.series_by_names
+
+    def copy(self) -> "AlignedSeries":
+        # series can then be added without changing this one,
+        # the series themselves are shared
+        aligned_series: AlignedSeries = AlignedSeries(self.axis_length)
+        aligned_series.series_by_names = dict(self.series_by_names)
+        aligned_series.start_offsets_by_names = dict(self.start_offsets_by_names)
+        return aligned_series
+
+
 def shift_data(data_source: typing.Union[list, npt.NDArray[any]], shift_by: int = 1):
     cutted_data = data_source[shift_by:]
     shifted_data = data_source[:-shift_by]
@@ -18,31 +18,33 @@
 # or you want your own custom solution,
 # please contact me at max@a42.ch
 
-import statistics as statistics
+import typing
+import numpy
+import numpy.typing as npt
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.data.public_exchange_data as public_exchange_data
 from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums import (
     PriceDataSources,
 )
 import tentacles.Meta.Keywords.scripting_library.data.writing.plotting as plotting
 
+# Every entry is analyzed at once for every take profit:
+# the take profit hit is the first candle crossing the take profit target
+# and the required stop loss is the max adverse excursion until then.
+# Both are answered by sparse tables (range min / max in O(1)),
+# the first crossing is found by jumping over blocks that don't cross it.
+
 
 async def stop_loss_analysis(
-    maker, ctx, requested_long_sl, requested_short_sl, take_profit_in_p
-):
-    required_long_stops = []
-    required_short_stops = []
+    maker,
+    ctx,
+    requested_long_sl: typing.List[float],
+    requested_short_sl: typing.List[float],
+    take_profits_in_p: typing.List[float],
+) -> typing.Dict[float, typing.Dict[str, typing.Dict[float, float]]]:
+    # returns {take profit %: {"long_win_rates": {stop loss %: win rate %},
+    #   "short_win_rates": {...}}}
     final_long_whitelist = []
     final_short_whitelist = []
-
-    lows = None
-    highs = None
-    opens = None
-    times = None
-    data_len = None
-
-    long_win_rates = {}
-    short_win_rates = {}
-    cache_key = str(take_profit_in_p)
     if maker.strategy_cache:
         for timestamp in maker.strategy_cache:
             for strategy_id in maker.strategy_cache[timestamp]:
@@ -55,203 +57,212 @@ async def stop_loss_analysis(
                     final_long_whitelist.append(timestamp)
                 else:
                     final_short_whitelist.append(timestamp)
-        if final_long_whitelist:
-            lows = await public_exchange_data.get_candles_(
-                maker, PriceDataSources.LOW.value
-            )
-            highs = await public_exchange_data.get_candles_(
-                maker, PriceDataSources.HIGH.value
-            )
-            opens = await public_exchange_data.get_candles_(
-                maker, PriceDataSources.OPEN.value
-            )
-            times = await public_exchange_data.get_candles_(
-                maker, PriceDataSources.TIME.value
-            )
-            data_len = len(times)
-            tmp_long_whitelist = final_long_whitelist
-            tmp_long_whitelist.sort()
-            for candle_id in range(1, data_len + 1):
-                try:
-                    candle_time = times[candle_id]
-                    if candle_time == tmp_long_whitelist[0]:
-                        tmp_long_whitelist = tmp_long_whitelist[1:]
-                        entry_price = opens[candle_id]
-
-                        take_profit_target = entry_price * (
-                            1 + (take_profit_in_p / 100)
-                        )
-                        for in_trade_candle_id in range(candle_id, data_len + 1):
-                            try:
-                                if highs[in_trade_candle_id] > take_profit_target:
-                                    stop_loss_value = (
-                                        (
-                                            min(
-                                                lows[candle_id : in_trade_candle_id + 1]
-                                            )
-                                            / entry_price
-                                        )
-                                        - 1
-                                    ) * 100
-                                    check_and_add_wins(
-                                        long_win_rates,
-                                        stop_loss_value,
-                                        requested_long_sl,
-                                    )
-                                    required_long_stops.append(stop_loss_value)
-                                    break
-                            except IndexError:
-                                stop_loss_value = (
-                                    (min(lows[candle_id:]) / entry_price) - 1
-                                ) * 100
-                                check_and_add_wins(
-                                    long_win_rates, stop_loss_value, requested_long_sl
-                                )
-                                required_long_stops.append(stop_loss_value)
-                                break
-                except IndexError:
-                    break
-            await ctx.set_cached_values(
-                required_long_stops,
-                value_key="l-sl" + cache_key,
-                cache_keys=final_long_whitelist,
+    all_win_rates = {
+        take_profit_in_p: {"long_win_rates": {}, "short_win_rates": {}}
+        for take_profit_in_p in take_profits_in_p
+    }
+    if final_long_whitelist or final_short_whitelist:
+        times: npt.NDArray[numpy.float64] = numpy.asarray(
+            await public_exchange_data.get_candles_(maker, PriceDataSources.TIME.value)
+        )
+        opens: npt.NDArray[numpy.float64] = numpy.asarray(
+            await public_exchange_data.get_candles_(maker, PriceDataSources.OPEN.value)
+        )
+        highs: npt.NDArray[numpy.float64] = numpy.asarray(
+            await public_exchange_data.get_candles_(maker, PriceDataSources.HIGH.value)
+        )
+        lows: npt.NDArray[numpy.float64] = numpy.asarray(
+            await public_exchange_data.get_candles_(maker, PriceDataSources.LOW.value)
+        )
+        highest_highs: typing.List[npt.NDArray[numpy.float64]] = get_sparse_table(
+            highs, numpy.maximum
+        )
+        lowest_lows: typing.List[npt.NDArray[numpy.float64]] = get_sparse_table(
+            lows, numpy.minimum
+        )
+        for whitelist, requested_sl, long in (
+            (final_long_whitelist, requested_long_sl, True),
+            (final_short_whitelist, requested_short_sl, False),
+        ):
+            if not whitelist:
+                continue
+            entry_indexes: npt.NDArray[numpy.int64] = get_entry_indexes(
+                times, whitelist
             )
-            median_sl = [statistics.median(required_long_stops)] * data_len
-            await ctx.set_cached_values(
-                median_sl, value_key="ml-sl" + cache_key, cache_keys=times
+            if not len(entry_indexes):
+                continue
+            # (take profits, entries)
+            required_stops: npt.NDArray[numpy.float64] = get_required_stop_losses(
+                entry_indexes,
+                opens,
+                highest_highs,
+                lowest_lows,
+                take_profits_in_p,
+                long=long,
             )
+            side_key: str = "l" if long else "s"
+            for take_profit_in_p, take_profit_required_stops in zip(
+                take_profits_in_p, required_stops
+            ):
+                cache_key = str(take_profit_in_p)
+                await ctx.set_cached_values(
+                    take_profit_required_stops.tolist(),
+                    value_key=f"{side_key}-sl{cache_key}",
+                    cache_keys=times[entry_indexes].tolist(),
+                )
+                await ctx.set_cached_values(
+                    [float(numpy.median(take_profit_required_stops))] * len(times),
+                    value_key=f"m{side_key}-sl{cache_key}",
+                    cache_keys=times.tolist(),
+                )
+                all_win_rates[take_profit_in_p][
+                    "long_win_rates" if long else "short_win_rates"
+                ] = get_win_rates(take_profit_required_stops, requested_sl)
 
-        if final_short_whitelist:
-            lows = lows or await public_exchange_data.get_candles_(
-                maker, PriceDataSources.LOW.value
-            )
-            highs = highs or await public_exchange_data.get_candles_(
-                maker, PriceDataSources.HIGH.value
-            )
-            opens = opens or await public_exchange_data.get_candles_(
-                maker, PriceDataSources.OPEN.value
-            )
-            times = times or await public_exchange_data.get_candles_(
-                maker, PriceDataSources.TIME.value
-            )
-            data_len = data_len or len(times)
+    for take_profit_in_p in take_profits_in_p:
+        cache_key = str(take_profit_in_p)
+        await plotting.plot(
+            ctx,
+            "required short SL in percent",
+            cache_value="s-sl" + cache_key,
+            chart="sub-chart",
+            mode="markers",
+        )
+        await plotting.plot(
+            ctx,
+            "required long SL in percent",
+            cache_value="l-sl" + cache_key,
+            chart="sub-chart",
+            mode="markers",
+        )
+        await plotting.plot(
+            ctx,
+            "median long SL in percent",
+            cache_value="ml-sl" + cache_key,
+            chart="sub-chart",
+        )
+        await plotting.plot(
+            ctx,
+            "median short SL in percent",
+            cache_value="ms-sl" + cache_key,
+            chart="sub-chart",
+        )
+    return all_win_rates
 
-            tmp_short_whitelist = final_short_whitelist
-            tmp_short_whitelist.sort()
 
-            for candle_id in range(1, data_len + 1):
-                try:
-                    candle_time = times[candle_id]
-                    if candle_time == tmp_short_whitelist[0]:
-                        tmp_short_whitelist = tmp_short_whitelist[1:]
-                        entry_price = opens[candle_id]
-                        take_profit_target = entry_price * (
-                            1 - (take_profit_in_p / 100)
-                        )
+def get_entry_indexes(
+    times: npt.NDArray[numpy.float64], entry_times: typing.List[float]
+) -> npt.NDArray[numpy.int64]:
+    # candle indexes of the entry times found in times, sorted and unique
+    entry_times: npt.NDArray[numpy.float64] = numpy.unique(entry_times)
+    entry_indexes: npt.NDArray[numpy.int64] = numpy.searchsorted(times, entry_times)
+    found_entries = entry_indexes < len(times)
+    found_entries[found_entries] = (
+        times[entry_indexes[found_entries]] == entry_times[found_entries]
+    )
+    return entry_indexes[found_entries]
 
-                        for in_trade_candle_id in range(candle_id, data_len + 1):
-                            try:
-                                if lows[in_trade_candle_id] < take_profit_target:
-                                    stop_loss_value = (
-                                        (
-                                            max(
-                                                highs[
-                                                    candle_id : in_trade_candle_id + 1
-                                                ]
-                                            )
-                                            / entry_price
-                                        )
-                                        + 1
-                                    ) * 100
-                                    check_and_add_wins(
-                                        short_win_rates,
-                                        stop_loss_value,
-                                        requested_short_sl,
-                                        long=False,
-                                    )
-                                    required_short_stops.append(stop_loss_value)
-                                    required_short_stops.append(stop_loss_value)
-                                    break
-                            except IndexError:
-                                stop_loss_value = (
-                                    (max(highs[candle_id:]) / entry_price) + 1
-                                ) * 100
-                                check_and_add_wins(
-                                    short_win_rates,
-                                    stop_loss_value,
-                                    requested_short_sl,
-                                    long=False,
-                                )
-                                required_short_stops.append(stop_loss_value)
-                                break
-                except IndexError:
-                    break
 
-            await ctx.set_cached_values(
-                required_short_stops,
-                value_key="s-sl" + cache_key,
-                cache_keys=final_short_whitelist,
-            )
-            median_sl = [statistics.median(required_short_stops)] * data_len
-            await ctx.set_cached_values(
-                median_sl, value_key="ms-sl" + cache_key, cache_keys=times
-            )
+def get_sparse_table(
+    values: npt.NDArray[numpy.float64], reduce: numpy.ufunc
+) -> typing.List[npt.NDArray[numpy.float64]]:
+    # table[level][index] = reduce(values[index : index + 2 ** level])
+    table: typing.List[npt.NDArray[numpy.float64]] = [
+        numpy.asarray(values, dtype=numpy.float64)
+    ]
+    block_size: int = 1
+    while block_size * 2 <= len(values):
+        table.append(reduce(table[-1][:-block_size], table[-1][block_size:]))
+        block_size *= 2
+    return table
 
-    compute_winrates(required_short_stops, short_win_rates)
-    compute_winrates(required_long_stops, long_win_rates)
 
-    await plotting.plot(
-        ctx,
-        "required short SL in percent",
-        cache_value="s-sl" + cache_key,
-        chart="sub-chart",
-        mode="markers",
-    )
-    await plotting.plot(
-        ctx,
-        "required long SL in percent",
-        cache_value="l-sl" + cache_key,
-        chart="sub-chart",
-        mode="markers",
-    )
-    await plotting.plot(
-        ctx,
-        "median long SL in percent",
-        cache_value="ml-sl" + cache_key,
-        chart="sub-chart",
-    )
-    await plotting.plot(
-        ctx,
-        "median short SL in percent",
-        cache_value="ms-sl" + cache_key,
-        chart="sub-chart",
+def query_sparse_table(
+    table: typing.List[npt.NDArray[numpy.float64]],
+    reduce: numpy.ufunc,
+    starts: npt.NDArray[numpy.int64],
+    ends: npt.NDArray[numpy.int64],
+) -> npt.NDArray[numpy.float64]:
+    # reduce(values[start : end + 1]) of each range, from two overlapping blocks
+    levels: npt.NDArray[numpy.int64] = numpy.log2(ends - starts + 1).astype(
+        numpy.int64
     )
+    result: npt.NDArray[numpy.float64] = numpy.empty(starts.shape)
+    for level in numpy.unique(levels):
+        in_level = levels == level
+        result[in_level] = reduce(
+            table[level][starts[in_level]],
+            table[level][ends[in_level] - 2**level + 1],
+        )
+    return result
 
-    return long_win_rates, short_win_rates
 
+def get_first_crossings(
+    table: typing.List[npt.NDArray[numpy.float64]],
+    starts: npt.NDArray[numpy.int64],
+    targets: npt.NDArray[numpy.float64],
+    is_crossing: numpy.ufunc,
+) -> npt.NDArray[numpy.int64]:
+    # first index from start where is_crossing(value, target),
+    # len(values) when never crossed
+    # table is the max table to cross above and the min table to cross below
+    values_count: int = len(table[0])
+    positions: npt.NDArray[numpy.int64] = starts.copy()
+    for level in range(len(table) - 1, -1, -1):
+        # skip the next 2 ** level values when none of them is crossing
+        can_jump = positions <= values_count - 2**level
+        can_jump[can_jump] = ~is_crossing(
+            table[level][positions[can_jump]], targets[can_jump]
+        )
+        positions[can_jump] += 2**level
+    return positions
 
-def check_and_add_wins(win_rates, stop_loss_value, requested_sl, long=True):
-    for sl_percent in requested_sl:
-        current_wins = win_rates.get(sl_percent, 0)
-        if long:
-            win_rates[sl_percent] = (
-                current_wins + 1
-                if sl_percent >= (stop_loss_value * -1)
-                else current_wins
-            )
-        else:
-            win_rates[sl_percent] = (
-                current_wins + 1
-                if (sl_percent <= (stop_loss_value * -1))
-                else current_wins
-            )
 
+def get_required_stop_losses(
+    entry_indexes: npt.NDArray[numpy.int64],
+    opens: npt.NDArray[numpy.float64],
+    highest_highs: typing.List[npt.NDArray[numpy.float64]],
+    lowest_lows: typing.List[npt.NDArray[numpy.float64]],
+    take_profits_in_p: typing.List[float],
+    long: bool = True,
+) -> npt.NDArray[numpy.float64]:
+    # max adverse excursion in % (negative for longs) from the entry open
+    # until the take profit is hit, or until the last candle if it never is
+    # returns a (take profits, entries) array
+    entry_prices: npt.NDArray[numpy.float64] = opens[entry_indexes]
+    take_profits: npt.NDArray[numpy.float64] = (
+        numpy.asarray(take_profits_in_p, dtype=numpy.float64)[:, numpy.newaxis] / 100
+    )
+    targets: npt.NDArray[numpy.float64] = entry_prices * (
+        1 + take_profits if long else 1 - take_profits
+    )
+    starts: npt.NDArray[numpy.int64] = numpy.broadcast_to(
+        entry_indexes, targets.shape
+    ).ravel()
+    take_profit_indexes: npt.NDArray[numpy.int64] = get_first_crossings(
+        highest_highs if long else lowest_lows,
+        starts,
+        targets.ravel(),
+        numpy.greater if long else numpy.less,
+    )
+    excursion_prices: npt.NDArray[numpy.float64] = query_sparse_table(
+        lowest_lows if long else highest_highs,
+        numpy.minimum if long else numpy.maximum,
+        starts,
+        numpy.minimum(take_profit_indexes, len(opens) - 1),
+    ).reshape(targets.shape)
+    return (excursion_prices / entry_prices - 1) * 100
 
-def compute_winrates(required_stops, win_rates):
-    for target_percent in win_rates:
-        win_rates[target_percent] = win_rates[target_percent] / (
-            len(required_stops) / 100
-        )
+
+def get_win_rates(
+    required_stops: npt.NDArray[numpy.float64], requested_sl: typing.List[float]
+) -> typing.Dict[float, float]:
+    # % of the entries reaching their take profit before a requested_sl % stop
+    required_stops_sizes: npt.NDArray[numpy.float64] = numpy.abs(required_stops)
+    return {
+        sl_percent: float(numpy.mean(required_stops_sizes <= sl_percent) * 100)
+        for sl_percent in requested_sl
+    }
 
 
 # async def take_profit_analysis(ctx, final_long_whitelist, final_short_whitelist):
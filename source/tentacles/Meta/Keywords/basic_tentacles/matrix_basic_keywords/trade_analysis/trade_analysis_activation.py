@@ -29,17 +29,10 @@ async def handle_trade_analysis_for_current_candle(ctx, parent_input: str):
 
 
 async def handle_trade_analysis_for_backtesting_first_candle(ctx, maker):
-    all_winrates = {}
-    for tp_target in maker.trade_analysis_mode_settings["requested_long_tp"]:
-        long_win_rates, short_win_rates = await trade_analysis.stop_loss_analysis(
-            maker,
-            ctx,
-            requested_long_sl=maker.trade_analysis_mode_settings["requested_long_sl"],
-            requested_short_sl=maker.trade_analysis_mode_settings["requested_short_sl"],
-            take_profit_in_p=tp_target,
-        )
-        all_winrates[tp_target] = {
-            "long_win_rates": long_win_rates,
-            "short_win_rates": short_win_rates,
-        }
-    return all_winrates
+    return await trade_analysis.stop_loss_analysis(
+        maker,
+        ctx,
+        requested_long_sl=maker.trade_analysis_mode_settings["requested_long_sl"],
+        requested_short_sl=maker.trade_analysis_mode_settings["requested_short_sl"],
+        take_profits_in_p=maker.trade_analysis_mode_settings["requested_long_tp"],
+    )
@@ -104,6 +104,8 @@
 #     as the number of nearest neighbors used for comparison increases.
 
 
+import functools
+import time
 import typing
 import numpy
 import numpy.typing as npt
@@ -111,24 +113,78 @@ import tulipy
 
 import octobot_commons.enums as enums
 import octobot_trading.modes.script_keywords.context_management as context_management
-import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
 import tentacles.Meta.Keywords.scripting_library.data.writing.plotting as plotting
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.classification_functions.classification_utils as classification_utils
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.classification_functions.downsampling as downsampling
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.classification_functions.exact_knn as exact_knn
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.classification_functions.quantization as quantization
 
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.kernel_functions.kernel as kernel
 import tentacles.Trading.Mode.lorentzian_classification.trade_execution as trade_execution
+import tentacles.Trading.Mode.lorentzian_classification.classification_worker as classification_worker
+import tentacles.Trading.Mode.lorentzian_classification.signal_bus as signal_bus
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.utils as utils
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.streaming_indicators as streaming_indicators
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.ml_extensions_2.ml_extensions as ml_extensions
 
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.tools.utilities as basic_utilities
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums as matrix_enums
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.data.public_exchange_data as public_exchange_data
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.plottings.plots as matrix_plots
 import tentacles.Meta.Keywords.basic_tentacles.basic_modes.mode_base.abstract_producer_base as abstract_producer_base
 import tentacles.Meta.Keywords.basic_tentacles.basic_modes.mode_base.producer_base as producer_base
 
-try:
-    from tentacles.Evaluator.Util.candles_util import CandlesUtil
-except (ModuleNotFoundError, ImportError) as error:
-    raise RuntimeError("CandlesUtil tentacle is required to use HLC3") from error
+
+class ClassifiedCandles:
+    # results of the classification of a candle history
+    def __init__(
+        self,
+        s_time: float,
+        aligned_series: basic_utilities.AlignedSeries,
+        start_offset: int,
+        feature_arrays: utils.FeatureArrays,
+        candle_times: npt.NDArray[numpy.float64],
+        historical_predictions: list,
+        previous_signals: list,
+        start_long_trades: list,
+        start_short_trades: list,
+        exit_short_trades: list,
+        exit_long_trades: list,
+        is_buy_signals: list,
+        is_sell_signals: list,
+    ):
+        self.s_time: float = s_time
+        self.aligned_series: basic_utilities.AlignedSeries = aligned_series
+        self.start_offset: int = start_offset
+        self.feature_arrays: utils.FeatureArrays = feature_arrays
+        self.candle_times: npt.NDArray[numpy.float64] = candle_times
+        self.historical_predictions: list = historical_predictions
+        self.previous_signals: list = previous_signals
+        self.start_long_trades: list = start_long_trades
+        self.start_short_trades: list = start_short_trades
+        self.exit_short_trades: list = exit_short_trades
+        self.exit_long_trades: list = exit_long_trades
+        self.is_buy_signals: list = is_buy_signals
+        self.is_sell_signals: list = is_sell_signals
+
+
+class ClassificationSettingsSnapshot:
+    # settings of one classification, taken on the event loop as
+    # reloading the user inputs replaces the trading mode settings meanwhile
+    def __init__(self, trading_mode):
+        self.symbol: str = trading_mode.symbol
+        self.order_settings: utils.LorentzianOrderSettings = (
+            trading_mode.order_settings
+        )
+        self.classification_settings: utils.ClassificationSettings = (
+            trading_mode.classification_settings
+        )
+        self.feature_engineering_settings: utils.FeatureEngineeringSettings = (
+            trading_mode.feature_engineering_settings
+        )
+        self.filter_settings: utils.FilterSettings = trading_mode.filter_settings
+        self.kernel_settings: utils.KernelSettings = trading_mode.kernel_settings
+        self.display_settings: utils.DisplaySettings = trading_mode.display_settings
 
 
 class LorentzianClassificationScript(
@@ -143,8 +199,45 @@ class LorentzianClassificationScript(
         producer_base.MatrixProducerBase.__init__(
             self, channel, config, trading_mode, exchange_manager
         )
-        self.start_long_trades_cache: dict = {}
-        self.start_short_trades_cache: dict = {}
+        self.backtesting_actions_by_time_frames: typing.Dict[
+            str, typing.Dict[int, int]
+        ] = {}
+
+    async def call_script(
+        self,
+        matrix_id: str,
+        cryptocurrency: str,
+        symbol: str,
+        time_frame: str,
+        trigger_source: str,
+        trigger_cache_timestamp: float,
+        candle: dict = None,
+        kline: dict = None,
+        init_call: bool = False,
+        action: typing.Optional[str] = None,
+        action_data: typing.Optional[dict] = None,
+    ):
+        if (
+            action == matrix_enums.TradingModeCommands.OHLC_CALLBACK
+            and self.exchange_manager.is_backtesting
+            and not getattr(self.trading_mode, "TRADING_SCRIPT_MODULE", None)
+            and self.is_idle_backtesting_candle(time_frame, trigger_cache_timestamp)
+        ):
+            # jump to the next signal candle without building a context
+            return
+        await super().call_script(
+            matrix_id=matrix_id,
+            cryptocurrency=cryptocurrency,
+            symbol=symbol,
+            time_frame=time_frame,
+            trigger_source=trigger_source,
+            trigger_cache_timestamp=trigger_cache_timestamp,
+            candle=candle,
+            kline=kline,
+            init_call=init_call,
+            action=action,
+            action_data=action_data,
+        )
 
     async def evaluate_lorentzian_classification(
         self,
@@ -160,6 +253,8 @@ class LorentzianClassificationScript(
         )
         if not this_symbol_settings.trade_on_this_pair:
             return
+        if not ctx.exchange_manager.is_backtesting:
+            await self.trail_managed_stop_losses()
 
         if await self._trade_cached_backtesting_candles_if_available(ctx):
             return
@@ -167,21 +262,230 @@ class LorentzianClassificationScript(
             f" Lorentzian Classification {self.trading_mode.symbol} -"
         )
         data_source_symbol: str = this_symbol_settings.get_data_source_symbol_name()
-        (
-            candle_closes,
-            candle_highs,
-            candle_lows,
-            candles_hlc3,
-            candles_ohlc4,
-            user_selected_candles,
-            candle_times,
-        ) = await self._get_candle_data(
+        classification_key: tuple = (
+            data_source_symbol,
+            ctx.time_frame,
+            self._get_classification_settings_hash(),
+        )
+        classified_candles: typing.Optional[
+            ClassifiedCandles
+        ] = await signal_bus.get_signal_bus().get_classified_candles(
+            self.exchange_manager,
+            classification_key,
+            ctx.trigger_cache_timestamp,
+            functools.partial(
+                self._get_classified_candles,
+                ctx,
+                s_time,
+                data_source_symbol,
+                classification_key,
+            ),
+        )
+        if classified_candles is None:
+            # a newer candle is already waiting to be classified
+            return
+        if ctx.exchange_manager.is_backtesting:
+            self._cache_backtesting_signals(
+                symbol=self.trading_mode.symbol,
+                ctx=ctx,
+                s_time=classified_candles.s_time,
+                candle_times=classified_candles.candle_times,
+                start_short_trades=classified_candles.start_short_trades,
+                start_long_trades=classified_candles.start_long_trades,
+                exit_short_trades=classified_candles.exit_short_trades,
+                exit_long_trades=classified_candles.exit_long_trades,
+            )
+        else:
+            basic_utilities.end_measure_time(
+                classified_candles.s_time,
+                f" Lorentzian Classification {self.trading_mode.symbol} -"
+                " classifying candles",
+            )
+            await self.trade_live_candle(
+                ctx=ctx,
+                order_settings=self.trading_mode.order_settings,
+                symbol=self.trading_mode.symbol,
+                start_short_trades=classified_candles.start_short_trades,
+                start_long_trades=classified_candles.start_long_trades,
+                exit_short_trades=classified_candles.exit_short_trades,
+                exit_long_trades=classified_candles.exit_long_trades,
+            )
+        s_time = basic_utilities.start_measure_time()
+        await self._handle_plottings(
+            ctx=ctx,
+            this_symbol_settings=this_symbol_settings,
+            aligned_series=classified_candles.aligned_series,
+            start_offset=classified_candles.start_offset,
+            feature_arrays=classified_candles.feature_arrays,
+            historical_predictions=classified_candles.historical_predictions,
+            start_long_trades=classified_candles.start_long_trades,
+            start_short_trades=classified_candles.start_short_trades,
+            exit_short_trades=classified_candles.exit_short_trades,
+            exit_long_trades=classified_candles.exit_long_trades,
+            previous_signals=classified_candles.previous_signals,
+            is_buy_signals=classified_candles.is_buy_signals,
+            is_sell_signals=classified_candles.is_sell_signals,
+        )
+        basic_utilities.end_measure_time(
+            s_time,
+            f" Lorentzian Classification {self.trading_mode.symbol} - storing plots",
+        )
+
+    async def _get_classified_candles(
+        self,
+        ctx: context_management.Context,
+        s_time: float,
+        data_source_symbol: str,
+        classification_key: tuple,
+    ) -> typing.Optional[ClassifiedCandles]:
+        settings: ClassificationSettingsSnapshot = ClassificationSettingsSnapshot(
+            self.trading_mode
+        )
+        live_tail_length: int = self._get_live_tail_length(ctx, settings)
+        is_comparing_live_tail_window: bool = (
+            live_tail_length > 0
+            and settings.classification_settings.compare_live_tail_window
+        )
+        candle_data: tuple = await self._get_candle_data(
             ctx,
             candle_source_name=self.trading_mode.data_source_settings.source,
             data_source_symbol=data_source_symbol,
+            # the whole history is only required as comparison reference
+            limit=-1
+            if is_comparing_live_tail_window
+            else self._get_live_history_length(settings, live_tail_length),
         )
+        streamed_indicators: typing.Optional[
+            streaming_indicators.StreamingIndicators
+        ] = None
+        if (
+            not ctx.exchange_manager.is_backtesting
+            and settings.classification_settings.use_streaming_indicators
+        ):
+            # live candles only get fed to the indicators once
+            streamed_indicators = streaming_indicators.get_streaming_indicators(
+                self.exchange_manager,
+                classification_key,
+                first_candle_time=float(candle_data[-1][0]),
+                feature_engineering_settings=settings.feature_engineering_settings,
+                filter_settings=settings.filter_settings,
+                kernel_settings=settings.kernel_settings,
+            )
+        classify_function: typing.Callable = (
+            self._classify_and_compare_live_tail_window
+            if is_comparing_live_tail_window
+            else self._classify_candles
+        )
+        if ctx.exchange_manager.is_backtesting or not (
+            settings.classification_settings.classifier_mode
+            == utils.ClassifierModes.EXACT_NEAREST_NEIGHBORS
+            and settings.classification_settings.exact_knn_backend
+            == utils.ExactKnnBackends.BRUTE_FORCE
+        ):
+            # the approximate nearest neighbors and vantage point tree loops are
+            # pure python and would hold the GIL in a thread as well
+            return classify_function(
+                s_time, settings, streamed_indicators, live_tail_length, *candle_data
+            )
+        # vectorized exact nearest neighbors distances are numpy operations
+        # releasing the GIL, the candle manager keeps updating its arrays
+        # on the event loop, hand off copies to the classification thread
+        candle_data = tuple(numpy.array(candles) for candles in candle_data)
+        # None when a newer candle is already waiting to be classified
+        return await classification_worker.get_classification_worker().classify(
+            (
+                self.exchange_manager.exchange_name,
+                data_source_symbol,
+                ctx.time_frame,
+            ),
+            float(candle_data[-1][-1]),
+            ctx.time_frame,
+            classify_function,
+            s_time,
+            settings,
+            streamed_indicators,
+            live_tail_length,
+            *candle_data,
+        )
+
+    def _get_classification_settings_hash(self) -> str:
+        # pairs with the same settings hash and data source share their signals
+        return signal_bus.get_settings_hash(
+            self.trading_mode.data_source_settings.source,
+            self.trading_mode.order_settings.exit_type,
+            self.trading_mode.display_settings.is_plot_recording_mode,
+            self.trading_mode.classification_settings,
+            self.trading_mode.feature_engineering_settings,
+            self.trading_mode.filter_settings,
+            self.trading_mode.kernel_settings,
+        )
+
+    def _classify_candles(
+        self,
+        s_time: float,
+        settings: ClassificationSettingsSnapshot,
+        streamed_indicators: typing.Optional[streaming_indicators.StreamingIndicators],
+        live_tail_length: int,
+        candle_closes: npt.NDArray[numpy.float64],
+        candle_highs: npt.NDArray[numpy.float64],
+        candle_lows: npt.NDArray[numpy.float64],
+        candles_hlc3: npt.NDArray[numpy.float64],
+        candles_ohlc4: npt.NDArray[numpy.float64],
+        user_selected_candles: npt.NDArray[numpy.float64],
+        candle_times: npt.NDArray[numpy.float64],
+    ) -> ClassifiedCandles:
+        # cpu bound part of the evaluation, only reads the settings snapshot
+        # and doesn't touch the event loop so it can run in the classification
+        # worker thread
+        live_history_length: int = self._get_live_history_length(
+            settings, live_tail_length
+        )
+        # features and filters only get their warm up before the live tail
+        history_start_index: int = (
+            len(candle_highs) - live_history_length
+            if 0 < live_history_length < len(candle_highs)
+            else 0
+        )
+        if history_start_index:
+            (
+                candle_closes,
+                candle_highs,
+                candle_lows,
+                candles_hlc3,
+                candles_ohlc4,
+                user_selected_candles,
+                candle_times,
+            ) = (
+                candles[history_start_index:]
+                for candles in (
+                    candle_closes,
+                    candle_highs,
+                    candle_lows,
+                    candles_hlc3,
+                    candles_ohlc4,
+                    user_selected_candles,
+                    candle_times,
+                )
+            )
         data_length: int = len(candle_highs)
+        # the kernel and the training labels are only computed on the live tail
+        tail_start_index: int = (
+            data_length - live_tail_length if 0 < live_tail_length < data_length else 0
+        )
+        indicators_s_time: float = time.time()
+        if streamed_indicators is not None:
+            streamed_indicators.update(
+                candle_closes,
+                candle_highs,
+                candle_lows,
+                candles_hlc3,
+                candles_ohlc4,
+                user_selected_candles,
+                candle_times,
+            )
         _filters: utils.Filter = self._get_all_filters(
+            settings,
+            streamed_indicators,
             candle_closes,
             data_length,
             candles_ohlc4,
@@ -189,109 +493,113 @@ class LorentzianClassificationScript(
             candle_lows,
             user_selected_candles,
         )
-        (
-            alerts_bullish,
-            alerts_bearish,
-            is_bullishs,
-            is_bearishs,
-            is_bearish_changes,
-            is_bullish_changes,
-            is_bullish_cross_alerts,
-            is_bearish_cross_alerts,
-            kernel_estimate,
-            yhat2,
-            is_bearish_rates,
-            was_bullish_rates,
-            is_bullish_rates,
-            was_bearish_rates,
-        ) = kernel.get_kernel_data(
-            self.trading_mode.kernel_settings, user_selected_candles, data_length
+        kernel_data: typing.Dict[str, npt.NDArray[numpy.float64]] = dict(
+            zip(
+                kernel.KERNEL_DATA_NAMES,
+                kernel.get_kernel_data(
+                    settings.kernel_settings,
+                    user_selected_candles[tail_start_index:],
+                    data_length - tail_start_index,
+                )
+                if streamed_indicators is None
+                else streamed_indicators.get_kernel_data(
+                    data_length - tail_start_index
+                ),
+            )
         )
 
         feature_arrays: utils.FeatureArrays = self._get_feature_arrays(
+            settings,
+            streamed_indicators,
             candle_closes=candle_closes,
             candle_highs=candle_highs,
             candle_lows=candle_lows,
             candles_hlc3=candles_hlc3,
         )
+        if (
+            streamed_indicators is not None
+            and settings.classification_settings.compare_streaming_indicators
+        ):
+            self._compare_streaming_indicators(
+                settings,
+                time.time() - indicators_s_time,
+                tail_start_index,
+                _filters,
+                kernel_data,
+                feature_arrays,
+                candle_closes,
+                candle_highs,
+                candle_lows,
+                candles_hlc3,
+                candles_ohlc4,
+                user_selected_candles,
+            )
         y_train_series: npt.NDArray[
             numpy.bool_
         ] = classification_utils.get_y_train_series(
-            candle_closes,
-            candle_highs,
-            candle_lows,
-            self.trading_mode.classification_settings.training_data_settings,
+            candle_closes[tail_start_index:],
+            candle_highs[tail_start_index:],
+            candle_lows[tail_start_index:],
+            settings.classification_settings.training_data_settings,
         )
 
-        # cut all historical data to same length
+        # all historical data ends on the current candle,
+        # the aligned series knows where each one starts on the candle axis
         # for numpy and loop indizies being aligned
+        aligned_series: basic_utilities.AlignedSeries = self._get_aligned_series(
+            data_length=data_length,
+            y_train_series=y_train_series,
+            _filters=_filters,
+            candle_closes=candle_closes,
+            candle_highs=candle_highs,
+            candle_lows=candle_lows,
+            candle_times=candle_times,
+            candles_hlc3=candles_hlc3,
+            candles_ohlc4=candles_ohlc4,
+            user_selected_candles=user_selected_candles,
+            kernel_data=kernel_data,
+            feature_arrays=feature_arrays,
+        )
+        # first bar where all series are available
+        start_offset: int = (
+            self._get_live_tail_start_offset(
+                settings, aligned_series, history_start_index, tail_start_index
+            )
+            if tail_start_index
+            else aligned_series.get_start_offset()
+        )
+        cutted_data_length: int = feature_arrays.cut_data_to_same_len(
+            reference_length=aligned_series.axis_length - start_offset
+        )
         (
             y_train_series,
+            candle_times,
             _filters.filter_all,
             _filters.is_uptrend,
             _filters.is_downtrend,
-            candle_closes,
-            candle_highs,
-            candle_lows,
-            candle_times,
-            candles_hlc3,
-            user_selected_candles,
-            alerts_bullish,
-            alerts_bearish,
             is_bullishs,
             is_bearishs,
-            is_bearish_changes,
-            is_bullish_changes,
-            is_bullish_cross_alerts,
-            is_bearish_cross_alerts,
-            kernel_estimate,
-            yhat2,
-            is_bearish_rates,
-            was_bullish_rates,
-            is_bullish_rates,
-            was_bearish_rates,
-        ) = basic_utilities.cut_data_to_same_len(
-            (
-                y_train_series,
-                _filters.filter_all,
-                _filters.is_uptrend,
-                _filters.is_downtrend,
-                candle_closes,
-                candle_highs,
-                candle_lows,
-                candle_times,
-                candles_hlc3,
-                user_selected_candles,
-                alerts_bullish,
-                alerts_bearish,
-                is_bullishs,
-                is_bearishs,
-                is_bearish_changes,
-                is_bullish_changes,
-                is_bullish_cross_alerts,
-                is_bearish_cross_alerts,
-                kernel_estimate,
-                yhat2,
-                is_bearish_rates,
-                was_bullish_rates,
-                is_bullish_rates,
-                was_bearish_rates,
-            ),
-            reference_length=feature_arrays.cut_data_to_same_len(),
-        )
-
-        cutted_data_length: int = feature_arrays.cut_data_to_same_len(
-            reference_length=len(candle_closes)
+        ) = aligned_series.get_many(
+            "y_train_series",
+            "candle_times",
+            "filter_all",
+            "is_uptrend",
+            "is_downtrend",
+            "is_bullishs",
+            "is_bearishs",
+            start_offset=start_offset,
         )
         if (
             not self.exchange_manager.is_backtesting
-            and self.trading_mode.display_settings.is_plot_recording_mode
+            and settings.display_settings.is_plot_recording_mode
         ):
             max_bars_back_index: int = (
                 cutted_data_length - 200 if cutted_data_length > 200 else 0
             )
         else:
-            max_bars_back_index: int = self._get_max_bars_back_index(cutted_data_length)
+            max_bars_back_index: int = self._get_max_bars_back_index(
+                settings, cutted_data_length
+            )
 
         # =================================
         # ==== Next Bar Classification ====
@@ -314,18 +622,30 @@ class LorentzianClassificationScript(
 
         basic_utilities.end_measure_time(
             s_time,
-            f" Lorentzian Classification {self.trading_mode.symbol} - calculating full history indicators",
+            f" Lorentzian Classification {settings.symbol} - calculating full history indicators",
         )
         s_time = basic_utilities.start_measure_time(
-            f" Lorentzian Classification {self.trading_mode.symbol} - classifying candles"
+            f" Lorentzian Classification {settings.symbol} - classifying candles"
         )
+        exact_knn_predictions: typing.Optional[npt.NDArray[numpy.int64]] = None
+        if (
+            settings.classification_settings.classifier_mode
+            == utils.ClassifierModes.EXACT_NEAREST_NEIGHBORS
+        ):
+            exact_knn_predictions = self._get_exact_knn_predictions(
+                settings,
+                max_bars_back_index=max_bars_back_index,
+                cutted_data_length=cutted_data_length,
+                feature_arrays=feature_arrays,
+                y_train_series=y_train_series,
+            )
         for candle_index in range(max_bars_back_index, cutted_data_length):
             (
                 bars_since_green_entry,
                 bars_since_red_entry,
             ) = classification_utils.classify_current_candle(
-                order_settings=self.trading_mode.order_settings,
-                classification_settings=self.trading_mode.classification_settings,
+                order_settings=settings.order_settings,
+                classification_settings=settings.classification_settings,
                 y_train_series=y_train_series,
                 current_candle_index=candle_index,
                 feature_arrays=feature_arrays,
@@ -346,89 +666,211 @@ class LorentzianClassificationScript(
                 exit_long_trades=exit_long_trades,
                 is_buy_signals=is_buy_signals,
                 is_sell_signals=is_sell_signals,
+                prediction=None
+                if exact_knn_predictions is None
+                else exact_knn_predictions[candle_index - max_bars_back_index],
             )
-        if ctx.exchange_manager.is_backtesting:
-            self._cache_backtesting_signals(
-                symbol=self.trading_mode.symbol,
-                ctx=ctx,
-                s_time=s_time,
-                candle_times=candle_times,
-                start_short_trades=start_short_trades,
-                start_long_trades=start_long_trades,
-                exit_short_trades=exit_short_trades,
-                exit_long_trades=exit_long_trades,
-            )
-        else:
-            basic_utilities.end_measure_time(
-                s_time,
-                f" Lorentzian Classification {self.trading_mode.symbol} -"
-                " classifying candles",
-            )
-            await self.trade_live_candle(
-                ctx=ctx,
-                order_settings=self.trading_mode.order_settings,
-                symbol=self.trading_mode.symbol,
-                start_short_trades=start_short_trades,
-                start_long_trades=start_long_trades,
-                exit_short_trades=exit_short_trades,
-                exit_long_trades=exit_long_trades,
-            )
-        s_time = basic_utilities.start_measure_time()
-        await self._handle_plottings(
-            ctx=ctx,
-            this_symbol_settings=this_symbol_settings,
-            y_train_series=y_train_series,
-            _filters=_filters,
-            candle_closes=candle_closes,
-            candle_highs=candle_highs,
-            candle_lows=candle_lows,
-            candle_times=candle_times,
-            candles_hlc3=candles_hlc3,
-            candles_ohlc4=candles_ohlc4,
+        return ClassifiedCandles(
+            s_time=s_time,
+            aligned_series=aligned_series,
+            start_offset=start_offset,
             feature_arrays=feature_arrays,
-            alerts_bullish=alerts_bullish,
-            alerts_bearish=alerts_bearish,
-            is_bullishs=is_bullishs,
-            is_bearishs=is_bearishs,
-            is_bearish_changes=is_bearish_changes,
-            is_bullish_changes=is_bullish_changes,
-            is_bullish_cross_alerts=is_bullish_cross_alerts,
-            is_bearish_cross_alerts=is_bearish_cross_alerts,
-            kernel_estimate=kernel_estimate,
-            yhat2=yhat2,
-            is_bearish_rates=is_bearish_rates,
-            was_bullish_rates=was_bullish_rates,
-            is_bullish_rates=is_bullish_rates,
-            was_bearish_rates=was_bearish_rates,
+            candle_times=candle_times,
             historical_predictions=historical_predictions,
+            previous_signals=previous_signals,
             start_long_trades=start_long_trades,
             start_short_trades=start_short_trades,
             exit_short_trades=exit_short_trades,
             exit_long_trades=exit_long_trades,
-            previous_signals=previous_signals,
             is_buy_signals=is_buy_signals,
             is_sell_signals=is_sell_signals,
         )
-        basic_utilities.end_measure_time(
-            s_time,
-            f" Lorentzian Classification {self.trading_mode.symbol} - storing plots",
+
+    def _get_live_tail_start_offset(
+        self,
+        settings: ClassificationSettingsSnapshot,
+        aligned_series: basic_utilities.AlignedSeries,
+        history_start_index: int,
+        tail_start_index: int,
+    ) -> int:
+        # down samplers select training bars by their index from the start offset,
+        # start on a bar with the same down sampling phase as the whole history,
+        # which starts history_start_index candles before the sliced one
+        tail_series_names: typing.Tuple[str, ...] = (
+            "y_train_series",
+            *kernel.KERNEL_DATA_NAMES,
+        )
+        whole_history_start_offset: int = max(
+            start_offset - tail_start_index
+            if name in tail_series_names
+            else start_offset
+            for name, start_offset in aligned_series.start_offsets_by_names.items()
+        )
+        start_offset: int = aligned_series.get_start_offset()
+        return start_offset + (
+            whole_history_start_offset - history_start_index - start_offset
+        ) % downsampling.get_down_sampling_period(
+            settings.classification_settings.down_sampler,
+            settings.classification_settings.only_train_on_every_x_bars,
+        )
+
+    def _classify_and_compare_live_tail_window(
+        self,
+        s_time: float,
+        settings: ClassificationSettingsSnapshot,
+        streamed_indicators: typing.Optional[streaming_indicators.StreamingIndicators],
+        live_tail_length: int,
+        *candle_data: npt.NDArray[numpy.float64],
+    ) -> ClassifiedCandles:
+        tail_s_time: float = time.time()
+        classified_candles: ClassifiedCandles = self._classify_candles(
+            s_time, settings, streamed_indicators, live_tail_length, *candle_data
+        )
+        tail_duration: float = time.time() - tail_s_time
+        whole_history_s_time: float = time.time()
+        # reference indicators are recomputed on the whole history, the streamed
+        # ones only got the live history
+        whole_history_classified_candles: ClassifiedCandles = self._classify_candles(
+            s_time, settings, None, -1, *candle_data
+        )
+        whole_history_duration: float = time.time() - whole_history_s_time
+        report: dict = exact_knn.get_signal_agreement_report(
+            reference_predictions=whole_history_classified_candles.historical_predictions,
+            predictions=classified_candles.historical_predictions,
+            required_neighbors=settings.classification_settings.required_neighbors,
+        )
+        # the signals trade_live_candle uses
+        report["same_current_candle_signals"] = all(
+            signals[-1:] == whole_history_signals[-1:]
+            for signals, whole_history_signals in (
+                (
+                    classified_candles.start_long_trades,
+                    whole_history_classified_candles.start_long_trades,
+                ),
+                (
+                    classified_candles.start_short_trades,
+                    whole_history_classified_candles.start_short_trades,
+                ),
+                (
+                    classified_candles.exit_long_trades,
+                    whole_history_classified_candles.exit_long_trades,
+                ),
+                (
+                    classified_candles.exit_short_trades,
+                    whole_history_classified_candles.exit_short_trades,
+                ),
+            )
+        )
+        message: str = (
+            f"Live history comparison for {settings.symbol}: "
+            f"{self._get_live_history_length(settings, live_tail_length)} candles "
+            f"took {round(tail_duration, 2)}s, "
+            f"{len(candle_data[0])} candles took "
+            f"{round(whole_history_duration, 2)}s - {report}"
+        )
+        if report["same_current_candle_signals"]:
+            self.logger.info(message)
+        else:
+            self.logger.warning(message)
+        return classified_candles
+
+    def _compare_streaming_indicators(
+        self,
+        settings: ClassificationSettingsSnapshot,
+        streaming_duration: float,
+        tail_start_index: int,
+        streamed_filters: utils.Filter,
+        streamed_kernel_data: typing.Dict[str, npt.NDArray[numpy.float64]],
+        streamed_feature_arrays: utils.FeatureArrays,
+        candle_closes: npt.NDArray[numpy.float64],
+        candle_highs: npt.NDArray[numpy.float64],
+        candle_lows: npt.NDArray[numpy.float64],
+        candles_hlc3: npt.NDArray[numpy.float64],
+        candles_ohlc4: npt.NDArray[numpy.float64],
+        user_selected_candles: npt.NDArray[numpy.float64],
+    ) -> None:
+        data_length: int = len(candle_closes)
+        full_s_time: float = time.time()
+        _filters: utils.Filter = self._get_all_filters(
+            settings,
+            None,
+            candle_closes,
+            data_length,
+            candles_ohlc4,
+            candle_highs,
+            candle_lows,
+            user_selected_candles,
         )
+        kernel_data: typing.Dict[str, npt.NDArray[numpy.float64]] = dict(
+            zip(
+                kernel.KERNEL_DATA_NAMES,
+                kernel.get_kernel_data(
+                    settings.kernel_settings,
+                    user_selected_candles[tail_start_index:],
+                    data_length - tail_start_index,
+                ),
+            )
+        )
+        feature_arrays: utils.FeatureArrays = self._get_feature_arrays(
+            settings,
+            None,
+            candle_closes=candle_closes,
+            candle_highs=candle_highs,
+            candle_lows=candle_lows,
+            candles_hlc3=candles_hlc3,
+        )
+        full_duration: float = time.time() - full_s_time
+        report: dict = streaming_indicators.get_parity_report(
+            {
+                **{
+                    f"feature_{feature_id}": feature_array
+                    for feature_id, feature_array in enumerate(
+                        streamed_feature_arrays.feature_arrays
+                    )
+                },
+                **{
+                    name: getattr(streamed_filters, name)
+                    for name in utils.Filter.SERIES_NAMES
+                },
+                **streamed_kernel_data,
+            },
+            {
+                **{
+                    f"feature_{feature_id}": feature_array
+                    for feature_id, feature_array in enumerate(
+                        feature_arrays.feature_arrays
+                    )
+                },
+                **{name: getattr(_filters, name) for name in utils.Filter.SERIES_NAMES},
+                **kernel_data,
+            },
+        )
+        message: str = (
+            f"Streaming indicators comparison for {settings.symbol}: streamed "
+            f"indicators took {round(streaming_duration, 3)}s, {data_length} "
+            f"candles took {round(full_duration, 3)}s - {report}"
+        )
+        if report["is_matching"]:
+            self.logger.info(message)
+        else:
+            self.logger.warning(message)
 
     def _get_ma_filters(
-        self, candle_closes: npt.NDArray[numpy.float64], data_length: int
+        self,
+        settings: ClassificationSettingsSnapshot,
+        candle_closes: npt.NDArray[numpy.float64],
+        data_length: int,
     ) -> typing.Tuple[
         npt.NDArray[numpy.bool_],
         npt.NDArray[numpy.bool_],
         npt.NDArray[numpy.bool_],
         npt.NDArray[numpy.bool_],
     ]:
-        if self.trading_mode.filter_settings.use_ema_filter:
+        if settings.filter_settings.use_ema_filter:
             filter_ema_candles, filter_ema = basic_utilities.cut_data_to_same_len(
                 (
                     candle_closes,
-                    tulipy.ema(
-                        candle_closes, self.trading_mode.filter_settings.ema_period
-                    ),
+                    tulipy.ema(candle_closes, settings.filter_settings.ema_period),
                 )
             )
             is_ema_uptrend: npt.NDArray[numpy.bool_] = filter_ema_candles > filter_ema
@@ -436,13 +878,11 @@ class LorentzianClassificationScript(
         else:
             is_ema_uptrend: npt.NDArray[numpy.bool_] = numpy.repeat(True, data_length)
             is_ema_downtrend: npt.NDArray[numpy.bool_] = is_ema_uptrend
-        if self.trading_mode.filter_settings.use_sma_filter:
+        if settings.filter_settings.use_sma_filter:
             filter_sma_candles, filter_sma = basic_utilities.cut_data_to_same_len(
                 (
                     candle_closes,
-                    tulipy.sma(
-                        candle_closes, self.trading_mode.filter_settings.sma_period
-                    ),
+                    tulipy.sma(candle_closes, settings.filter_settings.sma_period),
                 )
             )
             is_sma_uptrend: npt.NDArray[numpy.bool_] = filter_sma_candles > filter_sma
@@ -456,29 +896,9 @@ class LorentzianClassificationScript(
         self,
         ctx: context_management.Context,
         this_symbol_settings: utils.SymbolSettings,
-        y_train_series: npt.NDArray[numpy.int64],
-        _filters: utils.Filter,
-        candle_closes: npt.NDArray[numpy.float64],
-        candle_highs: npt.NDArray[numpy.float64],
-        candle_lows: npt.NDArray[numpy.float64],
-        candle_times: npt.NDArray[numpy.float64],
-        candles_hlc3: npt.NDArray[numpy.float64],
-        candles_ohlc4: npt.NDArray[numpy.float64],
+        aligned_series: basic_utilities.AlignedSeries,
+        start_offset: int,
         feature_arrays: utils.FeatureArrays,
-        alerts_bullish: npt.NDArray[numpy.bool_],
-        alerts_bearish: npt.NDArray[numpy.bool_],
-        is_bullishs: npt.NDArray[numpy.bool_],
-        is_bearishs: npt.NDArray[numpy.bool_],
-        is_bearish_changes: npt.NDArray[numpy.bool_],
-        is_bullish_changes: npt.NDArray[numpy.bool_],
-        is_bullish_cross_alerts: npt.NDArray[numpy.bool_],
-        is_bearish_cross_alerts: npt.NDArray[numpy.bool_],
-        kernel_estimate: npt.NDArray[numpy.float64],
-        yhat2: npt.NDArray[numpy.float64],
-        is_bearish_rates: npt.NDArray[numpy.bool_],
-        was_bullish_rates: npt.NDArray[numpy.bool_],
-        is_bullish_rates: npt.NDArray[numpy.bool_],
-        was_bearish_rates: npt.NDArray[numpy.bool_],
         historical_predictions: list,
         start_long_trades: list,
         start_short_trades: list,
@@ -488,8 +908,6 @@ class LorentzianClassificationScript(
         is_buy_signals: list,
         is_sell_signals: list,
     ) -> None:
-        slightly_below_lows: npt.NDArray[numpy.float64] = candle_lows * 0.999
-        slightly_above_highs: npt.NDArray[numpy.float64] = candle_highs * 1.001
         # use_own_y_axis: bool = this_symbol_settings.use_custom_pair
         cache_key_prefix: str = "b-" if self.exchange_manager.is_backtesting else "l-"
 
@@ -497,47 +915,32 @@ class LorentzianClassificationScript(
             ctx=ctx,
             cache_key_prefix=cache_key_prefix,
             this_symbol_settings=this_symbol_settings,
-            y_train_series=y_train_series,
-            _filters=_filters,
-            candle_closes=candle_closes,
-            candle_highs=candle_highs,
-            candle_lows=candle_lows,
-            candle_times=candle_times,
-            candles_hlc3=candles_hlc3,
-            candles_ohlc4=candles_ohlc4,
+            aligned_series=aligned_series,
+            start_offset=start_offset,
             feature_arrays=feature_arrays,
-            alerts_bullish=alerts_bullish,
-            alerts_bearish=alerts_bearish,
-            is_bullishs=is_bullishs,
-            is_bearishs=is_bearishs,
-            is_bearish_changes=is_bearish_changes,
-            is_bullish_changes=is_bullish_changes,
-            is_bullish_cross_alerts=is_bullish_cross_alerts,
-            is_bearish_cross_alerts=is_bearish_cross_alerts,
-            kernel_estimate=kernel_estimate,
-            yhat2=yhat2,
-            is_bearish_rates=is_bearish_rates,
-            was_bullish_rates=was_bullish_rates,
-            is_bullish_rates=is_bullish_rates,
-            was_bearish_rates=was_bearish_rates,
-            slightly_below_lows=slightly_below_lows,
-            slightly_above_highs=slightly_above_highs,
+        )
+        # the classified candles also end on the current candle,
+        # added to a copy as the classified candles can be shared and reused
+        aligned_series = aligned_series.copy()
+        aligned_series.add_many(
+            {
+                "historical_predictions": historical_predictions,
+                "start_long_trades": start_long_trades,
+                "start_short_trades": start_short_trades,
+                "exit_short_trades": exit_short_trades,
+                "exit_long_trades": exit_long_trades,
+                "previous_signals": previous_signals,
+                "is_buy_signals": is_buy_signals,
+                "is_sell_signals": is_sell_signals,
+            }
         )
         await self._handle_short_history_plottings(
             ctx=ctx,
             cache_key_prefix=cache_key_prefix,
             use_own_y_axis=this_symbol_settings.use_custom_pair,
-            historical_predictions=historical_predictions,
-            candle_times=candle_times,
-            start_long_trades=start_long_trades,
-            start_short_trades=start_short_trades,
-            exit_short_trades=exit_short_trades,
+            aligned_series=aligned_series,
             exit_long_trades=exit_long_trades,
-            slightly_below_lows=slightly_below_lows,
-            slightly_above_highs=slightly_above_highs,
-            previous_signals=previous_signals,
-            is_buy_signals=is_buy_signals,
-            is_sell_signals=is_sell_signals,
+            has_exit_signals=bool(len(exit_short_trades) and len(exit_long_trades)),
         )
 
     async def _handle_short_history_plottings(
@@ -545,17 +948,9 @@ class LorentzianClassificationScript(
         ctx: context_management.Context,
         cache_key_prefix: str,
         use_own_y_axis: bool,
-        historical_predictions: list,
-        candle_times: npt.NDArray[numpy.float64],
-        start_long_trades: list,
-        start_short_trades: list,
-        exit_short_trades: list,
+        aligned_series: basic_utilities.AlignedSeries,
         exit_long_trades: list,
-        slightly_below_lows: npt.NDArray[numpy.float64],
-        slightly_above_highs: npt.NDArray[numpy.float64],
-        previous_signals: list,
-        is_buy_signals: list,
-        is_sell_signals: list,
+        has_exit_signals: bool,
     ) -> None:
         (
             historical_predictions,
@@ -567,18 +962,16 @@ class LorentzianClassificationScript(
             previous_signals,
             is_buy_signals,
             is_sell_signals,
-        ) = basic_utilities.cut_data_to_same_len(
-            (
-                historical_predictions,
-                candle_times,
-                start_long_trades,
-                start_short_trades,
-                slightly_below_lows,
-                slightly_above_highs,
-                previous_signals,
-                is_buy_signals,
-                is_sell_signals,
-            )
+        ) = aligned_series.get_many(
+            "historical_predictions",
+            "candle_times",
+            "start_long_trades",
+            "start_short_trades",
+            "slightly_below_lows",
+            "slightly_above_highs",
+            "previous_signals",
+            "is_buy_signals",
+            "is_sell_signals",
         )
         await matrix_plots.plot_conditional(
             ctx=ctx,
@@ -600,7 +993,6 @@ class LorentzianClassificationScript(
             value_key=f"{cache_key_prefix}st-s",
             color="red",
         )
-        has_exit_signals = len(exit_short_trades) and len(exit_long_trades)
         if has_exit_signals:
             (
                 _candle_times,
@@ -608,14 +1000,12 @@ class LorentzianClassificationScript(
                 _slightly_below_lows,
                 start_long_trades,
                 exit_short_trades,
-            ) = basic_utilities.cut_data_to_same_len(
-                (
-                    candle_times,
-                    slightly_above_highs,
-                    slightly_below_lows,
-                    start_long_trades,
-                    exit_short_trades,
-                )
+            ) = aligned_series.get_many(
+                "candle_times",
+                "slightly_above_highs",
+                "slightly_below_lows",
+                "start_long_trades",
+                "exit_short_trades",
             )
             await matrix_plots.plot_conditional(
                 ctx=ctx,
@@ -702,46 +1092,16 @@ class LorentzianClassificationScript(
         ctx: context_management.Context,
         cache_key_prefix: str,
         this_symbol_settings: utils.SymbolSettings,
-        y_train_series: npt.NDArray[numpy.int64],
-        _filters: utils.Filter,
-        candle_closes: npt.NDArray[numpy.float64],
-        candle_highs: npt.NDArray[numpy.float64],
-        candle_lows: npt.NDArray[numpy.float64],
-        candle_times: npt.NDArray[numpy.float64],
-        candles_hlc3: npt.NDArray[numpy.float64],
-        candles_ohlc4: npt.NDArray[numpy.float64],
+        aligned_series: basic_utilities.AlignedSeries,
+        start_offset: int,
         feature_arrays: utils.FeatureArrays,
-        alerts_bullish: npt.NDArray[numpy.bool_],
-        alerts_bearish: npt.NDArray[numpy.bool_],
-        is_bullishs: npt.NDArray[numpy.bool_],
-        is_bearishs: npt.NDArray[numpy.bool_],
-        is_bearish_changes: npt.NDArray[numpy.bool_],
-        is_bullish_changes: npt.NDArray[numpy.bool_],
-        is_bullish_cross_alerts: npt.NDArray[numpy.bool_],
-        is_bearish_cross_alerts: npt.NDArray[numpy.bool_],
-        kernel_estimate: npt.NDArray[numpy.float64],
-        yhat2: npt.NDArray[numpy.float64],
-        is_bearish_rates: npt.NDArray[numpy.bool_],
-        was_bullish_rates: npt.NDArray[numpy.bool_],
-        is_bullish_rates: npt.NDArray[numpy.bool_],
-        was_bearish_rates: npt.NDArray[numpy.bool_],
-        slightly_below_lows: npt.NDArray[numpy.float64],
-        slightly_above_highs: npt.NDArray[numpy.float64],
     ) -> None:
         (
             y_train_series,
-            _filters.filter_all,
-            _filters.is_uptrend,
-            _filters.is_downtrend,
-            _filters.volatility,
-            _filters.regime,
-            _filters.adx,
             candle_closes,
-            candle_highs,
-            candle_lows,
             candle_times,
-            candles_hlc3,
-            candles_ohlc4,
+            slightly_below_lows,
+            slightly_above_highs,
             alerts_bullish,
             alerts_bearish,
             is_bullishs,
@@ -756,49 +1116,35 @@ class LorentzianClassificationScript(
             was_bullish_rates,
             is_bullish_rates,
             was_bearish_rates,
-            slightly_below_lows,
-            slightly_above_highs,
-        ) = basic_utilities.cut_data_to_same_len(
-            (
-                y_train_series,
-                _filters.filter_all,
-                _filters.is_uptrend,
-                _filters.is_downtrend,
-                _filters.volatility,
-                _filters.regime,
-                _filters.adx,
-                candle_closes,
-                candle_highs,
-                candle_lows,
-                candle_times,
-                candles_hlc3,
-                candles_ohlc4,
-                alerts_bullish,
-                alerts_bearish,
-                is_bullishs,
-                is_bearishs,
-                is_bearish_changes,
-                is_bullish_changes,
-                is_bullish_cross_alerts,
-                is_bearish_cross_alerts,
-                kernel_estimate,
-                yhat2,
-                is_bearish_rates,
-                was_bullish_rates,
-                is_bullish_rates,
-                was_bearish_rates,
-                slightly_below_lows,
-                slightly_above_highs,
-            ),
-            reference_length=feature_arrays.cut_data_to_same_len(),
+        ) = aligned_series.get_many(
+            "y_train_series",
+            "candle_closes",
+            "candle_times",
+            "slightly_below_lows",
+            "slightly_above_highs",
+            *kernel.KERNEL_DATA_NAMES,
+            start_offset=start_offset,
+        )
+        (
+            filter_all,
+            is_uptrend,
+            is_downtrend,
+            volatility,
+            regime,
+            adx,
+            is_ema_uptrend,
+            is_sma_uptrend,
+            is_ema_downtrend,
+            is_sma_downtrend,
+        ) = aligned_series.get_many(
+            *utils.Filter.SERIES_NAMES, start_offset=start_offset
         )
-        feature_arrays.cut_data_to_same_len(reference_length=len(candle_closes))
         if self.trading_mode.filter_settings.plot_volatility_filter:
             await matrix_plots.plot_conditional(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="Volatility Filter",
-                signals=_filters.volatility,
+                signals=volatility,
                 values=slightly_below_lows,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}volatility",
@@ -808,7 +1154,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="Regime filter",
-                signals=_filters.regime,
+                signals=regime,
                 values=slightly_below_lows,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}regime",
@@ -818,7 +1164,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="ADX filter",
-                signals=_filters.adx,
+                signals=adx,
                 values=slightly_below_lows,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}adx",
@@ -832,7 +1178,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="both side filter",
-                signals=_filters.filter_all,
+                signals=filter_all,
                 values=slightly_below_lows,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}filter_all",
@@ -843,7 +1189,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="is_ema_uptrend",
-                signals=_filters.is_ema_uptrend,
+                signals=is_ema_uptrend,
                 values=slightly_below_lows,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}is_ema_uptrend",
@@ -853,7 +1199,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="is_sma_uptrend",
-                signals=_filters.is_sma_uptrend,
+                signals=is_sma_uptrend,
                 values=slightly_below_lows,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}is_sma_uptrend",
@@ -863,7 +1209,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="is_ema_downtrend",
-                signals=_filters.is_ema_downtrend,
+                signals=is_ema_downtrend,
                 values=slightly_above_highs,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}is_ema_downtrend",
@@ -873,7 +1219,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="is_sma_downtrend",
-                signals=_filters.is_sma_downtrend,
+                signals=is_sma_downtrend,
                 values=slightly_above_highs,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}is_sma_downtrend",
@@ -887,7 +1233,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="is uptrend",
-                signals=_filters.is_uptrend,
+                signals=is_uptrend,
                 values=slightly_below_lows,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}uptrend",
@@ -896,7 +1242,7 @@ class LorentzianClassificationScript(
                 ctx=ctx,
                 is_recording_mode=self.trading_mode.display_settings.is_plot_recording_mode,
                 title="is downtrend",
-                signals=_filters.is_downtrend,
+                signals=is_downtrend,
                 values=slightly_below_lows,
                 times=candle_times,
                 value_key=f"{cache_key_prefix}downtrend",
@@ -1082,6 +1428,8 @@ class LorentzianClassificationScript(
 
     def _get_all_filters(
         self,
+        settings: ClassificationSettingsSnapshot,
+        streamed_indicators: typing.Optional[streaming_indicators.StreamingIndicators],
         candle_closes: npt.NDArray[numpy.float64],
         data_length: int,
         candles_ohlc4: npt.NDArray[numpy.float64],
@@ -1090,38 +1438,42 @@ class LorentzianClassificationScript(
         user_selected_candles: npt.NDArray[numpy.float64],
     ) -> utils.Filter:
         # Filter object for filtering the ML predictions
+        adx: npt.NDArray[numpy.bool_] = ml_extensions.filter_adx(
+            candle_closes=user_selected_candles,
+            candle_highs=candle_highs,
+            candle_lows=candle_lows,
+            length=utils.ADX_FILTER_LENGTH,
+            adx_threshold=settings.filter_settings.adx_threshold,
+            use_adx_filter=settings.filter_settings.use_adx_filter,
+        )
+        if streamed_indicators is not None:
+            # filter_adx uses the last candles for every candle, it's not streamed
+            return utils.Filter(adx=adx, **streamed_indicators.get_filters(data_length))
         (
             is_ema_uptrend,
             is_ema_downtrend,
             is_sma_uptrend,
             is_sma_downtrend,
-        ) = self._get_ma_filters(candle_closes, data_length)
+        ) = self._get_ma_filters(settings, candle_closes, data_length)
         volatility: npt.NDArray[numpy.bool_] = ml_extensions.filter_volatility(
             candle_highs=candle_highs,
             candle_lows=candle_lows,
             candle_closes=candle_closes,
             min_length=1,
             max_length=10,
-            use_volatility_filter=self.trading_mode.filter_settings.use_volatility_filter,
+            use_volatility_filter=settings.filter_settings.use_volatility_filter,
         )
         regime: npt.NDArray[numpy.bool_] = ml_extensions.regime_filter(
             ohlc4=candles_ohlc4,
             highs=candle_highs,
             lows=candle_lows,
-            threshold=self.trading_mode.filter_settings.regime_threshold,
-            use_regime_filter=self.trading_mode.filter_settings.use_regime_filter,
+            threshold=settings.filter_settings.regime_threshold,
+            use_regime_filter=settings.filter_settings.use_regime_filter,
         )
         _filter: utils.Filter = utils.Filter(
             volatility=volatility,
             regime=regime,
-            adx=ml_extensions.filter_adx(
-                candle_closes=user_selected_candles,
-                candle_highs=candle_highs,
-                candle_lows=candle_lows,
-                length=14,
-                adx_threshold=self.trading_mode.filter_settings.adx_threshold,
-                use_adx_filter=self.trading_mode.filter_settings.use_adx_filter,
-            ),
+            adx=adx,
             is_ema_uptrend=is_ema_uptrend,
             is_ema_downtrend=is_ema_downtrend,
             is_sma_uptrend=is_sma_uptrend,
@@ -1129,17 +1481,58 @@ class LorentzianClassificationScript(
         )
         return _filter
 
+    def _get_aligned_series(
+        self,
+        data_length: int,
+        y_train_series: npt.NDArray[numpy.int64],
+        _filters: utils.Filter,
+        candle_closes: npt.NDArray[numpy.float64],
+        candle_highs: npt.NDArray[numpy.float64],
+        candle_lows: npt.NDArray[numpy.float64],
+        candle_times: npt.NDArray[numpy.float64],
+        candles_hlc3: npt.NDArray[numpy.float64],
+        candles_ohlc4: npt.NDArray[numpy.float64],
+        user_selected_candles: npt.NDArray[numpy.float64],
+        kernel_data: typing.Dict[str, npt.NDArray[numpy.float64]],
+        feature_arrays: utils.FeatureArrays,
+    ) -> basic_utilities.AlignedSeries:
+        aligned_series: basic_utilities.AlignedSeries = basic_utilities.AlignedSeries(
+            axis_length=data_length
+        )
+        aligned_series.add_many(
+            {
+                "y_train_series": y_train_series,
+                "candle_closes": candle_closes,
+                "candle_highs": candle_highs,
+                "candle_lows": candle_lows,
+                "candle_times": candle_times,
+                "candles_hlc3": candles_hlc3,
+                "candles_ohlc4": candles_ohlc4,
+                "user_selected_candles": user_selected_candles,
+                "slightly_below_lows": candle_lows * 0.999,
+                "slightly_above_highs": candle_highs * 1.001,
+            }
+        )
+        aligned_series.add_many(kernel_data)
+        for name in utils.Filter.SERIES_NAMES:
+            aligned_series.add(name, getattr(_filters, name))
+        for feature_id, feature_array in enumerate(feature_arrays.feature_arrays):
+            aligned_series.add(f"feature_{feature_id}", feature_array)
+        return aligned_series
+
     def _get_feature_arrays(
         self,
+        settings: ClassificationSettingsSnapshot,
+        streamed_indicators: typing.Optional[streaming_indicators.StreamingIndicators],
         candle_closes: npt.NDArray[numpy.float64],
         candle_highs: npt.NDArray[numpy.float64],
         candle_lows: npt.NDArray[numpy.float64],
         candles_hlc3: npt.NDArray[numpy.float64],
     ) -> utils.FeatureArrays:
+        if streamed_indicators is not None:
+            return streamed_indicators.get_feature_arrays(len(candle_closes))
         feature_arrays: utils.FeatureArrays = utils.FeatureArrays()
-        for (
-            feature_settings
-        ) in self.trading_mode.feature_engineering_settings.features_settings:
+        for feature_settings in settings.feature_engineering_settings.features_settings:
             feature_arrays.add_feature_array(
                 feature_array=utils.series_from(
                     feature_settings.indicator_name,
@@ -1158,41 +1551,40 @@ class LorentzianClassificationScript(
         ctx: context_management.Context,
         candle_source_name: str,
         data_source_symbol: str,
+        limit: int = -1,
     ) -> tuple:
         max_history = True if ctx.exchange_manager.is_backtesting else False
-        candle_times = await exchange_public_data.Time(
-            ctx, symbol=data_source_symbol, max_history=max_history
-        )
-        candle_opens = await exchange_public_data.Open(
-            ctx, symbol=data_source_symbol, max_history=max_history
-        )
-        candle_closes = await exchange_public_data.Close(
-            ctx, symbol=data_source_symbol, max_history=max_history
-        )
-        candle_highs = await exchange_public_data.High(
-            ctx, symbol=data_source_symbol, max_history=max_history
-        )
-        candle_lows = await exchange_public_data.Low(
-            ctx, symbol=data_source_symbol, max_history=max_history
-        )
-        candles_hlc3 = CandlesUtil.HLC3(
-            candle_highs,
-            candle_lows,
-            candle_closes,
-        )
-        candles_ohlc4 = CandlesUtil.OHLC4(
-            candle_opens,
-            candle_highs,
-            candle_lows,
-            candle_closes,
+        # all columns in one call, read-only views of the
+        # shared history file in backtesting
+        candles_by_names: typing.Dict[
+            str, npt.NDArray[numpy.float64]
+        ] = await public_exchange_data.get_candles_by_names(
+            ctx,
+            (
+                matrix_enums.PriceDataSources.TIME.value,
+                matrix_enums.PriceDataSources.OPEN.value,
+                matrix_enums.PriceDataSources.HIGH.value,
+                matrix_enums.PriceDataSources.LOW.value,
+                matrix_enums.PriceDataSources.CLOSE.value,
+                matrix_enums.PriceDataSources.HLC3.value,
+                matrix_enums.PriceDataSources.OHLC4.value,
+            ),
+            symbol=data_source_symbol,
+            max_history=max_history,
+            limit=limit,
         )
+        candle_times = candles_by_names[matrix_enums.PriceDataSources.TIME.value]
+        candle_opens = candles_by_names[matrix_enums.PriceDataSources.OPEN.value]
+        candle_highs = candles_by_names[matrix_enums.PriceDataSources.HIGH.value]
+        candle_lows = candles_by_names[matrix_enums.PriceDataSources.LOW.value]
+        candle_closes = candles_by_names[matrix_enums.PriceDataSources.CLOSE.value]
+        candles_hlc3 = candles_by_names[matrix_enums.PriceDataSources.HLC3.value]
+        candles_ohlc4 = candles_by_names[matrix_enums.PriceDataSources.OHLC4.value]
         user_selected_candles = None
         if candle_source_name == enums.PriceStrings.STR_PRICE_CLOSE.value:
             user_selected_candles = candle_closes
         if candle_source_name == enums.PriceStrings.STR_PRICE_OPEN.value:
-            user_selected_candles = await exchange_public_data.Open(
-                ctx, symbol=data_source_symbol, max_history=max_history
-            )
+            user_selected_candles = candle_opens
         if candle_source_name == enums.PriceStrings.STR_PRICE_HIGH.value:
             user_selected_candles = candle_highs
         if candle_source_name == enums.PriceStrings.STR_PRICE_LOW.value:
@@ -1211,17 +1603,121 @@ class LorentzianClassificationScript(
             candle_times,
         )
 
-    def _get_max_bars_back_index(self, cutted_data_length: int) -> int:
+    def _get_exact_knn_predictions(
+        self,
+        settings: ClassificationSettingsSnapshot,
+        max_bars_back_index: int,
+        cutted_data_length: int,
+        feature_arrays: utils.FeatureArrays,
+        y_train_series: npt.NDArray[numpy.int64],
+    ) -> npt.NDArray[numpy.int64]:
+        classification_settings: utils.ClassificationSettings = (
+            settings.classification_settings
+        )
+        s_time = basic_utilities.start_measure_time()
+        exact_knn_predictions: npt.NDArray[
+            numpy.int64
+        ] = exact_knn.get_exact_knn_predictions(
+            start_candle_index=max_bars_back_index,
+            end_candle_index=cutted_data_length,
+            classification_settings=classification_settings,
+            feature_arrays=feature_arrays,
+            y_train_series=y_train_series,
+        )
+        if classification_settings.compare_classifier_modes:
+            exact_knn_duration: float = time.time() - s_time
+            s_time = time.time()
+            ann_predictions: list = [
+                classification_utils.get_classification_predictions(
+                    candle_index,
+                    classification_settings,
+                    feature_arrays,
+                    y_train_series,
+                )
+                for candle_index in range(max_bars_back_index, cutted_data_length)
+            ]
+            ann_duration: float = time.time() - s_time
+            report: dict = exact_knn.get_signal_agreement_report(
+                reference_predictions=ann_predictions,
+                predictions=exact_knn_predictions,
+                required_neighbors=classification_settings.required_neighbors,
+            )
+            self.logger.info(
+                f"Classifier modes comparison for {settings.symbol}: "
+                f"approximate nearest neighbors took {round(ann_duration, 2)}s, "
+                f"exact nearest neighbors took {round(exact_knn_duration, 2)}s - "
+                f"{report}"
+            )
         if (
-            cutted_data_length
-            >= self.trading_mode.classification_settings.max_bars_back
+            classification_settings.feature_quantization_bits
+            and classification_settings.compare_feature_quantization
         ):
-            if self.ctx.exchange_manager.is_backtesting:
-                return self.trading_mode.classification_settings.max_bars_back
-            return (
-                cutted_data_length
-                - self.trading_mode.classification_settings.max_bars_back
+            float_predictions: npt.NDArray[
+                numpy.int64
+            ] = exact_knn.get_exact_knn_predictions(
+                start_candle_index=max_bars_back_index,
+                end_candle_index=cutted_data_length,
+                classification_settings=classification_settings,
+                feature_arrays=feature_arrays,
+                y_train_series=y_train_series,
+                use_feature_quantization=False,
             )
+            report: dict = exact_knn.get_signal_agreement_report(
+                reference_predictions=float_predictions,
+                predictions=exact_knn_predictions,
+                required_neighbors=classification_settings.required_neighbors,
+            )
+            report.update(
+                quantization.get_quantization_error_report(
+                    exact_knn.get_feature_matrix(feature_arrays),
+                    classification_settings.feature_quantization_bits,
+                )
+            )
+            self.logger.info(
+                "Feature quantization comparison with float64 features for "
+                f"{settings.symbol}: {report}"
+            )
+        return exact_knn_predictions
+
+    def _get_live_tail_length(
+        self,
+        ctx: context_management.Context,
+        settings: ClassificationSettingsSnapshot,
+    ) -> int:
+        # live candles only affect the last classified bars, so only compute
+        # the kernel and training labels of the bars they are compared with.
+        # Remote fractals train on the whole history.
+        if (
+            ctx.exchange_manager.is_backtesting
+            or not settings.classification_settings.use_live_tail_window
+            or settings.classification_settings.use_remote_fractals
+        ):
+            return -1
+        return utils.get_live_tail_length(
+            settings.classification_settings,
+            settings.kernel_settings,
+            classified_bars_count=200
+            if settings.display_settings.is_plot_recording_mode
+            else settings.classification_settings.max_bars_back,
+        )
+
+    def _get_live_history_length(
+        self, settings: ClassificationSettingsSnapshot, live_tail_length: int
+    ) -> int:
+        # live tail and the bars features and filters need to settle before it
+        if live_tail_length <= 0:
+            return -1
+        return live_tail_length + utils.get_indicators_warm_up_length(
+            settings.feature_engineering_settings, settings.filter_settings
+        )
+
+    def _get_max_bars_back_index(
+        self, settings: ClassificationSettingsSnapshot, cutted_data_length: int
+    ) -> int:
+        if cutted_data_length >= settings.classification_settings.max_bars_back:
+            if self.exchange_manager.is_backtesting:
+                return settings.classification_settings.max_bars_back
+            return cutted_data_length - settings.classification_settings.max_bars_back
         else:
             self.logger.warning(
                 "Not enough historical bars for the current max_bars_back. "
@@ -0,0 +1,93 @@
+import asyncio
+import concurrent.futures
+import time
+import typing
+
+import octobot_commons.enums as enums
+import octobot_commons.logging as logging
+
+# Live classifications are cpu bound and would block the event loop
+# (orders, websockets and other tentacles) while they run.
+# Vectorized exact nearest neighbors classifications are handed off to a
+# dedicated worker thread, their distances are numpy operations releasing
+# the GIL so the loop keeps running meanwhile. The indicators and the per bar
+# signals loop still hold the GIL and only share it with the loop.
+# Approximate nearest neighbors and vantage point tree classifications are
+# pure python loops which would hold the GIL all along and are not handed off.
+
+# warn when a classification takes longer than this part of its time frame
+OVERRUN_TIME_FRAME_RATIO: float = 0.5
+
+
+class ClassificationWorker:
+    def __init__(self):
+        self.logger = logging.get_logger("LorentzianClassificationWorker")
+        self.executor: concurrent.futures.ThreadPoolExecutor = (
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="LorentzianClassification"
+            )
+        )
+        # classifications of the same key run one after the other
+        self.locks_by_keys: typing.Dict[tuple, asyncio.Lock] = {}
+        self.latest_candle_times_by_keys: typing.Dict[tuple, float] = {}
+        self.skipped_candles_count: int = 0
+        self.overruns_count: int = 0
+
+    async def classify(
+        self,
+        key: tuple,
+        candle_time: float,
+        time_frame: str,
+        classify_function: typing.Callable,
+        *args,
+    ) -> typing.Any:
+        # returns None when a newer candle of the same key arrived meanwhile,
+        # only the most recent waiting candle is classified
+        self.latest_candle_times_by_keys[key] = candle_time
+        if key not in self.locks_by_keys:
+            self.locks_by_keys[key] = asyncio.Lock()
+        async with self.locks_by_keys[key]:
+            if self.latest_candle_times_by_keys[key] != candle_time:
+                self.skipped_candles_count += 1
+                self.logger.warning(
+                    f"{key}: skipped classifying the candle at {candle_time} "
+                    "as a newer candle is waiting, candles are arriving faster "
+                    "than they can be classified"
+                )
+                return None
+            max_duration: float = (
+                enums.TimeFramesMinutes[enums.TimeFrames(time_frame)]
+                * 60
+                * OVERRUN_TIME_FRAME_RATIO
+            )
+            loop = asyncio.get_running_loop()
+            watchdog: asyncio.TimerHandle = loop.call_later(
+                max_duration, self._log_overrun, key, candle_time, max_duration
+            )
+            start_time: float = time.time()
+            try:
+                return await loop.run_in_executor(
+                    self.executor, classify_function, *args
+                )
+            finally:
+                watchdog.cancel()
+                if time.time() - start_time > max_duration:
+                    self.overruns_count += 1
+
+    def _log_overrun(self, key: tuple, candle_time: float, max_duration: float):
+        self.logger.warning(
+            f"{key}: classifying the candle at {candle_time} is still running "
+            f"after {round(max_duration)}s, reduce max bars back or the "
+            "amount of features to keep up with the time frame"
+        )
+
+
+_CLASSIFICATION_WORKER: typing.Optional[ClassificationWorker] = None
+
+
+def get_classification_worker() -> ClassificationWorker:
+    # one worker thread shared by all the live producers of this process
+    global _CLASSIFICATION_WORKER
+    if _CLASSIFICATION_WORKER is None:
+        _CLASSIFICATION_WORKER = ClassificationWorker()
+    return _CLASSIFICATION_WORKER
@@ -301,6 +301,199 @@ class LorentzianClassificationModeInputs(abstract_mode_base.AbstractBaseMode):
             },
             order=5,
         )
+        classifier_mode: str = self.UI.user_input(
+            "classifier_mode",
+            enums.UserInputTypes.OPTIONS,
+            utils.ClassifierModes.DEFAULT_MODE,
+            inputs,
+            options=utils.ClassifierModes.AVAILABLE_MODES,
+            title="Classifier Mode",
+            parent_input_name=GENERAL_SETTINGS_NAME,
+            editor_options={enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6},
+            other_schema_values={
+                "description": "Approximate nearest neighbors walks through the "
+                "training data in chronological order, like the TradingView version. "
+                "Exact nearest neighbors compares each candle with all candles of the "
+                "(down sampled) training data and uses the k closest ones. The exact "
+                "mode classifies all candles at once and is usually much faster on "
+                "long backtests, but will result in different signals."
+            },
+            order=6,
+        )
+        compare_classifier_modes: bool = False
+        exact_knn_backend: typing.Optional[str] = None
+        feature_quantization_bits: typing.Optional[int] = None
+        compare_feature_quantization: bool = False
+        if classifier_mode == utils.ClassifierModes.EXACT_NEAREST_NEIGHBORS:
+            exact_knn_backend = self.UI.user_input(
+                "exact_knn_backend",
+                enums.UserInputTypes.OPTIONS,
+                utils.ExactKnnBackends.DEFAULT_BACKEND,
+                inputs,
+                options=utils.ExactKnnBackends.AVAILABLE_BACKENDS,
+                title="Nearest neighbors search backend",
+                parent_input_name=GENERAL_SETTINGS_NAME,
+                editor_options={
+                    enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6
+                },
+                other_schema_values={
+                    "description": "The vectorized brute force backend compares "
+                    "each candle with the full training data and is the fastest "
+                    "for usual max bars back values. The vantage point tree "
+                    "indexes the training data and only compares the candles "
+                    "which can be close, which is faster when using a max bars back "
+                    "of tens of thousands of candles. Both return the same neighbors."
+                },
+                order=7,
+            )
+            compare_classifier_modes = self.UI.user_input(
+                "compare_classifier_modes",
+                enums.UserInputTypes.BOOLEAN,
+                False,
+                inputs,
+                title="Compare with approximate nearest neighbors",
+                parent_input_name=GENERAL_SETTINGS_NAME,
+                editor_options={
+                    enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6
+                },
+                other_schema_values={
+                    "description": "When enabled, both classifier modes will run "
+                    "and the duration of each mode as well as how often their "
+                    "signals agree will be logged. Only use this to compare the "
+                    "modes, as it will slow down classification."
+                },
+                order=8,
+            )
+            if exact_knn_backend == utils.ExactKnnBackends.BRUTE_FORCE:
+                feature_quantization: str = self.UI.user_input(
+                    "feature_quantization",
+                    enums.UserInputTypes.OPTIONS,
+                    utils.FeatureQuantizations.DEFAULT_QUANTIZATION,
+                    inputs,
+                    options=utils.FeatureQuantizations.AVAILABLE_QUANTIZATIONS,
+                    title="Feature quantization",
+                    parent_input_name=GENERAL_SETTINGS_NAME,
+                    editor_options={
+                        enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6
+                    },
+                    other_schema_values={
+                        "description": "All features are scaled from 0 to 1. When "
+                        "enabled, features are stored as small integer codes and "
+                        "distances are read from a precomputed table instead of "
+                        "being calculated. This uses 4 to 8 times less memory and "
+                        "is faster, but features lose precision, which can slightly "
+                        "change the nearest neighbors."
+                    },
+                    order=9,
+                )
+                feature_quantization_bits = (
+                    utils.FeatureQuantizations.BITS_BY_TITLES.get(
+                        feature_quantization
+                    )
+                )
+                if feature_quantization_bits:
+                    compare_feature_quantization = self.UI.user_input(
+                        "compare_feature_quantization",
+                        enums.UserInputTypes.BOOLEAN,
+                        False,
+                        inputs,
+                        title="Compare quantized with float64 features",
+                        parent_input_name=GENERAL_SETTINGS_NAME,
+                        editor_options={
+                            enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6
+                        },
+                        other_schema_values={
+                            "description": "When enabled, the classification "
+                            "also runs on the original features and the precision "
+                            "lost by the quantization as well as how often the "
+                            "signals agree will be logged. Only use this to compare "
+                            "the settings, as it will slow down classification."
+                        },
+                        order=10,
+                    )
+        use_live_tail_window: bool = self.UI.user_input(
+            "use_live_tail_window",
+            enums.UserInputTypes.BOOLEAN,
+            True,
+            inputs,
+            title="Only compute the required live history",
+            parent_input_name=GENERAL_SETTINGS_NAME,
+            editor_options={enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6},
+            other_schema_values={
+                "description": "When enabled, live trading only fetches and "
+                "computes the candles the classification needs: max bars back to "
+                "classify, max bars back of training data and the kernel look back, "
+                "plus the candles the features and filters need to warm up, based "
+                "on their periods. Normalized features (WT, CCI) are rescaled on "
+                "this shorter history and may slightly differ from the whole "
+                "history, use the comparison below to check the signals. Plots "
+                "only show this window in replot history mode. Not used with "
+                "remote fractals, as they train on the whole history. Has no effect "
+                "on backtesting."
+            },
+            order=11,
+        )
+        compare_live_tail_window: bool = False
+        if use_live_tail_window:
+            compare_live_tail_window = self.UI.user_input(
+                "compare_live_tail_window",
+                enums.UserInputTypes.BOOLEAN,
+                False,
+                inputs,
+                title="Compare the required live history with the whole history",
+                parent_input_name=GENERAL_SETTINGS_NAME,
+                editor_options={
+                    enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6
+                },
+                other_schema_values={
+                    "description": "When enabled, live candles are also "
+                    "classified on the whole history and how often the "
+                    "predictions agree as well as whether the signals of the "
+                    "current candle are the same will be logged. Only use this "
+                    "to verify the option, as it will slow down classification."
+                },
+                order=12,
+            )
+        use_streaming_indicators: bool = self.UI.user_input(
+            "use_streaming_indicators",
+            enums.UserInputTypes.BOOLEAN,
+            False,
+            inputs,
+            title="Stream the indicators of live candles",
+            parent_input_name=GENERAL_SETTINGS_NAME,
+            editor_options={enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6},
+            other_schema_values={
+                "description": "When enabled, live trading only feeds the new "
+                "candles to the features, filters and kernel instead of recomputing "
+                "them on the whole history on every candle. The adx filter is still "
+                "recomputed. Recursive indicators start on the first "
+                "candle they were fed with, so once the live history slides they "
+                "differ from the recomputation, which starts on a later candle. "
+                "Normalized features like WT can keep differing, signals can be "
+                "different from backtesting. Has no effect on backtesting."
+            },
+            order=13,
+        )
+        compare_streaming_indicators: bool = False
+        if use_streaming_indicators:
+            compare_streaming_indicators = self.UI.user_input(
+                "compare_streaming_indicators",
+                enums.UserInputTypes.BOOLEAN,
+                False,
+                inputs,
+                title="Compare the streamed indicators with their recomputation",
+                parent_input_name=GENERAL_SETTINGS_NAME,
+                editor_options={
+                    enums.UserInputEditorOptionsTypes.GRID_COLUMNS.value: 6
+                },
+                other_schema_values={
+                    "description": "When enabled, the indicators of live candles "
+                    "are also recomputed on the whole history and the amount of "
+                    "differing values will be logged. Only use this to verify the "
+                    "option, as it will slow down classification."
+                },
+                order=14,
+            )
         color_compression = 1
         # color_compression=self.UI.user_input(
         #     "color_compression",
@@ -326,6 +519,15 @@ class LorentzianClassificationModeInputs(abstract_mode_base.AbstractBaseMode):
             color_compression=color_compression,
             down_sampler=this_down_sampler,
             required_neighbors=required_neighbors,
+            classifier_mode=classifier_mode,
+            compare_classifier_modes=compare_classifier_modes,
+            exact_knn_backend=exact_knn_backend,
+            feature_quantization_bits=feature_quantization_bits,
+            compare_feature_quantization=compare_feature_quantization,
+            use_live_tail_window=use_live_tail_window,
+            compare_live_tail_window=compare_live_tail_window,
+            use_streaming_indicators=use_streaming_indicators,
+            compare_streaming_indicators=compare_streaming_indicators,
             training_data_settings=utils.YTrainSettings(
                 training_data_type=training_data_type,
                 percent_for_a_win=percent_for_a_win,
@@ -0,0 +1,86 @@
+import asyncio
+import hashlib
+import json
+import typing
+import weakref
+
+# Every traded pair has its own producer, pairs using the same data source
+# symbol (use_custom_pair) with the same settings would classify the exact
+# same candles. The first producer of a candle classifies it and publishes
+# the result, the other subscribed pairs await and reuse it.
+# Signals are published as classified, inverse_signals pairs flip them
+# when trading.
+
+
+def get_settings_hash(*settings) -> str:
+    # settings objects are plain attribute containers
+    return hashlib.sha1(
+        json.dumps(
+            settings,
+            sort_keys=True,
+            default=lambda settings_object: getattr(
+                settings_object, "__dict__", str(settings_object)
+            ),
+        ).encode()
+    ).hexdigest()
+
+
+class SignalBus:
+    def __init__(self):
+        # only the latest classified candle is kept by key, for as long as
+        # its exchange manager (bot, backtesting or optimizer run) exists
+        self.classifications_by_exchange_managers: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+        self.published_count: int = 0
+        self.shared_count: int = 0
+
+    async def get_classified_candles(
+        self,
+        exchange_manager,
+        key: tuple,
+        candle_time: float,
+        classify: typing.Callable[[], typing.Awaitable[typing.Any]],
+    ) -> typing.Any:
+        # key: (data source symbol, time frame, settings hash)
+        classifications_by_keys: typing.Dict[
+            tuple, typing.Tuple[float, asyncio.Future]
+        ] = self.classifications_by_exchange_managers.setdefault(exchange_manager, {})
+        if key in classifications_by_keys:
+            published_candle_time, classification = classifications_by_keys[key]
+            if published_candle_time == candle_time:
+                self.shared_count += 1
+                # shielded so a cancelled subscriber doesn't cancel the others
+                return await asyncio.shield(classification)
+        classification: asyncio.Future = asyncio.get_running_loop().create_future()
+        classifications_by_keys[key] = (candle_time, classification)
+        try:
+            classified_candles = await classify()
+            classification.set_result(classified_candles)
+            self.published_count += 1
+            return classified_candles
+        except Exception as error:
+            classification.set_exception(error)
+            # retrieved by the subscribers if any
+            classification.exception()
+            raise
+        finally:
+            if not classification.done():
+                classification.cancel()
+            if classification.cancelled() or classification.exception() is not None:
+                # let the next producer of this candle try again
+                if classifications_by_keys.get(key, (None, None))[1] is (
+                    classification
+                ):
+                    classifications_by_keys.pop(key)
+
+
+_SIGNAL_BUS: typing.Optional[SignalBus] = None
+
+
+def get_signal_bus() -> SignalBus:
+    # shared by all the producers of this process
+    global _SIGNAL_BUS
+    if _SIGNAL_BUS is None:
+        _SIGNAL_BUS = SignalBus()
+    return _SIGNAL_BUS
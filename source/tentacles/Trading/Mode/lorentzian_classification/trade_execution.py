@@ -9,23 +9,34 @@ from tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.matrix_enums
     UserInputEditorOptionsTypes,
 )
 import tentacles.Meta.Keywords.scripting_library.orders.order_types.market_order as market_order
-import tentacles.Meta.Keywords.scripting_library.backtesting.backtesting_settings as backtesting_settings
+import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.backtesting.skip_runs as skip_runs
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.tools.utilities as basic_utilities
 import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.ml_utils.utils as utils
 import tentacles.Trading.Mode.lorentzian_classification.settings as lorentzian_settings
 
 try:
     import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.activate_managed_order as activate_managed_order
+    import tentacles.Meta.Keywords.basic_tentacles.matrix_basic_keywords.orders.managed_order_pro.daemons.trailing_stop_loss.trail_stop_losses as trail_stop_losses
 except (ImportError, ModuleNotFoundError):
     activate_managed_order = None
+    trail_stop_losses = None
+
+
+class BacktestingCandleActions:
+    # bit flags of the cached signals on a candle
+    NONE = 0
+    ENTER_SHORT = 1
+    ENTER_LONG = 2
+    EXIT_SHORT = 4
+    EXIT_LONG = 8
 
 
 class LorentzianTradeExecution:
     trading_mode = None
-    start_long_trades_cache: dict = {}
-    start_short_trades_cache: dict = {}
-    exit_long_trades_cache: dict = {}
-    exit_short_trades_cache: dict = {}
+    # only candles with an action by time frame and candle close time
+    backtesting_actions_by_time_frames: typing.Dict[str, typing.Dict[int, int]] = {}
+    # trading_mode.settings_version the order settings are built for
+    order_settings_version: typing.Optional[int] = None
 
     managend_orders_long_settings = None
     managend_orders_short_settings = None
@@ -66,53 +77,63 @@ class LorentzianTradeExecution:
             f" Lorentzian Classification {symbol} - " "trading eventual singals",
         )
 
+    async def trail_managed_stop_losses(self) -> None:
+        # trails the stop losses of the managed order groups on each live candle
+        # and registers the groups to trail on mark price until the next one
+        if not self.trading_mode.order_settings.uses_managed_order:
+            return
+        for managend_orders_settings in (
+            self.managend_orders_long_settings,
+            self.managend_orders_short_settings,
+        ):
+            if managend_orders_settings is None:
+                continue
+            for order_group_settings in managend_orders_settings.order_groups.values():
+                await trail_stop_losses.trail_stop_losses_for_this_candle(
+                    self, order_group_settings, managend_orders_settings
+                )
+
     async def _trade_cached_backtesting_candles_if_available(
         self, ctx: context_management.Context
     ) -> bool:
         if ctx.exchange_manager.is_backtesting:
-            if ctx.time_frame in self.start_long_trades_cache:
-                trigger_cache_timestamp = int(ctx.trigger_cache_timestamp)
-                try:
-                    if self.start_short_trades_cache[ctx.time_frame][
-                        trigger_cache_timestamp
-                    ]:
-                        await enter_short_trade(
-                            mode_producer=self,
-                            ctx=ctx,
-                            order_settings=self.trading_mode.order_settings,
-                            managend_orders_short_settings=self.managend_orders_short_settings,
-                        )
-                    elif self.start_long_trades_cache[ctx.time_frame][
-                        trigger_cache_timestamp
-                    ]:
-                        await enter_long_trade(
-                            mode_producer=self,
-                            ctx=ctx,
-                            order_settings=self.trading_mode.order_settings,
-                            managend_orders_long_settings=self.managend_orders_long_settings,
-                        )
-                    if (
-                        self.exit_short_trades_cache
-                        and self.exit_short_trades_cache[ctx.time_frame][
-                            trigger_cache_timestamp
-                        ]
-                    ):
-                        await exit_short_trade(ctx)
-                    elif (
-                        self.exit_long_trades_cache
-                        and self.exit_long_trades_cache[ctx.time_frame][
-                            trigger_cache_timestamp
-                        ]
-                    ):
-                        await exit_long_trade(ctx)
-                    return True
-                except KeyError as error:
-                    ctx.logger.debug(
-                        f"No cached strategy signal for this candle - error: {error}"
+            if ctx.time_frame in self.backtesting_actions_by_time_frames:
+                candle_actions: int = self.backtesting_actions_by_time_frames[
+                    ctx.time_frame
+                ].get(int(ctx.trigger_cache_timestamp), BacktestingCandleActions.NONE)
+                if candle_actions & BacktestingCandleActions.ENTER_SHORT:
+                    await enter_short_trade(
+                        mode_producer=self,
+                        ctx=ctx,
+                        order_settings=self.trading_mode.order_settings,
+                        managend_orders_short_settings=self.managend_orders_short_settings,
+                    )
+                elif candle_actions & BacktestingCandleActions.ENTER_LONG:
+                    await enter_long_trade(
+                        mode_producer=self,
+                        ctx=ctx,
+                        order_settings=self.trading_mode.order_settings,
+                        managend_orders_long_settings=self.managend_orders_long_settings,
                     )
-                    return True
+                if candle_actions & BacktestingCandleActions.EXIT_SHORT:
+                    await exit_short_trade(ctx)
+                elif candle_actions & BacktestingCandleActions.EXIT_LONG:
+                    await exit_long_trade(ctx)
+                return True
         return False
 
+    def is_idle_backtesting_candle(
+        self, time_frame: str, trigger_cache_timestamp: float
+    ) -> bool:
+        # signals are cached and there is nothing to trade on this candle
+        actions_by_times: typing.Optional[
+            typing.Dict[int, int]
+        ] = self.backtesting_actions_by_time_frames.get(time_frame)
+        return (
+            actions_by_times is not None
+            and int(trigger_cache_timestamp) not in actions_by_times
+        )
+
     def _cache_backtesting_signals(
         self,
         symbol: str,
@@ -154,52 +175,52 @@ class LorentzianTradeExecution:
                     start_long_trades,
                 )
             )
-        candle_times_to_whitelist: list = []
-        self.start_short_trades_cache[ctx.time_frame] = {}
-        self.start_long_trades_cache[ctx.time_frame] = {}
+        start_short_trades_mask: npt.NDArray[numpy.bool_] = numpy.asarray(
+            start_short_trades, dtype=numpy.bool_
+        )
+        start_long_trades_mask: npt.NDArray[numpy.bool_] = numpy.asarray(
+            start_long_trades, dtype=numpy.bool_
+        )
+        # a short entry has priority over a long entry
+        # and a short exit over a long exit on the same candle
+        candle_actions: npt.NDArray[numpy.int64] = numpy.where(
+            start_short_trades_mask,
+            BacktestingCandleActions.ENTER_SHORT,
+            numpy.where(
+                start_long_trades_mask,
+                BacktestingCandleActions.ENTER_LONG,
+                BacktestingCandleActions.NONE,
+            ),
+        )
         if has_exit_signals:
-            self.exit_long_trades_cache[ctx.time_frame]: dict = {}
-            self.exit_short_trades_cache[ctx.time_frame]: dict = {}
-        trades_count: int = 0
-        for index, candle_time in enumerate(candle_times):
-            candle_time: int = int(candle_time)
-            self.start_short_trades_cache[ctx.time_frame][
-                candle_time
-            ] = start_short_trades[index]
-            self.start_long_trades_cache[ctx.time_frame][
-                candle_time
-            ] = start_long_trades[index]
-            if has_exit_signals:
-                self.exit_long_trades_cache[ctx.time_frame][
-                    candle_time
-                ] = exit_long_trades[index]
-                self.exit_short_trades_cache[ctx.time_frame][
-                    candle_time
-                ] = exit_short_trades[index]
-                if exit_long_trades[index] or exit_short_trades[index]:
-                    open_time: int = int(
-                        candle_time
-                        - (
-                            enums.TimeFramesMinutes[enums.TimeFrames(ctx.time_frame)]
-                            * 60
-                        )
-                    )
-                    candle_times_to_whitelist.append(open_time)
-                    candle_times_to_whitelist.append(int(candle_time))
-            if start_long_trades[index] or start_short_trades[index]:
-                if start_long_trades[index]:
-                    trades_count += 1
-                if start_short_trades[index]:
-                    trades_count += 1
-                open_time: int = int(
-                    candle_time
-                    - (enums.TimeFramesMinutes[enums.TimeFrames(ctx.time_frame)] * 60)
-                )
-                candle_times_to_whitelist.append(int(candle_time))
-                candle_times_to_whitelist.append(open_time)
+            candle_actions |= numpy.where(
+                numpy.asarray(exit_short_trades, dtype=numpy.bool_),
+                BacktestingCandleActions.EXIT_SHORT,
+                numpy.where(
+                    numpy.asarray(exit_long_trades, dtype=numpy.bool_),
+                    BacktestingCandleActions.EXIT_LONG,
+                    BacktestingCandleActions.NONE,
+                ),
+            )
+        signals_mask: npt.NDArray[numpy.bool_] = (
+            candle_actions != BacktestingCandleActions.NONE
+        )
+        self.backtesting_actions_by_time_frames[ctx.time_frame] = dict(
+            zip(
+                numpy.asarray(candle_times)[signals_mask].astype(numpy.int64).tolist(),
+                candle_actions[signals_mask].tolist(),
+            )
+        )
+        trades_count: int = int(
+            numpy.count_nonzero(start_long_trades_mask)
+            + numpy.count_nonzero(start_short_trades_mask)
+        )
         # if len(self.time_frame_filter) <= 1:
-        backtesting_settings.register_backtesting_timestamp_whitelist(
-            ctx, sorted(list(set(candle_times_to_whitelist)))
+        skip_runs.merge_backtesting_timestamp_whitelist(
+            ctx,
+            skip_runs.get_signal_timestamps_whitelist(
+                candle_times, signals_mask, ctx.time_frame
+            ),
         )
         basic_utilities.end_measure_time(
             s_time,
@@ -209,6 +230,9 @@ class LorentzianTradeExecution:
         )
 
     async def init_order_settings(self, ctx: context_management.Context, leverage: int):
+        if self.order_settings_version == self.trading_mode.settings_version:
+            # only rebuilt after a config or script reload
+            return
         if self.trading_mode.order_settings.uses_managed_order:
             if self.trading_mode.order_settings.enable_long_orders:
                 long_settings_name = "long_order_settings"
@@ -264,6 +288,7 @@ class LorentzianTradeExecution:
                 )
         else:
             await basic_keywords.set_leverage(ctx, leverage)
+        self.order_settings_version = self.trading_mode.settings_version
 
 
 async def enter_short_trade(